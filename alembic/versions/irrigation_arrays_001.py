@@ -0,0 +1,54 @@
+"""Store zone plant ids and schedule weekdays as native arrays
+
+Revision ID: irrigation_arrays_001
+Revises: irrigation_equipment_specs_gin_001
+Create Date: 2024-02-14 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'irrigation_arrays_001'
+down_revision = 'irrigation_equipment_specs_gin_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # ALTER COLUMN ... USING cannot contain the subquery needed to unpack a
+    # JSON array, so each column is copied into a new array column and swapped in
+    op.add_column('irrigation_zones', sa.Column('plant_ids_array', postgresql.ARRAY(sa.Integer()), nullable=True))
+    op.execute(
+        "UPDATE irrigation_zones "
+        "SET plant_ids_array = ARRAY(SELECT json_array_elements_text(plant_ids)::integer)"
+    )
+    op.drop_column('irrigation_zones', 'plant_ids')
+    op.alter_column('irrigation_zones', 'plant_ids_array', new_column_name='plant_ids', nullable=False)
+
+    # Zone lookups by plant use array containment (@>)
+    op.create_index('idx_zone_plant_ids', 'irrigation_zones', ['plant_ids'], unique=False, postgresql_using='gin')
+
+    op.add_column('irrigation_schedules', sa.Column('days_of_week_array', postgresql.ARRAY(sa.SmallInteger()), nullable=True))
+    op.execute(
+        "UPDATE irrigation_schedules "
+        "SET days_of_week_array = ARRAY(SELECT json_array_elements_text(days_of_week)::smallint) "
+        "WHERE days_of_week IS NOT NULL"
+    )
+    op.drop_column('irrigation_schedules', 'days_of_week')
+    op.alter_column('irrigation_schedules', 'days_of_week_array', new_column_name='days_of_week')
+
+
+def downgrade() -> None:
+    op.add_column('irrigation_schedules', sa.Column('days_of_week_json', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+    op.execute("UPDATE irrigation_schedules SET days_of_week_json = to_json(days_of_week) WHERE days_of_week IS NOT NULL")
+    op.drop_column('irrigation_schedules', 'days_of_week')
+    op.alter_column('irrigation_schedules', 'days_of_week_json', new_column_name='days_of_week')
+
+    op.drop_index('idx_zone_plant_ids', table_name='irrigation_zones')
+    op.add_column('irrigation_zones', sa.Column('plant_ids_json', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+    op.execute("UPDATE irrigation_zones SET plant_ids_json = to_json(plant_ids)")
+    op.drop_column('irrigation_zones', 'plant_ids')
+    op.alter_column('irrigation_zones', 'plant_ids_json', new_column_name='plant_ids', nullable=False)
@@ -0,0 +1,54 @@
+"""Store irrigation enum columns as smallint codes
+
+Revision ID: irrigation_enum_codes_001
+Revises: irrigation_arrays_001
+Create Date: 2024-02-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'irrigation_enum_codes_001'
+down_revision = 'irrigation_arrays_001'
+branch_labels = None
+depends_on = None
+
+
+# Codes must match IntEnumType: 1-based declaration order of each model enum.
+# Frozen here so later enum changes cannot alter what this migration does.
+ENUM_COLUMNS = {
+    ('irrigation_equipment', 'equipment_type'): ('drip', 'sprinkler', 'microjet', 'rotor', 'spray'),
+    ('irrigation_zones', 'status'): ('active', 'inactive', 'maintenance'),
+    ('irrigation_pipes', 'material'): ('pvc', 'pe', 'pex', 'copper'),
+    ('irrigation_schedules', 'schedule_type'): ('daily', 'weekly', 'weather_based', 'manual'),
+}
+
+
+def upgrade() -> None:
+    for (table, column), labels in ENUM_COLUMNS.items():
+        # Rows written through the old SQLEnum hold member names (e.g. 'DRIP'),
+        # so compare case-insensitively against the values
+        whens = " ".join(f"WHEN '{label}' THEN {code}" for code, label in enumerate(labels, start=1))
+        op.alter_column(
+            table,
+            column,
+            type_=sa.SmallInteger(),
+            existing_type=sa.String(length=50),
+            existing_nullable=False,
+            postgresql_using=f"CASE lower({column}) {whens} END",
+        )
+
+
+def downgrade() -> None:
+    for (table, column), labels in ENUM_COLUMNS.items():
+        whens = " ".join(f"WHEN {code} THEN '{label.upper()}'" for code, label in enumerate(labels, start=1))
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=50),
+            existing_type=sa.SmallInteger(),
+            existing_nullable=False,
+            postgresql_using=f"CASE {column} {whens} END",
+        )
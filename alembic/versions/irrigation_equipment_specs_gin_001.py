@@ -0,0 +1,32 @@
+"""Add GIN index for irrigation equipment specifications
+
+Revision ID: irrigation_equipment_specs_gin_001
+Revises: project_indexes_002
+Create Date: 2024-02-12 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'irrigation_equipment_specs_gin_001'
+down_revision = 'project_indexes_002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Equipment is filtered by specification containment (@>); jsonb_path_ops
+    # indexes only that operator and is far smaller than the default opclass
+    op.create_index(
+        'idx_equipment_specifications_gin',
+        'irrigation_equipment',
+        ['specifications'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'specifications': 'jsonb_path_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_equipment_specifications_gin', table_name='irrigation_equipment')
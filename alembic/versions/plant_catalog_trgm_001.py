@@ -0,0 +1,35 @@
+"""Add trigram indexes for plant catalog search
+
+Revision ID: plant_catalog_trgm_001
+Revises: irrigation_system_001
+Create Date: 2024-02-05 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'plant_catalog_trgm_001'
+down_revision = 'irrigation_system_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm provides the gin_trgm_ops operator class
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Trigram GIN indexes so ILIKE '%q%' searches don't scan the whole table
+    op.create_index('ix_plant_catalog_name_trgm', 'plant_catalog', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_plant_catalog_variety_trgm', 'plant_catalog', ['variety'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'variety': 'gin_trgm_ops'})
+    op.create_index('ix_plant_catalog_description_trgm', 'plant_catalog', ['description'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    # The extension is left in place; other objects may depend on it
+    op.drop_index('ix_plant_catalog_description_trgm', table_name='plant_catalog')
+    op.drop_index('ix_plant_catalog_variety_trgm', table_name='plant_catalog')
+    op.drop_index('ix_plant_catalog_name_trgm', table_name='plant_catalog')
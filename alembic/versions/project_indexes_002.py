@@ -0,0 +1,28 @@
+"""Add composite indexes for member and comment lookups
+
+Revision ID: project_indexes_002
+Revises: project_search_tsv_001
+Create Date: 2024-02-08 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_indexes_002'
+down_revision = 'project_search_tsv_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Membership lookups filter on (project_id, user_id); a user is a member at most once
+    op.create_index('idx_project_member_project_user', 'project_members', ['project_id', 'user_id'], unique=True)
+
+    # Comment pages filter by project and sort by created_at
+    op.create_index('idx_project_comment_project', 'project_comments', ['project_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_project_comment_project', table_name='project_comments')
+    op.drop_index('idx_project_member_project_user', table_name='project_members')
@@ -0,0 +1,41 @@
+"""Drop single-column FK indexes covered by composite indexes
+
+Revision ID: project_indexes_003
+Revises: irrigation_enum_codes_001
+Create Date: 2024-02-16 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_indexes_003'
+down_revision = 'irrigation_enum_codes_001'
+branch_labels = None
+depends_on = None
+
+
+# (index, table, column) -> the composite index whose leading column covers it
+REDUNDANT_INDEXES = [
+    ('ix_projects_owner_id', 'projects', 'owner_id'),  # idx_project_owner_status
+    ('ix_project_members_project_id', 'project_members', 'project_id'),  # idx_project_member_project_user
+    ('ix_project_members_user_id', 'project_members', 'user_id'),  # idx_project_member_user
+    ('ix_project_versions_project_id', 'project_versions', 'project_id'),  # idx_project_version_number
+    ('ix_project_comments_project_id', 'project_comments', 'project_id'),  # idx_project_comment_project
+    ('ix_project_activities_project_id', 'project_activities', 'project_id'),  # idx_project_activity_project
+]
+
+
+def upgrade() -> None:
+    for index_name, table, _column in REDUNDANT_INDEXES:
+        op.drop_index(index_name, table_name=table)
+
+    # Reply threads are fetched per project and parent comment
+    op.create_index('idx_comment_project_parent', 'project_comments', ['project_id', 'parent_comment_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_comment_project_parent', table_name='project_comments')
+
+    for index_name, table, column in REDUNDANT_INDEXES:
+        op.create_index(index_name, table, [column], unique=False)
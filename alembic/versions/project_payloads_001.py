@@ -0,0 +1,52 @@
+"""Move project design documents to a project_payloads side table
+
+Revision ID: project_payloads_001
+Revises: project_version_patches_001
+Create Date: 2024-02-21 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_payloads_001'
+down_revision = 'project_version_patches_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # One row per project, sharing its primary key; the projects rows keep
+    # only the narrow, frequently listed columns
+    op.create_table('project_payloads',
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('layout_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('plant_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('irrigation_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.PrimaryKeyConstraint('project_id')
+    )
+    op.execute(
+        "INSERT INTO project_payloads (project_id, created_at, updated_at, layout_data, plant_data, irrigation_data) "
+        "SELECT id, created_at, updated_at, layout_data, plant_data, irrigation_data FROM projects"
+    )
+
+    op.drop_column('projects', 'irrigation_data')
+    op.drop_column('projects', 'plant_data')
+    op.drop_column('projects', 'layout_data')
+
+
+def downgrade() -> None:
+    op.add_column('projects', sa.Column('layout_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('projects', sa.Column('plant_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('projects', sa.Column('irrigation_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.execute(
+        "UPDATE projects SET layout_data = p.layout_data, plant_data = p.plant_data, irrigation_data = p.irrigation_data "
+        "FROM project_payloads p WHERE p.project_id = projects.id"
+    )
+
+    op.drop_table('project_payloads')
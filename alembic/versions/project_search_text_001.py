@@ -0,0 +1,53 @@
+"""Search projects by substring through a trigram-indexed text column
+
+Revision ID: project_search_text_001
+Revises: project_payloads_001
+Create Date: 2024-02-22 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_search_text_001'
+down_revision = 'project_payloads_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Full-text matching dropped substring search; a trigram index over the
+    # same concatenation keeps ILIKE '%term%' on one indexed column
+    op.drop_index('ix_projects_search_tsv', table_name='projects')
+    op.drop_column('projects', 'search_tsv')
+
+    op.add_column('projects', sa.Column(
+        'search_text',
+        sa.Text(),
+        sa.Computed(
+            "name || ' ' || coalesce(description, '') || ' ' || coalesce(location, '')",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_projects_search_text_trgm', 'projects', ['search_text'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_search_text_trgm', table_name='projects')
+    op.drop_column('projects', 'search_text')
+
+    op.add_column('projects', sa.Column(
+        'search_tsv',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', name || ' ' || coalesce(description, '') || ' ' || coalesce(location, ''))",
+            persisted=True
+        ),
+        nullable=True
+    ))
+    op.create_index('ix_projects_search_tsv', 'projects', ['search_tsv'], unique=False,
+                    postgresql_using='gin')
@@ -0,0 +1,39 @@
+"""Add full-text search column for projects
+
+Revision ID: project_search_tsv_001
+Revises: project_trgm_001
+Create Date: 2024-02-07 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_search_tsv_001'
+down_revision = 'project_trgm_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Generated search document over name, description and location
+    op.add_column('projects', sa.Column(
+        'search_tsv',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "to_tsvector('simple', name || ' ' || coalesce(description, '') || ' ' || coalesce(location, ''))",
+            persisted=True
+        ),
+        nullable=True
+    ))
+
+    # One GIN index serves the whole search instead of three trigram scans
+    op.create_index('ix_projects_search_tsv', 'projects', ['search_tsv'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_search_tsv', table_name='projects')
+    op.drop_column('projects', 'search_tsv')
@@ -0,0 +1,34 @@
+"""Add trigram indexes for project search
+
+Revision ID: project_trgm_001
+Revises: plant_catalog_trgm_001
+Create Date: 2024-02-06 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_trgm_001'
+down_revision = 'plant_catalog_trgm_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # pg_trgm provides the gin_trgm_ops operator class
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Trigram GIN indexes so ILIKE '%term%' project searches can use an index
+    op.create_index('ix_projects_name_trgm', 'projects', ['name'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    op.create_index('ix_projects_description_trgm', 'projects', ['description'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+    op.create_index('ix_projects_location_trgm', 'projects', ['location'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_projects_location_trgm', table_name='projects')
+    op.drop_index('ix_projects_description_trgm', table_name='projects')
+    op.drop_index('ix_projects_name_trgm', table_name='projects')
@@ -0,0 +1,77 @@
+"""Store project versions as JSON patches between snapshots
+
+Revision ID: project_version_patches_001
+Revises: time_partitioning_001
+Create Date: 2024-02-20 09:00:00.000000
+
+"""
+from alembic import op
+import jsonpatch
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'project_version_patches_001'
+down_revision = 'time_partitioning_001'
+branch_labels = None
+depends_on = None
+
+# Versioned document columns and the patch column stored in their place
+DOCUMENT_PATCHES = {
+    'layout_data': 'layout_patch',
+    'plant_data': 'plant_patch',
+    'irrigation_data': 'irrigation_patch',
+}
+
+project_versions = sa.table(
+    'project_versions',
+    sa.column('id', postgresql.UUID(as_uuid=True)),
+    sa.column('project_id', postgresql.UUID(as_uuid=True)),
+    sa.column('version_number', sa.Integer()),
+    sa.column('is_snapshot', sa.Boolean()),
+    *(sa.column(name, postgresql.JSONB(none_as_null=True)) for pair in DOCUMENT_PATCHES.items() for name in pair),
+)
+
+
+def upgrade() -> None:
+    # Every existing version holds full documents, so they all become snapshots;
+    # only versions written from now on are stored as patches
+    op.add_column('project_versions', sa.Column('is_snapshot', sa.Boolean(), server_default=sa.true(), nullable=False))
+    op.alter_column('project_versions', 'is_snapshot', server_default=None)
+
+    op.add_column('project_versions', sa.Column('layout_patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('project_versions', sa.Column('plant_patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('project_versions', sa.Column('irrigation_patch', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    # Before this revision every version held full documents: replay each
+    # project's patches onto the snapshot before them and store the results
+    bind = op.get_bind()
+    project_ids = bind.execute(
+        sa.select(project_versions.c.project_id).where(project_versions.c.is_snapshot.is_(False)).distinct()
+    ).scalars().all()
+    for project_id in project_ids:
+        rows = bind.execute(
+            sa.select(project_versions)
+            .where(project_versions.c.project_id == project_id)
+            .order_by(project_versions.c.version_number)
+        ).all()
+        documents = {}
+        for row in rows:
+            if row.is_snapshot:
+                documents = {field: getattr(row, field) for field in DOCUMENT_PATCHES}
+                continue
+            documents = {
+                field: jsonpatch.apply_patch(documents[field], patch) if (patch := getattr(row, patch_field)) else documents[field]
+                for field, patch_field in DOCUMENT_PATCHES.items()
+            }
+            bind.execute(
+                sa.update(project_versions).where(project_versions.c.id == row.id).values(**documents)
+            )
+
+    op.drop_column('project_versions', 'irrigation_patch')
+    op.drop_column('project_versions', 'plant_patch')
+    op.drop_column('project_versions', 'layout_patch')
+    op.drop_column('project_versions', 'is_snapshot')
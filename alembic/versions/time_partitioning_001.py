@@ -0,0 +1,166 @@
+"""Partition weather data and project activities by month
+
+Revision ID: time_partitioning_001
+Revises: project_indexes_003
+Create Date: 2024-02-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'time_partitioning_001'
+down_revision = 'project_indexes_003'
+branch_labels = None
+depends_on = None
+
+
+# Monthly partitions created ahead of time; scripts/maintain_partitions.py
+# keeps this window rolling
+MONTHS_AHEAD = 3
+
+CREATE_MONTHLY_PARTITIONS = """
+CREATE OR REPLACE FUNCTION create_monthly_partitions(parent regclass, from_month date, months_ahead integer)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    month_start date := date_trunc('month', from_month)::date;
+    last_month date := (date_trunc('month', now()) + make_interval(months => months_ahead))::date;
+BEGIN
+    WHILE month_start <= last_month LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %s FOR VALUES FROM (%L) TO (%L)',
+            parent::text || '_p' || to_char(month_start, 'YYYYMM'),
+            parent,
+            month_start,
+            (month_start + interval '1 month')::date
+        );
+        month_start := (month_start + interval '1 month')::date;
+    END LOOP;
+END;
+$$
+"""
+
+
+def _weather_data_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('garden_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('date', sa.DateTime(), nullable=False),
+        sa.Column('temperature_c', sa.Float(), nullable=False),
+        sa.Column('humidity_percent', sa.Float(), nullable=False),
+        sa.Column('rainfall_mm', sa.Float(), nullable=False),
+        sa.Column('wind_speed_kmh', sa.Float(), nullable=False),
+        sa.Column('solar_radiation_mj_m2', sa.Float(), nullable=False),
+        sa.Column('evapotranspiration_mm', sa.Float(), nullable=False),
+        sa.Column('irrigation_need_mm', sa.Float(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('raw_data', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['garden_id'], ['gardens.id'], ),
+    ]
+
+
+def _project_activity_columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('project_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('activity_type', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('metadata', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    ]
+
+
+def _swap_table(table, columns, index_names, **table_kw):
+    """Move `table` aside, recreate it from `columns`/`table_kw` and return the old name."""
+    old_table = f'{table}_old'
+    for index_name in index_names:
+        op.drop_index(index_name, table_name=table)
+    op.rename_table(table, old_table)
+    op.execute(f'ALTER TABLE {old_table} RENAME CONSTRAINT {table}_pkey TO {old_table}_pkey')
+    op.create_table(table, *columns, **table_kw)
+    return old_table
+
+
+def _copy_and_drop(old_table, table, columns):
+    names = ', '.join(column.name for column in columns if isinstance(column, sa.Column))
+    op.execute(f'INSERT INTO {table} ({names}) SELECT {names} FROM {old_table}')
+    op.drop_table(old_table)
+
+
+def _partition(table, column, columns, index_names):
+    # Postgres cannot partition an existing table: rebuild it as a partitioned
+    # parent, whose primary key has to include the partition column
+    old_table = _swap_table(
+        table,
+        columns + [sa.PrimaryKeyConstraint('id', column)],
+        index_names,
+        postgresql_partition_by=f'RANGE ({column})',
+    )
+    op.execute(
+        f"SELECT create_monthly_partitions('{table}', "
+        f"COALESCE((SELECT min({column}) FROM {old_table}), now())::date, {MONTHS_AHEAD})"
+    )
+    # Catches rows outside the prepared months instead of failing the insert
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    _copy_and_drop(old_table, table, columns)
+
+
+def _unpartition(table, columns, index_names):
+    old_table = _swap_table(table, columns + [sa.PrimaryKeyConstraint('id')], index_names)
+    _copy_and_drop(old_table, table, columns)
+
+
+def upgrade() -> None:
+    op.execute(CREATE_MONTHLY_PARTITIONS)
+
+    _partition('weather_data', 'date', _weather_data_columns(), ['idx_weather_garden_date', 'idx_weather_date'])
+    # Indexes on the parent are created on every partition, current and future.
+    # Dates are appended in order, so a BRIN index replaces the date B-tree.
+    op.create_index('idx_weather_garden_date', 'weather_data', ['garden_id', 'date'], unique=True)
+    op.create_index('idx_weather_date', 'weather_data', ['date'], unique=False, postgresql_using='brin')
+    op.create_index(
+        'idx_weather_raw_data_gin',
+        'weather_data',
+        ['raw_data'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'raw_data': 'jsonb_path_ops'},
+    )
+
+    # Old activity history is removed by dropping whole monthly partitions
+    _partition(
+        'project_activities',
+        'created_at',
+        _project_activity_columns(),
+        ['idx_project_activity_project', 'ix_project_activities_user_id'],
+    )
+    op.create_index('idx_project_activity_project', 'project_activities', ['project_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_project_activities_user_id'), 'project_activities', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    _unpartition(
+        'project_activities',
+        _project_activity_columns(),
+        ['idx_project_activity_project', 'ix_project_activities_user_id'],
+    )
+    op.create_index('idx_project_activity_project', 'project_activities', ['project_id', 'created_at'], unique=False)
+    op.create_index(op.f('ix_project_activities_user_id'), 'project_activities', ['user_id'], unique=False)
+
+    _unpartition(
+        'weather_data',
+        _weather_data_columns(),
+        ['idx_weather_garden_date', 'idx_weather_date', 'idx_weather_raw_data_gin'],
+    )
+    op.create_index('idx_weather_garden_date', 'weather_data', ['garden_id', 'date'], unique=True)
+    op.create_index('idx_weather_date', 'weather_data', ['date'], unique=False)
+
+    op.execute('DROP FUNCTION IF EXISTS create_monthly_partitions(regclass, date, integer)')
@@ -1,14 +1,19 @@
-from fastapi import Depends, HTTPException, status
+from functools import lru_cache
+from fastapi import Depends, HTTPException, Path, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
-from jose import jwt, JWTError
+from jwt import PyJWTError
 import uuid
 
 from app.core.config import settings
+from app.core.security import decode_token
 from app.db.session import get_db
 from app.models import User
 from app.crud import user as crud_user
+from app.crud.project import permission_satisfies, project_crud
+from app.models.project import ProjectPermission
 from app.schemas.token import TokenData
+from app.services.redis_service import NO_PERMISSION, RedisService
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/users/login/access-token"
@@ -23,15 +28,13 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         # The 'sub' field in the JWT standard is used for the subject, which is our user ID.
         user_id = payload.get("sub")
         if user_id is None:
             raise credentials_exception
         token_data = TokenData(user_id=user_id)
-    except JWTError:
+    except PyJWTError:
         raise credentials_exception
 
     user = await crud_user.get(db, id=token_data.user_id)
@@ -45,3 +48,85 @@ async def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+async def get_project_permission(
+    request: Request, db: AsyncSession, project_id: uuid.UUID, user_id: uuid.UUID
+) -> ProjectPermission | None:
+    """
+    Resolves a user's permission level on a project.
+
+    Lookups are memoised on the request (different permission dependencies
+    in one request share it) and cached in Redis for a short TTL; routes
+    that change membership invalidate the Redis entry. Raises 404 when
+    the project does not exist.
+    """
+    request_cache = getattr(request.state, "project_permissions", None)
+    if request_cache is None:
+        request_cache = {}
+        setattr(request.state, "project_permissions", request_cache)
+    cache_key = (project_id, user_id)
+    if cache_key in request_cache:
+        return request_cache[cache_key]
+
+    redis_client = getattr(request.app.state, "redis", None)
+    redis_service = RedisService(redis_client) if redis_client is not None else None
+    cached = await redis_service.get_project_permission(project_id, user_id) if redis_service else None
+
+    if cached is not None:
+        granted = None if cached == NO_PERMISSION else ProjectPermission(cached)
+    else:
+        project_exists, granted = await project_crud.get_user_permission(db=db, project_id=project_id, user_id=user_id)
+        if not project_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+        if redis_service:
+            await redis_service.set_project_permission(
+                project_id, user_id,
+                granted.value if granted else NO_PERMISSION,
+                settings.PERMISSION_CACHE_EXPIRE_SECONDS
+            )
+
+    request_cache[cache_key] = granted
+    return granted
+
+async def invalidate_project_permission(
+    request: Request, project_id: uuid.UUID, user_id: uuid.UUID | None = None
+) -> None:
+    """
+    Forgets cached permissions for one user on a project, or for everyone on
+    it when no user is given. Call after membership changes.
+    """
+    request_cache = getattr(request.state, "project_permissions", {})
+    for key in [key for key in request_cache if key[0] == project_id and (user_id is None or key[1] == user_id)]:
+        del request_cache[key]
+
+    redis_client = getattr(request.app.state, "redis", None)
+    if redis_client is not None:
+        await RedisService(redis_client).invalidate_project_permissions(project_id, user_id)
+
+@lru_cache(maxsize=None)
+def require_project_permission(required: ProjectPermission = ProjectPermission.VIEWER):
+    """
+    Dependency factory guarding routes with a `project_id` path parameter.
+
+    The factory is memoised so each permission level maps to a single
+    dependency callable; FastAPI then caches its result per request, so the
+    permission check runs at most once however many times it is declared.
+    """
+    async def check_project_permission(
+        request: Request,
+        project_id: uuid.UUID = Path(...),
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+    ) -> ProjectPermission:
+        granted = await get_project_permission(request, db, project_id, current_user.id)
+        if not permission_satisfies(granted, required):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions for this project",
+            )
+        return required
+
+    return check_project_permission
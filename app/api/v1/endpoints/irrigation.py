@@ -1,7 +1,10 @@
+import json
 from typing import List, Dict, Any, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Query, Request
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 import base64
 from datetime import datetime
 
@@ -12,10 +15,12 @@ from app.schemas.irrigation import (
     CostEstimationInput, CostEstimationResult, IrrigationZone, IrrigationPipe, IrrigationProject,
     IrrigationZoneCreate, IrrigationZoneUpdate, IrrigationZone as IrrigationZoneSchema,
     IrrigationEquipmentCreate, IrrigationEquipmentUpdate, IrrigationEquipment as IrrigationEquipmentSchema,
+    IrrigationPipeCreate, IrrigationPipe as IrrigationPipeSchema,
     IrrigationScheduleCreate, IrrigationScheduleUpdate, IrrigationSchedule as IrrigationScheduleSchema,
     WeatherDataCreate, WeatherData as WeatherDataSchema, IrrigationProjectCreate, IrrigationProjectUpdate,
-    IrrigationProject as IrrigationProjectSchema
+    IrrigationProject as IrrigationProjectSchema, EquipmentType, ScheduleType
 )
+from app.schemas._fast import cost_input_decoder, hydraulic_input_decoder
 from app.services.irrigation_planner import IrrigationPlanner
 from app.services.hydraulic_engine import HydraulicEngine
 from app.services.clustering_engine import ClusteringEngine
@@ -24,7 +29,7 @@ from app.services.technical_export import TechnicalExportService
 from app.api.deps import get_current_user, get_db
 from app.schemas.user import UserPublic
 from app.crud.irrigation import (
-    irrigation_zone_crud, irrigation_equipment_crud, irrigation_schedule_crud,
+    irrigation_zone_crud, irrigation_equipment_crud, irrigation_pipe_crud, irrigation_schedule_crud,
     weather_data_crud, irrigation_project_crud
 )
 
@@ -38,6 +43,20 @@ weather_service = WeatherService()
 technical_export_service = TechnicalExportService()
 
 
+def _json_request_body(model: type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI requestBody for endpoints that decode their body themselves."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
+
+async def _decode_body(request: Request, decoder: msgspec.json.Decoder) -> Any:
+    try:
+        return decoder.decode(await request.body())
+    except (msgspec.ValidationError, msgspec.DecodeError) as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 # Legacy endpoints for backward compatibility
 @router.post("/zones", response_model=ZoneOutput)
 def compute_watering_zones(
@@ -77,15 +96,21 @@ def perform_plant_clustering(
 
 
 # Hydraulic calculation endpoints
-@router.post("/hydraulics", response_model=HydraulicCalculationResult)
-def calculate_hydraulics(
-    hydraulic_input: HydraulicCalculationInput,
+@router.post(
+    "/hydraulics",
+    response_model=HydraulicCalculationResult,
+    openapi_extra=_json_request_body(HydraulicCalculationInput),
+)
+async def calculate_hydraulics(
+    request: Request,
     current_user: UserPublic = Depends(get_current_user),
 ):
     """
     Perform comprehensive hydraulic calculations for irrigation systems.
     Includes Darcy-Weisbach equations, Reynolds number calculations, and pressure loss analysis.
+    The body is decoded with msgspec; HydraulicCalculationInput documents it.
     """
+    hydraulic_input = await _decode_body(request, hydraulic_input_decoder)
     return hydraulic_engine.calculate_network_hydraulics(
         zones=hydraulic_input.zones,
         pipes=[],  # Will be generated from zones
@@ -155,15 +180,21 @@ def design_complete_irrigation_system(
 
 
 # Cost estimation endpoint
-@router.post("/cost-estimation", response_model=CostEstimationResult)
-def estimate_system_costs(
-    cost_input: CostEstimationInput,
+@router.post(
+    "/cost-estimation",
+    response_model=CostEstimationResult,
+    openapi_extra=_json_request_body(CostEstimationInput),
+)
+async def estimate_system_costs(
+    request: Request,
     current_user: UserPublic = Depends(get_current_user),
 ):
     """
     Estimate comprehensive costs for irrigation system.
     Includes equipment, pipes, installation, and ROI calculations.
+    The body is decoded with msgspec; CostEstimationInput documents it.
     """
+    cost_input = await _decode_body(request, cost_input_decoder)
     return irrigation_planner.calculate_system_costs(
         zones=cost_input.zones,
         equipment_selections=cost_input.equipment_selections,
@@ -186,51 +217,53 @@ def generate_technical_report(
 
 # Irrigation Zone CRUD endpoints
 @router.post("/zones", response_model=IrrigationZoneSchema)
-def create_irrigation_zone(
+async def create_irrigation_zone(
     zone_in: IrrigationZoneCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Create a new irrigation zone."""
-    return irrigation_zone_crud.create_zone(db=db, zone_in=zone_in)
+    return await irrigation_zone_crud.create_zone(db=db, zone_in=zone_in)
 
 
 @router.get("/zones", response_model=List[IrrigationZoneSchema])
-def get_irrigation_zones(
+async def get_irrigation_zones(
     garden_id: Optional[UUID] = None,
+    plant_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get irrigation zones with optional filtering."""
-    return irrigation_zone_crud.get_zones(
-        db=db, garden_id=garden_id, skip=skip, limit=limit
+    zones = await irrigation_zone_crud.get_zones(
+        db=db, garden_id=garden_id, plant_id=plant_id, skip=skip, limit=limit
     )
+    return [IrrigationZoneSchema.from_orm_fast(zone) for zone in zones]
 
 
 @router.get("/zones/{zone_id}", response_model=IrrigationZoneSchema)
-def get_irrigation_zone(
+async def get_irrigation_zone(
     zone_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get a specific irrigation zone."""
-    zone = irrigation_zone_crud.get_zone(db=db, zone_id=zone_id)
+    zone = await irrigation_zone_crud.get_zone(db=db, zone_id=zone_id)
     if not zone:
         raise HTTPException(status_code=404, detail="Irrigation zone not found")
     return zone
 
 
 @router.put("/zones/{zone_id}", response_model=IrrigationZoneSchema)
-def update_irrigation_zone(
+async def update_irrigation_zone(
     zone_id: UUID,
     zone_in: IrrigationZoneUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Update an irrigation zone."""
-    zone = irrigation_zone_crud.update_zone(
+    zone = await irrigation_zone_crud.update_zone(
         db=db, zone_id=zone_id, zone_in=zone_in
     )
     if not zone:
@@ -239,13 +272,13 @@ def update_irrigation_zone(
 
 
 @router.delete("/zones/{zone_id}")
-def delete_irrigation_zone(
+async def delete_irrigation_zone(
     zone_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Delete an irrigation zone."""
-    success = irrigation_zone_crud.delete_zone(db=db, zone_id=zone_id)
+    success = await irrigation_zone_crud.delete_zone(db=db, zone_id=zone_id)
     if not success:
         raise HTTPException(status_code=404, detail="Irrigation zone not found")
     return {"message": "Irrigation zone deleted successfully"}
@@ -253,37 +286,49 @@ def delete_irrigation_zone(
 
 # Irrigation Equipment CRUD endpoints
 @router.post("/equipment", response_model=IrrigationEquipmentSchema)
-def create_irrigation_equipment(
+async def create_irrigation_equipment(
     equipment_in: IrrigationEquipmentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Create new irrigation equipment."""
-    return irrigation_equipment_crud.create_equipment(db=db, equipment_in=equipment_in)
+    return await irrigation_equipment_crud.create_equipment(db=db, equipment_in=equipment_in)
 
 
 @router.get("/equipment", response_model=List[IrrigationEquipmentSchema])
-def get_irrigation_equipment(
-    equipment_type: Optional[str] = None,
+async def get_irrigation_equipment(
+    equipment_type: Optional[EquipmentType] = None,
+    specifications: Optional[str] = Query(
+        None, description='JSON object the equipment specifications must contain, e.g. {"uv_resistant": true}'
+    ),
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get irrigation equipment with optional filtering."""
-    return irrigation_equipment_crud.get_equipment(
-        db=db, equipment_type=equipment_type, skip=skip, limit=limit
+    spec_filter = None
+    if specifications:
+        try:
+            spec_filter = json.loads(specifications)
+        except ValueError:
+            spec_filter = None
+        if not isinstance(spec_filter, dict):
+            raise HTTPException(status_code=422, detail="specifications must be a JSON object")
+    equipment = await irrigation_equipment_crud.get_equipment(
+        db=db, equipment_type=equipment_type, specifications=spec_filter, skip=skip, limit=limit
     )
+    return [IrrigationEquipmentSchema.from_orm_fast(item) for item in equipment]
 
 
 @router.get("/equipment/{equipment_id}", response_model=IrrigationEquipmentSchema)
-def get_irrigation_equipment_by_id(
+async def get_irrigation_equipment_by_id(
     equipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get specific irrigation equipment."""
-    equipment = irrigation_equipment_crud.get_equipment_by_id(
+    equipment = await irrigation_equipment_crud.get_equipment_by_id(
         db=db, equipment_id=equipment_id
     )
     if not equipment:
@@ -292,14 +337,14 @@ def get_irrigation_equipment_by_id(
 
 
 @router.put("/equipment/{equipment_id}", response_model=IrrigationEquipmentSchema)
-def update_irrigation_equipment(
+async def update_irrigation_equipment(
     equipment_id: UUID,
     equipment_in: IrrigationEquipmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Update irrigation equipment."""
-    equipment = irrigation_equipment_crud.update_equipment(
+    equipment = await irrigation_equipment_crud.update_equipment(
         db=db, equipment_id=equipment_id, equipment_in=equipment_in
     )
     if not equipment:
@@ -308,52 +353,76 @@ def update_irrigation_equipment(
 
 
 @router.delete("/equipment/{equipment_id}")
-def delete_irrigation_equipment(
+async def delete_irrigation_equipment(
     equipment_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Delete irrigation equipment."""
-    success = irrigation_equipment_crud.delete_equipment(db=db, equipment_id=equipment_id)
+    success = await irrigation_equipment_crud.delete_equipment(db=db, equipment_id=equipment_id)
     if not success:
         raise HTTPException(status_code=404, detail="Irrigation equipment not found")
     return {"message": "Irrigation equipment deleted successfully"}
 
 
+# Irrigation Pipe endpoints
+@router.post("/pipes/bulk", response_model=List[IrrigationPipeSchema])
+async def bulk_create_irrigation_pipes(
+    pipes_in: List[IrrigationPipeCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPublic = Depends(get_current_user),
+):
+    """Save a designed pipe network in one batch."""
+    pipes = await irrigation_pipe_crud.bulk_create_pipes(db=db, pipes_in=pipes_in)
+    return [IrrigationPipeSchema.from_orm_fast(pipe) for pipe in pipes]
+
+
 # Irrigation Schedule CRUD endpoints
 @router.post("/schedules", response_model=IrrigationScheduleSchema)
-def create_irrigation_schedule(
+async def create_irrigation_schedule(
     schedule_in: IrrigationScheduleCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Create new irrigation schedule."""
-    return irrigation_schedule_crud.create_schedule(db=db, schedule_in=schedule_in)
+    return await irrigation_schedule_crud.create_schedule(db=db, schedule_in=schedule_in)
+
+
+@router.post("/schedules/bulk", response_model=List[IrrigationScheduleSchema])
+async def bulk_create_irrigation_schedules(
+    schedules_in: List[IrrigationScheduleCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPublic = Depends(get_current_user),
+):
+    """Create many irrigation schedules in one batch."""
+    schedules = await irrigation_schedule_crud.bulk_create_schedules(db=db, schedules_in=schedules_in)
+    return [IrrigationScheduleSchema.from_orm_fast(schedule) for schedule in schedules]
 
 
 @router.get("/schedules", response_model=List[IrrigationScheduleSchema])
-def get_irrigation_schedules(
+async def get_irrigation_schedules(
     zone_id: Optional[UUID] = None,
-    schedule_type: Optional[str] = None,
+    schedule_type: Optional[ScheduleType] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get irrigation schedules with optional filtering."""
-    return irrigation_schedule_crud.get_schedules(
+    schedules = await irrigation_schedule_crud.get_schedules(
         db=db, zone_id=zone_id, schedule_type=schedule_type, skip=skip, limit=limit
     )
+    return [IrrigationScheduleSchema.from_orm_fast(schedule) for schedule in schedules]
 
 
 @router.get("/schedules/{schedule_id}", response_model=IrrigationScheduleSchema)
-def get_irrigation_schedule_by_id(
+async def get_irrigation_schedule_by_id(
     schedule_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get specific irrigation schedule."""
-    schedule = irrigation_schedule_crud.get_schedule_by_id(
+    schedule = await irrigation_schedule_crud.get_schedule_by_id(
         db=db, schedule_id=schedule_id
     )
     if not schedule:
@@ -362,14 +431,14 @@ def get_irrigation_schedule_by_id(
 
 
 @router.put("/schedules/{schedule_id}", response_model=IrrigationScheduleSchema)
-def update_irrigation_schedule(
+async def update_irrigation_schedule(
     schedule_id: UUID,
     schedule_in: IrrigationScheduleUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Update irrigation schedule."""
-    schedule = irrigation_schedule_crud.update_schedule(
+    schedule = await irrigation_schedule_crud.update_schedule(
         db=db, schedule_id=schedule_id, schedule_in=schedule_in
     )
     if not schedule:
@@ -378,13 +447,13 @@ def update_irrigation_schedule(
 
 
 @router.delete("/schedules/{schedule_id}")
-def delete_irrigation_schedule(
+async def delete_irrigation_schedule(
     schedule_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Delete irrigation schedule."""
-    success = irrigation_schedule_crud.delete_schedule(db=db, schedule_id=schedule_id)
+    success = await irrigation_schedule_crud.delete_schedule(db=db, schedule_id=schedule_id)
     if not success:
         raise HTTPException(status_code=404, detail="Irrigation schedule not found")
     return {"message": "Irrigation schedule deleted successfully"}
@@ -392,66 +461,79 @@ def delete_irrigation_schedule(
 
 # Weather Data endpoints
 @router.post("/weather-data", response_model=WeatherDataSchema)
-def create_weather_data(
+async def create_weather_data(
     weather_in: WeatherDataCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Create new weather data entry."""
-    return weather_data_crud.create_weather_data(db=db, weather_in=weather_in)
+    return await weather_data_crud.create_weather_data(db=db, weather_in=weather_in)
+
+
+@router.post("/weather-data/bulk", response_model=List[WeatherDataSchema])
+async def bulk_create_weather_data(
+    weather_in: List[WeatherDataCreate],
+    db: AsyncSession = Depends(get_db),
+    current_user: UserPublic = Depends(get_current_user),
+):
+    """Import many weather data entries in one batch."""
+    entries = await weather_data_crud.bulk_create_weather_data(db=db, weather_in=weather_in)
+    return [WeatherDataSchema.from_orm_fast(entry) for entry in entries]
 
 
 @router.get("/weather-data", response_model=List[WeatherDataSchema])
-def get_weather_data(
+async def get_weather_data(
     garden_id: Optional[UUID] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get weather data with optional filtering."""
-    return weather_data_crud.get_weather_data(
+    entries = await weather_data_crud.get_weather_data(
         db=db, garden_id=garden_id, start_date=start_date, 
         end_date=end_date, skip=skip, limit=limit
     )
+    return [WeatherDataSchema.from_orm_fast(entry) for entry in entries]
 
 
 # Irrigation Project endpoints
 @router.post("/projects", response_model=IrrigationProjectSchema)
-def create_irrigation_project(
+async def create_irrigation_project(
     project_in: IrrigationProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Create new irrigation project."""
-    return irrigation_project_crud.create_project(db=db, project_in=project_in)
+    return await irrigation_project_crud.create_project(db=db, project_in=project_in)
 
 
 @router.get("/projects", response_model=List[IrrigationProjectSchema])
-def get_irrigation_projects(
+async def get_irrigation_projects(
     garden_id: Optional[UUID] = None,
     is_active: Optional[bool] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get irrigation projects with optional filtering."""
-    return irrigation_project_crud.get_projects(
+    projects = await irrigation_project_crud.get_projects(
         db=db, garden_id=garden_id, is_active=is_active, skip=skip, limit=limit
     )
+    return [IrrigationProjectSchema.from_orm_fast(project) for project in projects]
 
 
 @router.get("/projects/{project_id}", response_model=IrrigationProjectSchema)
-def get_irrigation_project_by_id(
+async def get_irrigation_project_by_id(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Get specific irrigation project."""
-    project = irrigation_project_crud.get_project_by_id(
+    project = await irrigation_project_crud.get_project_by_id(
         db=db, project_id=project_id
     )
     if not project:
@@ -460,14 +542,14 @@ def get_irrigation_project_by_id(
 
 
 @router.put("/projects/{project_id}", response_model=IrrigationProjectSchema)
-def update_irrigation_project(
+async def update_irrigation_project(
     project_id: UUID,
     project_in: IrrigationProjectUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Update irrigation project."""
-    project = irrigation_project_crud.update_project(
+    project = await irrigation_project_crud.update_project(
         db=db, project_id=project_id, project_in=project_in
     )
     if not project:
@@ -476,13 +558,13 @@ def update_irrigation_project(
 
 
 @router.delete("/projects/{project_id}")
-def delete_irrigation_project(
+async def delete_irrigation_project(
     project_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Delete irrigation project."""
-    success = irrigation_project_crud.delete_project(db=db, project_id=project_id)
+    success = await irrigation_project_crud.delete_project(db=db, project_id=project_id)
     if not success:
         raise HTTPException(status_code=404, detail="Irrigation project not found")
     return {"message": "Irrigation project deleted successfully"}
@@ -1,16 +1,19 @@
 from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
-from app import crud
 from app.api import deps
 from app.schemas.plant_catalog import PaginatedPlantCatalog, PlantCatalog
+from app.services.plant_catalog_cache import plant_catalog_cache
 
 router = APIRouter()
 
+# The catalog is static and served from memory; the session is only used
+# to load it if startup could not.
+
 @router.get("/", response_model=PaginatedPlantCatalog)
-def read_plant_catalog(
-    db: Session = Depends(deps.get_db),
+async def read_plant_catalog(
+    db: AsyncSession = Depends(deps.get_db),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Number of items per page"),
     q: Optional[str] = Query(None, description="Full-text search query"),
@@ -21,9 +24,10 @@ def read_plant_catalog(
     """
     Retrieve plants from the catalog with pagination and filtering.
     """
+    await plant_catalog_cache.ensure_loaded(db)
     skip = (page - 1) * page_size
-    plants, total = crud.plant_catalog.get_multi(
-        db, skip=skip, limit=page_size, q=q, plant_type=plant_type, season=season, sun=sun
+    plants, total = plant_catalog_cache.search(
+        skip=skip, limit=page_size, q=q, plant_type=plant_type, season=season, sun=sun
     )
     return PaginatedPlantCatalog(
         total=total,
@@ -33,17 +37,18 @@ def read_plant_catalog(
     )
 
 @router.get("/types", response_model=List[str])
-def get_plant_types(db: Session = Depends(deps.get_db)):
+async def get_plant_types(db: AsyncSession = Depends(deps.get_db)):
     """
     Get a list of unique plant types.
     """
-    types = crud.plant_catalog.get_plant_types(db)
-    return [t[0] for t in types if t[0]]
+    await plant_catalog_cache.ensure_loaded(db)
+    return plant_catalog_cache.plant_types()
 
 
 @router.get("/seasons", response_model=List[str])
-def get_planting_seasons(db: Session = Depends(deps.get_db)):
+async def get_planting_seasons(db: AsyncSession = Depends(deps.get_db)):
     """
     Get a list of unique planting seasons.
     """
-    return crud.plant_catalog.get_planting_seasons(db)
+    await plant_catalog_cache.ensure_loaded(db)
+    return plant_catalog_cache.planting_seasons()
@@ -66,7 +66,7 @@ async def read_plants_by_garden(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
     plants = await crud_plant.get_multi_by_garden(db=db, garden_id=garden_id, skip=skip, limit=limit)
-    return plants
+    return [PlantSchema.from_orm_fast(plant) for plant in plants]
 
 @router.put("/{plant_id}", response_model=PlantSchema)
 async def update_plant(
@@ -1,67 +1,127 @@
 import uuid
+import hashlib
 import json
-from datetime import datetime
+import logging
+import time
+from datetime import datetime, timezone
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, WebSocket, WebSocketDisconnect, Query, Path
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status, WebSocket, WebSocketDisconnect, Query, Path
+from fastapi.responses import FileResponse, ORJSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_db, get_current_user
+from app.api.deps import get_db, get_current_user, invalidate_project_permission, require_project_permission
 from app.schemas.user import UserPublic
 from app.schemas.project import (
-    Project, ProjectCreate, ProjectUpdate, ProjectDetail, ProjectList,
+    Project, ProjectCreate, ProjectUpdate, ProjectDetail, ProjectList, ProjectSummary,
     ProjectMember, ProjectMemberCreate, ProjectMemberUpdate,
     ProjectVersion, ProjectVersionCreate,
     ProjectComment, ProjectCommentCreate, ProjectCommentUpdate,
     ProjectActivity, ProjectFilter, ProjectSort, ProjectExport, ProjectImport,
-    ProjectWebSocketMessage, ProjectCollaborationMessage,
+    ProjectWebSocketMessageDC, ProjectCollaborationMessageDC,
     ProjectPermission, ProjectStatus
 )
 from app.crud.project import project_crud, project_member_crud, project_version_crud, project_comment_crud
 from app.services.websocket_manager import websocket_manager
 from app.services.project_export_service import project_export_service
+from app.services.redis_service import RedisService
+from app.core.config import settings
 from app.utils import UUIDEncoder
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+async def _broadcast_safely(send, *args, **kwargs):
+    """Run a WebSocket broadcast after the response, logging failures instead of raising."""
+    try:
+        await send(*args, **kwargs)
+    except Exception:
+        logger.exception("WebSocket broadcast failed")
+
+def _ws_to_dict(message) -> dict:
+    """JSON-ready dict for a broadcast dataclass, keyed like the matching pydantic message."""
+    user_id = str(message.user_id) if message.user_id is not None else None
+    if isinstance(message, ProjectCollaborationMessageDC):
+        return {
+            "type": message.type,
+            "project_id": str(message.project_id),
+            "user_id": user_id,
+            "user_name": message.user_name,
+            "data": message.data,
+            "ts": message.ts,
+        }
+    return {
+        "type": message.type,
+        "project_id": str(message.project_id),
+        "data": message.data,
+        "ts": message.ts,
+        "user_id": user_id,
+        "user_name": message.user_name,
+    }
+
+async def _invalidate_public_projects(request: Request) -> None:
+    """Drop cached public project listings after a project write."""
+    redis_client = getattr(request.app.state, "redis", None)
+    if redis_client is not None:
+        await RedisService(redis_client).invalidate_public_projects()
+
+def _weak_etag(*parts) -> str:
+    """Weak ETag over the values that determine a response body."""
+    return 'W/"%s"' % hashlib.sha1(json.dumps(parts, default=str).encode()).hexdigest()
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match already names this ETag (weak comparison)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") in (bare, "*") for tag in header.split(","))
 
 # --- Project CRUD Endpoints ---
 
 @router.post("/", response_model=Project, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_in: ProjectCreate,
     current_user: UserPublic = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
 ):
     """Create a new project."""
     try:
-        project = project_crud.create_project(
+        project = await project_crud.create_project(
             db=db, project_in=project_in, owner_id=current_user.id
         )
         
-        # Broadcast to WebSocket clients
-        await websocket_manager.broadcast_to_user(
-            current_user.id,
-            ProjectWebSocketMessage(
-                type="project_created",
-                project_id=project.id,
-                data=Project.model_validate(project).model_dump(),
-                user_id=current_user.id,
-                user_name=current_user.full_name
-            ).model_dump()
-        )
-        
-        return project
+        # Serialize once and reuse it for both the broadcast and the response body
+        payload = Project.from_orm_fast(project).model_dump(mode="json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to create project: {str(e)}"
         )
+    await _invalidate_public_projects(request)
+    
+    # Broadcast to WebSocket clients once the response has been sent
+    background_tasks.add_task(
+        _broadcast_safely,
+        websocket_manager.broadcast_to_user,
+        current_user.id,
+        _ws_to_dict(ProjectWebSocketMessageDC(
+            type="project_created",
+            project_id=project.id,
+            data=payload,
+            user_id=current_user.id,
+            user_name=current_user.full_name
+        ))
+    )
+    
+    return ORJSONResponse(content=payload, status_code=status.HTTP_201_CREATED)
 
 @router.get("/", response_model=ProjectList)
-def read_projects(
+async def read_projects(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserPublic = Depends(get_current_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
@@ -69,7 +129,7 @@ def read_projects(
     search: Optional[str] = Query(None, max_length=100),
 ):
     """Get projects for the current user with pagination and filtering."""
-    projects, total = project_crud.get_user_projects(
+    projects, total = await project_crud.get_user_projects(
         db=db,
         user_id=current_user.id,
         skip=skip,
@@ -78,19 +138,23 @@ def read_projects(
         search=search
     )
     
-    return ProjectList(
-        projects=projects,
+    # Rows are converted once by from_orm_fast and serialized directly; returning
+    # the model would have FastAPI dump it and validate every project again.
+    body = ProjectList.model_construct(
+        projects=[ProjectSummary.from_orm_fast(project) for project in projects],
         total=total,
         page=skip // limit + 1,
         size=limit,
         has_next=skip + limit < total,
         has_prev=skip > 0
-    )
+    ).model_dump_json()
+    return Response(content=body, media_type="application/json")
 
 @router.get("/public", response_model=ProjectList)
-def read_public_projects(
+async def read_public_projects(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     search: Optional[str] = Query(None, max_length=100),
@@ -98,7 +162,21 @@ def read_public_projects(
     soil_type: Optional[str] = Query(None),
 ):
     """Get public projects with filtering."""
-    projects, total = project_crud.get_public_projects(
+    # Identical filters and page give identical results, so the serialized
+    # page is cached briefly under its ETag; project writes change the ETag.
+    # Clients revalidating an unchanged page get a 304 without touching the DB.
+    redis_client = getattr(request.app.state, "redis", None)
+    cache = RedisService(redis_client) if redis_client is not None else None
+    etag = None
+    if cache:
+        etag = await cache.public_projects_etag([skip, limit, search, climate_zone, soil_type])
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        cached = await cache.get_public_projects_page(etag)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json", headers={"ETag": etag})
+    
+    projects, total = await project_crud.get_public_projects(
         db=db,
         skip=skip,
         limit=limit,
@@ -107,60 +185,52 @@ def read_public_projects(
         soil_type=soil_type
     )
     
-    return ProjectList(
-        projects=projects,
+    body = ProjectList.model_construct(
+        projects=[ProjectSummary.from_orm_fast(project) for project in projects],
         total=total,
         page=skip // limit + 1,
         size=limit,
         has_next=skip + limit < total,
         has_prev=skip > 0
-    )
+    ).model_dump_json()
+    if cache:
+        await cache.set_public_projects_page(
+            etag, body, settings.PUBLIC_PROJECTS_CACHE_EXPIRE_SECONDS
+        )
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
+    return Response(content=body, media_type="application/json")
 
 @router.get("/{project_id}", response_model=ProjectDetail)
-def read_project(
+async def read_project(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Get a specific project with all details."""
-    project = project_crud.get_project_with_details(db, project_id)
+    project = await project_crud.get_project_with_details(db, project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to access this project"
-        )
-    
-    return project
+    return ProjectDetail.from_orm_fast(project)
 
 @router.put("/{project_id}", response_model=Project)
 async def update_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     project_in: ProjectUpdate,
     current_user: UserPublic = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.EDITOR)),
 ):
     """Update a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.EDITOR
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to edit this project"
-        )
-    
-    project = project_crud.update_project(
+    project = await project_crud.update_project(
         db=db, project_id=project_id, project_in=project_in, user_id=current_user.id
     )
     if not project:
@@ -168,30 +238,38 @@ async def update_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
+    await _invalidate_public_projects(request)
+    
+    # Serialize once and reuse it for both the broadcast and the response body
+    payload = Project.from_orm_fast(project).model_dump(mode="json")
     
-    # Broadcast to WebSocket clients
-    await websocket_manager.broadcast_to_project(
+    # Broadcast to WebSocket clients once the response has been sent
+    background_tasks.add_task(
+        _broadcast_safely,
+        websocket_manager.broadcast_to_project,
         str(project_id),
-        ProjectWebSocketMessage(
+        _ws_to_dict(ProjectWebSocketMessageDC(
             type="project_updated",
             project_id=project_id,
-            data=Project.model_validate(project).model_dump(),
+            data=payload,
             user_id=current_user.id,
             user_name=current_user.full_name
-        ).model_dump()
+        ))
     )
     
-    return project
+    return ORJSONResponse(content=payload)
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    background_tasks: BackgroundTasks,
 ):
     """Delete a project (soft delete)."""
-    success = project_crud.delete_project(
+    success = await project_crud.delete_project(
         db=db, project_id=project_id, user_id=current_user.id
     )
     if not success:
@@ -199,40 +277,37 @@ async def delete_project(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found or you don't have permission to delete it"
         )
+    await invalidate_project_permission(request, project_id)
+    await _invalidate_public_projects(request)
     
-    # Broadcast to WebSocket clients
-    await websocket_manager.broadcast_to_project(
+    # Broadcast to WebSocket clients once the response has been sent
+    background_tasks.add_task(
+        _broadcast_safely,
+        websocket_manager.broadcast_to_project,
         str(project_id),
-        ProjectWebSocketMessage(
+        _ws_to_dict(ProjectWebSocketMessageDC(
             type="project_deleted",
             project_id=project_id,
             data={"project_id": str(project_id)},
             user_id=current_user.id,
             user_name=current_user.full_name
-        ).model_dump()
+        ))
     )
 
 # --- Project Member Endpoints ---
 
 @router.post("/{project_id}/members", response_model=ProjectMember)
-def add_project_member(
+async def add_project_member(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     member_in: ProjectMemberCreate,
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.ADMIN)),
 ):
     """Add a member to a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.ADMIN
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to add members"
-        )
-    
-    member = project_member_crud.add_member(
+    member = await project_member_crud.add_member(
         db=db, project_id=project_id, member_in=member_in, invited_by=current_user.id
     )
     if not member:
@@ -240,48 +315,36 @@ def add_project_member(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="User not found or already a member"
         )
+    await invalidate_project_permission(request, project_id, member.user_id)
+    # members_count is part of the cached public listing
+    await _invalidate_public_projects(request)
     
     return member
 
 @router.get("/{project_id}/members", response_model=List[ProjectMember])
-def get_project_members(
+async def get_project_members(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Get all members of a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to view members"
-        )
-    
-    return project_member_crud.get_project_members(db=db, project_id=project_id)
+    return await project_member_crud.get_project_members(db=db, project_id=project_id)
 
 @router.put("/{project_id}/members/{user_id}", response_model=ProjectMember)
-def update_member_permission(
+async def update_member_permission(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     user_id: uuid.UUID = Path(...),
     member_update: ProjectMemberUpdate,
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.ADMIN)),
 ):
     """Update member permission."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.ADMIN
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to update member permissions"
-        )
-    
-    member = project_member_crud.update_member_permission(
+    member = await project_member_crud.update_member_permission(
         db=db, project_id=project_id, user_id=user_id, 
         permission=member_update.permission, updated_by=current_user.id
     )
@@ -290,28 +353,22 @@ def update_member_permission(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Member not found"
         )
+    await invalidate_project_permission(request, project_id, user_id)
     
     return member
 
 @router.delete("/{project_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_project_member(
+async def remove_project_member(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     user_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.ADMIN)),
 ):
     """Remove a member from a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.ADMIN
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to remove members"
-        )
-    
-    success = project_member_crud.remove_member(
+    success = await project_member_crud.remove_member(
         db=db, project_id=project_id, user_id=user_id, removed_by=current_user.id
     )
     if not success:
@@ -319,81 +376,74 @@ def remove_project_member(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Member not found"
         )
+    await invalidate_project_permission(request, project_id, user_id)
+    await _invalidate_public_projects(request)
 
 # --- Project Version Endpoints ---
 
 @router.post("/{project_id}/versions", response_model=ProjectVersion)
-def create_project_version(
+async def create_project_version(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     version_in: ProjectVersionCreate,
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.EDITOR)),
 ):
     """Create a new project version."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.EDITOR
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to create versions"
-        )
-    
     try:
-        version = project_version_crud.create_version(
+        version = await project_version_crud.create_version(
             db=db, project_id=project_id, version_in=version_in, created_by=current_user.id
         )
-        return version
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    # versions_count and current_version are part of the cached public listing
+    await _invalidate_public_projects(request)
+    
+    return version
 
 @router.get("/{project_id}/versions", response_model=List[ProjectVersion])
-def get_project_versions(
+async def get_project_versions(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Get versions of a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to view versions"
-        )
+    # A count/max query decides whether the client's copy is still current
+    # before the page is loaded and serialized.
+    fingerprint = await project_version_crud.get_versions_fingerprint(db, project_id)
+    etag = _weak_etag(fingerprint, skip, limit)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     
-    versions, _ = project_version_crud.get_project_versions(
+    versions, _ = await project_version_crud.get_project_versions(
         db=db, project_id=project_id, skip=skip, limit=limit
     )
     return versions
 
 @router.post("/{project_id}/versions/{version_id}/revert", response_model=Project)
-def revert_to_version(
+async def revert_to_version(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     version_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.EDITOR)),
 ):
     """Revert project to a specific version."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.EDITOR
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to revert versions"
-        )
-    
-    project = project_version_crud.revert_to_version(
+    project = await project_version_crud.revert_to_version(
         db=db, project_id=project_id, version_id=version_id, user_id=current_user.id
     )
     if not project:
@@ -401,77 +451,66 @@ def revert_to_version(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project or version not found"
         )
+    await _invalidate_public_projects(request)
     
     return project
 
 # --- Project Comment Endpoints ---
 
 @router.post("/{project_id}/comments", response_model=ProjectComment)
-def create_project_comment(
+async def create_project_comment(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     comment_in: ProjectCommentCreate,
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Create a new project comment."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to add comments"
-        )
-    
-    comment = project_comment_crud.create_comment(
+    comment = await project_comment_crud.create_comment(
         db=db, project_id=project_id, comment_in=comment_in, author_id=current_user.id
     )
+    # comments_count is part of the cached public listing
+    await _invalidate_public_projects(request)
+    
     return comment
 
 @router.get("/{project_id}/comments", response_model=List[ProjectComment])
-def get_project_comments(
+async def get_project_comments(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Get comments for a project."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to view comments"
-        )
+    fingerprint = await project_comment_crud.get_comments_fingerprint(db, project_id)
+    etag = _weak_etag(fingerprint, skip, limit)
+    if _etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    response.headers["ETag"] = etag
     
-    comments, _ = project_comment_crud.get_project_comments(
+    comments, _ = await project_comment_crud.get_project_comments(
         db=db, project_id=project_id, skip=skip, limit=limit
     )
     return comments
 
 @router.post("/{project_id}/comments/{comment_id}/resolve", response_model=ProjectComment)
-def resolve_comment(
+async def resolve_comment(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     comment_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.EDITOR)),
 ):
     """Mark a comment as resolved."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id, required_permission=ProjectPermission.EDITOR
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to resolve comments"
-        )
-    
-    comment = project_comment_crud.resolve_comment(
+    comment = await project_comment_crud.resolve_comment(
         db=db, comment_id=comment_id, resolved_by=current_user.id
     )
     if not comment:
@@ -485,42 +524,26 @@ def resolve_comment(
 # --- Project Export/Import Endpoints ---
 
 @router.get("/{project_id}/export", response_model=ProjectExport)
-def export_project(
+async def export_project(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Export a project with all its data."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to export this project"
-        )
-    
-    return project_export_service.export_project(db=db, project_id=project_id)
+    return await project_export_service.export_project(db=db, project_id=project_id)
 
 @router.get("/{project_id}/export/json")
-def export_project_json(
+async def export_project_json(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Export a project as JSON file."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to export this project"
-        )
-    
-    file_path = project_export_service.export_to_json(db=db, project_id=project_id)
+    file_path = await project_export_service.export_to_json(db=db, project_id=project_id)
     return FileResponse(
         path=file_path,
         media_type="application/json",
@@ -528,23 +551,15 @@ def export_project_json(
     )
 
 @router.get("/{project_id}/export/pdf")
-def export_project_pdf(
+async def export_project_pdf(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     project_id: uuid.UUID = Path(...),
     current_user: UserPublic = Depends(get_current_user),
+    current_perm: ProjectPermission = Depends(require_project_permission(ProjectPermission.VIEWER)),
 ):
     """Export a project as PDF file."""
-    # Check permissions
-    if not project_crud.check_user_permission(
-        db=db, project_id=project_id, user_id=current_user.id
-    ):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to export this project"
-        )
-    
-    file_path = project_export_service.export_to_pdf(db=db, project_id=project_id)
+    file_path = await project_export_service.export_to_pdf(db=db, project_id=project_id)
     return FileResponse(
         path=file_path,
         media_type="application/pdf",
@@ -552,23 +567,26 @@ def export_project_pdf(
     )
 
 @router.post("/import", response_model=Project)
-def import_project(
+async def import_project(
     *,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     project_import: ProjectImport,
     current_user: UserPublic = Depends(get_current_user),
 ):
     """Import a project from JSON data."""
     try:
-        project = project_export_service.import_project(
+        project = await project_export_service.import_project(
             db=db, project_import=project_import, owner_id=current_user.id
         )
-        return project
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to import project: {str(e)}"
         )
+    await _invalidate_public_projects(request)
+    
+    return project
 
 # --- WebSocket Endpoint for Real-time Collaboration ---
 
@@ -577,10 +595,11 @@ async def project_websocket(
     websocket: WebSocket,
     project_id: str,
     token: str = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """WebSocket endpoint for real-time project collaboration."""
     await websocket.accept()
+    joined = False
     
     try:
         # Validate user token and get user
@@ -590,34 +609,36 @@ async def project_websocket(
             await websocket.close(code=4001, reason="Invalid token")
             return
         
-        # Check project permissions
-        if not project_crud.check_user_permission(
-            db=db, project_id=uuid.UUID(project_id), user_id=user_id
+        # Check project access (owner or any member) in a single query
+        if not await project_crud.has_project_access(
+            db=db, project_id=uuid.UUID(project_id), user_id=uuid.UUID(str(user_id))
         ):
             await websocket.close(code=4003, reason="Insufficient permissions")
             return
         
-        # Add connection to project room
-        websocket_manager.add_project_connection(project_id, user_id, websocket)
+        # Add connection to project room and shared presence set
+        present_users = await websocket_manager.join_project(project_id, user_id, websocket)
+        joined = True
         
         # Send connection confirmation
         await websocket.send_text(json.dumps({
             "type": "connection_established",
             "project_id": project_id,
             "user_id": str(user_id),
-            "timestamp": datetime.utcnow().isoformat()
+            "present_users": sorted(present_users),
+            "timestamp": datetime.now(timezone.utc).isoformat()
         }))
         
         # Broadcast user joined
         await websocket_manager.broadcast_to_project(
             project_id,
-            ProjectCollaborationMessage(
+            _ws_to_dict(ProjectCollaborationMessageDC(
                 type="user_joined",
                 project_id=uuid.UUID(project_id),
                 user_id=user_id,
                 user_name="User",  # You'd get this from the user object
                 data={"user_id": str(user_id)}
-            ).model_dump()
+            ))
         )
         
         # Handle incoming messages
@@ -626,34 +647,35 @@ async def project_websocket(
             message = json.loads(data)
             
             if message.get("type") == "ping":
+                # Integer epoch milliseconds; no datetime/isoformat work per ping
                 await websocket.send_text(json.dumps({
                     "type": "pong",
-                    "timestamp": datetime.utcnow().isoformat()
+                    "ts": time.time_ns() // 1_000_000
                 }))
             elif message.get("type") == "cursor_update":
                 # Broadcast cursor position to other users
                 await websocket_manager.broadcast_to_project(
                     project_id,
-                    ProjectCollaborationMessage(
+                    _ws_to_dict(ProjectCollaborationMessageDC(
                         type="cursor_update",
                         project_id=uuid.UUID(project_id),
                         user_id=user_id,
                         user_name="User",
                         data=message.get("data", {})
-                    ).model_dump(),
+                    )),
                     exclude_user_id=user_id
                 )
             elif message.get("type") == "layout_update":
                 # Handle real-time layout updates
                 await websocket_manager.broadcast_to_project(
                     project_id,
-                    ProjectCollaborationMessage(
+                    _ws_to_dict(ProjectCollaborationMessageDC(
                         type="layout_update",
                         project_id=uuid.UUID(project_id),
                         user_id=user_id,
                         user_name="User",
                         data=message.get("data", {})
-                    ).model_dump(),
+                    )),
                     exclude_user_id=user_id
                 )
                 
@@ -662,15 +684,16 @@ async def project_websocket(
     except Exception as e:
         await websocket.close(code=4000, reason=f"Error: {str(e)}")
     finally:
-        # Remove connection and broadcast user left
-        websocket_manager.remove_project_connection(project_id, user_id)
-        await websocket_manager.broadcast_to_project(
-            project_id,
-            ProjectCollaborationMessage(
-                type="user_left",
-                project_id=uuid.UUID(project_id),
-                user_id=user_id,
-                user_name="User",
-                data={"user_id": str(user_id)}
-            ).model_dump()
-        )
+        if joined:
+            # Remove connection and broadcast user left
+            await websocket_manager.leave_project(project_id, user_id)
+            await websocket_manager.broadcast_to_project(
+                project_id,
+                _ws_to_dict(ProjectCollaborationMessageDC(
+                    type="user_left",
+                    project_id=uuid.UUID(project_id),
+                    user_id=user_id,
+                    user_name="User",
+                    data={"user_id": str(user_id)}
+                ))
+            )
@@ -62,4 +62,4 @@ def read_current_user(current_user: User = Depends(get_current_active_user)):
     """
     Get the current logged-in user.
     """
-    return current_user
+    return UserPublic.from_orm_fast(current_user)
@@ -1,9 +1,15 @@
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 def setup_security_logger():
     """
     Sets up a dedicated logger for security-related events.
+
+    Records are put on an in-memory queue; a background QueueListener owns
+    the rotating file handler, so file writes and rotation never block the
+    request path.
     """
     logger = logging.getLogger("auth_security")
     logger.setLevel(logging.INFO)
@@ -23,8 +29,14 @@ def setup_security_logger():
         )
         handler.setFormatter(formatter)
 
-        # Add the handler to the logger
-        logger.addHandler(handler)
+        # The logger only enqueues; the listener thread does the file I/O
+        log_queue = queue.SimpleQueue()
+        logger.addHandler(QueueHandler(log_queue))
+
+        listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        listener.start()
+        # Flush anything still queued when the process exits
+        atexit.register(listener.stop)
 
     return logger
 
@@ -1,8 +1,16 @@
+import asyncio
+import base64
+import hashlib
+import os
+import time
 import uuid
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from typing import Any, Union
 
-from jose import jwt, JWTError
+from cachetools import TTLCache
+import jwt
+from jwt import ExpiredSignatureError
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from itsdangerous import URLSafeTimedSerializer, SignatureExpired, BadTimeSignature
@@ -13,27 +21,63 @@ from app.core.config import settings
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
 # --- Password Hashing Setup ---
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Pinning min/max rounds to the configured cost makes `needs_update` flag any
+# stored hash created with a different cost, so it is migrated on next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# --- Verified Password Cache ---
+# Successful verifications are remembered for a short while so clients that
+# re-send the same credentials skip bcrypt. Failed attempts are never cached,
+# so guessing always pays the full hashing cost.
+_verified_passwords: TTLCache = TTLCache(maxsize=4096, ttl=60)
+
+def _verification_key(plain_password: str, hashed_password: str) -> bytes:
+    return hashlib.sha256(plain_password.encode() + b"\0" + hashed_password.encode()).digest()
 
 # --- Timed Serializer for Tokens (Email Verification, Password Reset) ---
 # This uses a different secret than JWTs for better security separation.
-serializer = URLSafeTimedSerializer(settings.SECRET_KEY)
+# BLAKE2b is cheaper than the default SHA-1 HMAC on these short payloads.
+serializer = URLSafeTimedSerializer(
+    settings.SECRET_KEY,
+    signer_kwargs={"digest_method": hashlib.blake2b},
+)
+
+# Per-purpose serializers are built once with their salt fixed, instead of
+# passing the salt on every dumps/loads call.
+_email_verification_serializer = URLSafeTimedSerializer(
+    settings.SECRET_KEY,
+    salt='email-verification-salt',
+    signer_kwargs={"digest_method": hashlib.blake2b},
+)
 
 # --- JWT Creation ---
-def create_token(subject: Union[str, Any], expires_delta: timedelta, token_type: str, jti: str | None = None) -> str:
+# A single PyJWT instance is reused for every encode/decode.
+_jwt = jwt.PyJWT()
+
+# Token lifetimes in seconds, so `exp` is plain integer arithmetic
+_ACCESS_TOKEN_TTL_SECONDS = int(settings.access_token_ttl.total_seconds())
+_REFRESH_TOKEN_TTL_SECONDS = int(settings.refresh_token_ttl.total_seconds())
+
+def create_token(subject: Union[str, Any], expires_in: int, token_type: str, jti: str | None = None) -> str:
     """
-    Creates a JWT token with a specified subject, expiration, type, and optional JTI.
+    Creates a JWT token with a specified subject, lifetime in seconds, type, and optional JTI.
     """
-    expire = datetime.now(timezone.utc) + expires_delta
+    # NumericDate `exp` straight from the epoch clock; no datetime needed
     to_encode = {
-        "exp": expire,
+        "exp": int(time.time()) + expires_in,
         "sub": str(subject),
         "type": token_type,
     }
     if jti:
         to_encode["jti"] = jti
 
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = _jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 def create_access_token(subject: Union[str, Any]) -> str:
@@ -42,7 +86,7 @@ def create_access_token(subject: Union[str, Any]) -> str:
     """
     return create_token(
         subject,
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+        expires_in=_ACCESS_TOKEN_TTL_SECONDS,
         token_type="access"
     )
 
@@ -50,21 +94,61 @@ def create_refresh_token(subject: Union[str, Any]) -> tuple[str, str]:
     """
     Creates a new refresh token and its JTI.
     """
-    jti = str(uuid.uuid4())
+    # 22-char url-safe encoding of the random 16 bytes; the JTI stays opaque
+    jti = base64.urlsafe_b64encode(uuid.uuid4().bytes).rstrip(b"=").decode("ascii")
     token = create_token(
         subject,
-        expires_delta=timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS),
+        expires_in=_REFRESH_TOKEN_TTL_SECONDS,
         token_type="refresh",
         jti=jti
     )
     return token, jti
 
+# --- JWT Verification ---
+@lru_cache(maxsize=8192)
+def _decode_cached(token: str) -> dict:
+    # Expiry is deliberately not checked here; a cached entry would otherwise
+    # outlive the token. `decode_token` enforces it on every call.
+    return _jwt.decode(
+        token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_exp": False}
+    )
+
+def decode_token(token: str) -> dict:
+    """
+    Decodes and verifies a JWT, returning its claims.
+    The signature check is cached per token string; expiry is enforced on every call.
+    """
+    payload = _decode_cached(token)
+    exp = payload.get("exp")
+    if exp is None or exp <= time.time():
+        raise ExpiredSignatureError("Signature has expired.")
+    return dict(payload)
+
 # --- Password and Token Verification ---
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verifies a plain password against a hashed password.
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    key = _verification_key(plain_password, hashed_password)
+    if key in _verified_passwords:
+        return True
+    verified = pwd_context.verify(plain_password, hashed_password)
+    if verified:
+        _verified_passwords[key] = True
+    return verified
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies a plain password and returns a replacement hash if the stored one
+    needs updating (e.g. it was created with a different BCRYPT_ROUNDS).
+    """
+    key = _verification_key(plain_password, hashed_password)
+    if key in _verified_passwords:
+        return True, None
+    verified, new_hash = pwd_context.verify_and_update(plain_password, hashed_password)
+    if verified:
+        _verified_passwords[key] = True
+    return verified, new_hash
 
 def get_password_hash(password: str) -> str:
     """
@@ -72,21 +156,57 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+# --- Off-loop Password Hashing ---
+# bcrypt is CPU bound and would stall the event loop for the whole hash, so the
+# async variants run it in worker processes. Workers are started on first use.
+_bcrypt_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Async variant of `verify_password` that runs bcrypt in the process pool.
+    """
+    key = _verification_key(plain_password, hashed_password)
+    if key in _verified_passwords:
+        return True
+    loop = asyncio.get_running_loop()
+    verified = await loop.run_in_executor(_bcrypt_pool, verify_password, plain_password, hashed_password)
+    if verified:
+        _verified_passwords[key] = True
+    return verified
+
+async def averify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Async variant of `verify_and_update_password` that runs bcrypt in the process pool.
+    """
+    key = _verification_key(plain_password, hashed_password)
+    if key in _verified_passwords:
+        return True, None
+    loop = asyncio.get_running_loop()
+    verified, new_hash = await loop.run_in_executor(
+        _bcrypt_pool, verify_and_update_password, plain_password, hashed_password
+    )
+    if verified:
+        _verified_passwords[key] = True
+    return verified, new_hash
+
+async def aget_password_hash(password: str) -> str:
+    """
+    Async variant of `get_password_hash` that runs bcrypt in the process pool.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, get_password_hash, password)
+
 def generate_verification_token(email: str) -> str:
     """
     Generates a time-limited token for email verification.
     """
-    return serializer.dumps(email, salt='email-verification-salt')
+    return _email_verification_serializer.dumps(email)
 
 def verify_verification_token(token: str, max_age_seconds: int = 3600) -> str | None:
     """
     Verifies a time-limited token and returns the email if valid.
     """
     try:
-        return serializer.loads(
-            token,
-            salt='email-verification-salt',
-            max_age=max_age_seconds
-        )
+        return _email_verification_serializer.loads(token, max_age=max_age_seconds)
     except (SignatureExpired, BadTimeSignature):
         return None
@@ -3,6 +3,7 @@ from uuid import UUID
 
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 
@@ -23,8 +24,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         self.model = model
 
     async def get(self, db: AsyncSession, id: UUID) -> Optional[ModelType]:
-        result = await db.execute(select(self.model).filter(self.model.id == id))
-        return result.scalars().first()
+        # Primary-key lookup: served from the identity map when already loaded
+        return await db.get(self.model, id)
 
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
@@ -40,6 +41,19 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def create_multi(self, db: AsyncSession, *, objs_in: List[CreateSchemaType]) -> List[ModelType]:
+        # One batched INSERT ... RETURNING and one commit instead of a
+        # flush, commit and refresh per row
+        if not objs_in:
+            return []
+        result = await db.scalars(
+            insert(self.model).returning(self.model),
+            [obj_in.model_dump() for obj_in in objs_in]
+        )
+        db_objs = result.all()
+        await db.commit()
+        return db_objs
+
     async def update(
         self,
         db: AsyncSession,
@@ -61,8 +75,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         return db_obj
 
     async def remove(self, db: AsyncSession, *, id: UUID) -> Optional[ModelType]:
-        result = await db.execute(select(self.model).filter(self.model.id == id))
-        obj = result.scalars().first()
+        obj = await db.get(self.model, id)
         if obj:
             await db.delete(obj)
             await db.commit()
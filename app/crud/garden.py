@@ -1,6 +1,6 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import Any, Dict, Optional, Union, List
+from typing import Any, Dict, Optional, Sequence, Union, List
 import uuid
 
 from app.crud.base import CRUDBase
@@ -18,14 +18,25 @@ class CRUDGarden(CRUDBase[Garden, GardenCreate, GardenUpdate]):
         return db_obj
 
     async def get_multi_by_owner(
-        self, db: AsyncSession, *, owner_id: uuid.UUID, skip: int = 0, limit: int = 100
-    ) -> List[Garden]:
+        self,
+        db: AsyncSession,
+        *,
+        owner_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Any]:
+        """
+        List an owner's gardens. With ``columns`` only those columns are
+        selected and plain rows are returned instead of Garden objects.
+        """
+        stmt = select(*columns) if columns else select(self.model)
         result = await db.execute(
-            select(self.model)
+            stmt
             .where(self.model.owner_id == owner_id)
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
+        return result.all() if columns else result.scalars().all()
 
 garden = CRUDGarden(Garden)
@@ -1,15 +1,17 @@
+from datetime import datetime
 from typing import List, Optional, Dict, Any
 from uuid import UUID
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.irrigation import (
-    IrrigationZone, IrrigationEquipment, IrrigationSchedule, 
+    IrrigationZone, IrrigationEquipment, IrrigationPipe, IrrigationSchedule, 
     WeatherData, IrrigationProject, EquipmentType, ZoneStatus, ScheduleType
 )
 from app.schemas.irrigation import (
     IrrigationZoneCreate, IrrigationZoneUpdate,
-    IrrigationEquipmentCreate, IrrigationEquipmentUpdate,
+    IrrigationEquipmentCreate, IrrigationEquipmentUpdate, IrrigationPipeCreate,
     IrrigationScheduleCreate, IrrigationScheduleUpdate,
     WeatherDataCreate, IrrigationProjectCreate, IrrigationProjectUpdate
 )
@@ -18,44 +20,53 @@ from app.schemas.irrigation import (
 class IrrigationZoneCRUD:
     """CRUD operations for irrigation zones."""
     
-    def create_zone(self, db: Session, *, zone_in: IrrigationZoneCreate) -> IrrigationZone:
+    async def create_zone(self, db: AsyncSession, *, zone_in: IrrigationZoneCreate) -> IrrigationZone:
         """Create a new irrigation zone."""
-        zone_data = zone_in.model_dump()
+        # The create schemas are flat (no aliases, nested models or computed
+        # fields), so dict() gives the validated values without a dump pass.
+        zone_data = dict(zone_in)
+        zone_data["plant_ids"] = zone_in.plant_ids.tolist()
         db_zone = IrrigationZone(**zone_data)
         db.add(db_zone)
-        db.commit()
-        db.refresh(db_zone)
+        await db.commit()
+        await db.refresh(db_zone)
         return db_zone
     
-    def get_zone(self, db: Session, *, zone_id: UUID) -> Optional[IrrigationZone]:
+    async def get_zone(self, db: AsyncSession, *, zone_id: UUID) -> Optional[IrrigationZone]:
         """Get a specific irrigation zone by ID."""
-        return db.query(IrrigationZone).filter(IrrigationZone.id == zone_id).first()
+        return await db.get(IrrigationZone, zone_id)
     
-    def get_zones(
+    async def get_zones(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         garden_id: Optional[UUID] = None,
+        plant_id: Optional[int] = None,
         skip: int = 0, 
         limit: int = 100
     ) -> List[IrrigationZone]:
         """Get irrigation zones with optional filtering."""
-        query = db.query(IrrigationZone)
+        query = select(IrrigationZone)
         
         if garden_id:
-            query = query.filter(IrrigationZone.garden_id == garden_id)
+            query = query.where(IrrigationZone.garden_id == garden_id)
         
-        return query.offset(skip).limit(limit).all()
+        if plant_id is not None:
+            # Array containment (@>) is served by the GIN index on plant_ids
+            query = query.where(IrrigationZone.plant_ids.contains([plant_id]))
+        
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
-    def update_zone(
+    async def update_zone(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         zone_id: UUID, 
         zone_in: IrrigationZoneUpdate
     ) -> Optional[IrrigationZone]:
         """Update an irrigation zone."""
-        db_zone = self.get_zone(db=db, zone_id=zone_id)
+        db_zone = await self.get_zone(db=db, zone_id=zone_id)
         if not db_zone:
             return None
         
@@ -63,74 +74,78 @@ class IrrigationZoneCRUD:
         for field, value in update_data.items():
             setattr(db_zone, field, value)
         
-        db.commit()
-        db.refresh(db_zone)
+        await db.commit()
+        await db.refresh(db_zone)
         return db_zone
     
-    def delete_zone(self, db: Session, *, zone_id: UUID) -> bool:
+    async def delete_zone(self, db: AsyncSession, *, zone_id: UUID) -> bool:
         """Delete an irrigation zone."""
-        db_zone = self.get_zone(db=db, zone_id=zone_id)
+        db_zone = await self.get_zone(db=db, zone_id=zone_id)
         if not db_zone:
             return False
         
-        db.delete(db_zone)
-        db.commit()
+        await db.delete(db_zone)
+        await db.commit()
         return True
 
 
 class IrrigationEquipmentCRUD:
     """CRUD operations for irrigation equipment."""
     
-    def create_equipment(
+    async def create_equipment(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         equipment_in: IrrigationEquipmentCreate
     ) -> IrrigationEquipment:
         """Create new irrigation equipment."""
-        equipment_data = equipment_in.model_dump()
+        equipment_data = dict(equipment_in)
         db_equipment = IrrigationEquipment(**equipment_data)
         db.add(db_equipment)
-        db.commit()
-        db.refresh(db_equipment)
+        await db.commit()
+        await db.refresh(db_equipment)
         return db_equipment
     
-    def get_equipment_by_id(
+    async def get_equipment_by_id(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         equipment_id: UUID
     ) -> Optional[IrrigationEquipment]:
         """Get specific irrigation equipment by ID."""
-        return db.query(IrrigationEquipment).filter(
-            IrrigationEquipment.id == equipment_id
-        ).first()
+        return await db.get(IrrigationEquipment, equipment_id)
     
-    def get_equipment(
+    async def get_equipment(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         equipment_type: Optional[str] = None,
+        specifications: Optional[Dict[str, Any]] = None,
         skip: int = 0, 
         limit: int = 100
     ) -> List[IrrigationEquipment]:
         """Get irrigation equipment with optional filtering."""
-        query = db.query(IrrigationEquipment)
+        query = select(IrrigationEquipment)
         
         if equipment_type:
-            query = query.filter(IrrigationEquipment.equipment_type == equipment_type)
+            query = query.where(IrrigationEquipment.equipment_type == equipment_type)
+        
+        if specifications:
+            # JSONB containment (@>) is answered by the jsonb_path_ops GIN index
+            query = query.where(IrrigationEquipment.specifications.contains(specifications))
         
-        return query.offset(skip).limit(limit).all()
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
-    def update_equipment(
+    async def update_equipment(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         equipment_id: UUID, 
         equipment_in: IrrigationEquipmentUpdate
     ) -> Optional[IrrigationEquipment]:
         """Update irrigation equipment."""
-        db_equipment = self.get_equipment_by_id(db=db, equipment_id=equipment_id)
+        db_equipment = await self.get_equipment_by_id(db=db, equipment_id=equipment_id)
         if not db_equipment:
             return None
         
@@ -138,52 +153,90 @@ class IrrigationEquipmentCRUD:
         for field, value in update_data.items():
             setattr(db_equipment, field, value)
         
-        db.commit()
-        db.refresh(db_equipment)
+        await db.commit()
+        await db.refresh(db_equipment)
         return db_equipment
     
-    def delete_equipment(self, db: Session, *, equipment_id: UUID) -> bool:
+    async def delete_equipment(self, db: AsyncSession, *, equipment_id: UUID) -> bool:
         """Delete irrigation equipment."""
-        db_equipment = self.get_equipment_by_id(db=db, equipment_id=equipment_id)
+        db_equipment = await self.get_equipment_by_id(db=db, equipment_id=equipment_id)
         if not db_equipment:
             return False
         
-        db.delete(db_equipment)
-        db.commit()
+        await db.delete(db_equipment)
+        await db.commit()
         return True
 
 
+class IrrigationPipeCRUD:
+    """CRUD operations for irrigation pipes."""
+    
+    async def bulk_create_pipes(
+        self, 
+        db: AsyncSession, 
+        *, 
+        pipes_in: List[IrrigationPipeCreate]
+    ) -> List[IrrigationPipe]:
+        """Create a pipe network with a single batched INSERT."""
+        if not pipes_in:
+            return []
+        
+        result = await db.scalars(
+            insert(IrrigationPipe).returning(IrrigationPipe),
+            [dict(pipe_in) for pipe_in in pipes_in]
+        )
+        db_pipes = result.all()
+        await db.commit()
+        return db_pipes
+
+
 class IrrigationScheduleCRUD:
     """CRUD operations for irrigation schedules."""
     
-    def create_schedule(
+    async def create_schedule(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         schedule_in: IrrigationScheduleCreate
     ) -> IrrigationSchedule:
         """Create new irrigation schedule."""
-        schedule_data = schedule_in.model_dump()
+        schedule_data = dict(schedule_in)
         db_schedule = IrrigationSchedule(**schedule_data)
         db.add(db_schedule)
-        db.commit()
-        db.refresh(db_schedule)
+        await db.commit()
+        await db.refresh(db_schedule)
         return db_schedule
     
-    def get_schedule_by_id(
+    async def bulk_create_schedules(
         self, 
-        db: Session, 
+        db: AsyncSession, 
+        *, 
+        schedules_in: List[IrrigationScheduleCreate]
+    ) -> List[IrrigationSchedule]:
+        """Create many irrigation schedules with a single batched INSERT."""
+        if not schedules_in:
+            return []
+        
+        result = await db.scalars(
+            insert(IrrigationSchedule).returning(IrrigationSchedule),
+            [dict(schedule_in) for schedule_in in schedules_in]
+        )
+        db_schedules = result.all()
+        await db.commit()
+        return db_schedules
+    
+    async def get_schedule_by_id(
+        self, 
+        db: AsyncSession, 
         *, 
         schedule_id: UUID
     ) -> Optional[IrrigationSchedule]:
         """Get specific irrigation schedule by ID."""
-        return db.query(IrrigationSchedule).filter(
-            IrrigationSchedule.id == schedule_id
-        ).first()
+        return await db.get(IrrigationSchedule, schedule_id)
     
-    def get_schedules(
+    async def get_schedules(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         zone_id: Optional[UUID] = None,
         schedule_type: Optional[str] = None,
@@ -191,25 +244,26 @@ class IrrigationScheduleCRUD:
         limit: int = 100
     ) -> List[IrrigationSchedule]:
         """Get irrigation schedules with optional filtering."""
-        query = db.query(IrrigationSchedule)
+        query = select(IrrigationSchedule)
         
         if zone_id:
-            query = query.filter(IrrigationSchedule.zone_id == zone_id)
+            query = query.where(IrrigationSchedule.zone_id == zone_id)
         
         if schedule_type:
-            query = query.filter(IrrigationSchedule.schedule_type == schedule_type)
+            query = query.where(IrrigationSchedule.schedule_type == schedule_type)
         
-        return query.offset(skip).limit(limit).all()
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
-    def update_schedule(
+    async def update_schedule(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         schedule_id: UUID, 
         schedule_in: IrrigationScheduleUpdate
     ) -> Optional[IrrigationSchedule]:
         """Update irrigation schedule."""
-        db_schedule = self.get_schedule_by_id(db=db, schedule_id=schedule_id)
+        db_schedule = await self.get_schedule_by_id(db=db, schedule_id=schedule_id)
         if not db_schedule:
             return None
         
@@ -217,41 +271,74 @@ class IrrigationScheduleCRUD:
         for field, value in update_data.items():
             setattr(db_schedule, field, value)
         
-        db.commit()
-        db.refresh(db_schedule)
+        await db.commit()
+        await db.refresh(db_schedule)
         return db_schedule
     
-    def delete_schedule(self, db: Session, *, schedule_id: UUID) -> bool:
+    async def delete_schedule(self, db: AsyncSession, *, schedule_id: UUID) -> bool:
         """Delete irrigation schedule."""
-        db_schedule = self.get_schedule_by_id(db=db, schedule_id=schedule_id)
+        db_schedule = await self.get_schedule_by_id(db=db, schedule_id=schedule_id)
         if not db_schedule:
             return False
         
-        db.delete(db_schedule)
-        db.commit()
+        await db.delete(db_schedule)
+        await db.commit()
         return True
 
 
+# Numeric weather columns returned column-wise by get_weather_arrays
+_WEATHER_ARRAY_COLUMNS = (
+    WeatherData.temperature_c,
+    WeatherData.humidity_percent,
+    WeatherData.rainfall_mm,
+    WeatherData.wind_speed_kmh,
+    WeatherData.solar_radiation_mj_m2,
+    WeatherData.evapotranspiration_mm,
+    WeatherData.irrigation_need_mm,
+)
+
+
 class WeatherDataCRUD:
     """CRUD operations for weather data."""
     
-    def create_weather_data(
+    # Rows fetched per round trip when streaming weather series
+    ARRAY_PARTITION_SIZE = 5000
+    
+    async def create_weather_data(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         weather_in: WeatherDataCreate
     ) -> WeatherData:
         """Create new weather data entry."""
-        weather_data = weather_in.model_dump()
+        weather_data = dict(weather_in)
         db_weather = WeatherData(**weather_data)
         db.add(db_weather)
-        db.commit()
-        db.refresh(db_weather)
+        await db.commit()
+        await db.refresh(db_weather)
         return db_weather
     
-    def get_weather_data(
+    async def bulk_create_weather_data(
         self, 
-        db: Session, 
+        db: AsyncSession, 
+        *, 
+        weather_in: List[WeatherDataCreate]
+    ) -> List[WeatherData]:
+        """Create many weather data entries with a single batched INSERT."""
+        if not weather_in:
+            return []
+        
+        result = await db.scalars(
+            insert(WeatherData).returning(WeatherData),
+            [dict(entry) for entry in weather_in]
+        )
+        db_weather = result.all()
+        await db.commit()
+        return db_weather
+    
+    async def get_weather_data(
+        self, 
+        db: AsyncSession, 
         *, 
         garden_id: Optional[UUID] = None,
         start_date: Optional[str] = None,
@@ -260,62 +347,109 @@ class WeatherDataCRUD:
         limit: int = 100
     ) -> List[WeatherData]:
         """Get weather data with optional filtering."""
-        query = db.query(WeatherData)
+        query = select(WeatherData)
         
         if garden_id:
-            query = query.filter(WeatherData.garden_id == garden_id)
+            query = query.where(WeatherData.garden_id == garden_id)
         
         if start_date:
-            query = query.filter(WeatherData.date >= start_date)
+            query = query.where(WeatherData.date >= start_date)
         
         if end_date:
-            query = query.filter(WeatherData.date <= end_date)
+            query = query.where(WeatherData.date <= end_date)
         
-        return query.order_by(WeatherData.date.desc()).offset(skip).limit(limit).all()
+        result = await db.execute(
+            query.order_by(WeatherData.date.desc()).offset(skip).limit(limit)
+        )
+        return result.scalars().all()
     
-    def get_latest_weather_data(
+    async def get_latest_weather_data(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         garden_id: UUID
     ) -> Optional[WeatherData]:
         """Get the latest weather data for a garden."""
-        return db.query(WeatherData).filter(
-            WeatherData.garden_id == garden_id
-        ).order_by(WeatherData.date.desc()).first()
+        result = await db.execute(
+            select(WeatherData)
+            .where(WeatherData.garden_id == garden_id)
+            .order_by(WeatherData.date.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+    
+    async def get_weather_arrays(
+        self, 
+        db: AsyncSession, 
+        *, 
+        garden_id: UUID,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Get a garden's weather series as one array per column, ordered by date.
+        
+        Selects plain columns instead of WeatherData entities so no ORM objects
+        are built, and streams the rows in partitions. Measurements come back as
+        float32, dates as datetime64[us].
+        """
+        query = select(WeatherData.date, *_WEATHER_ARRAY_COLUMNS).where(WeatherData.garden_id == garden_id)
+        
+        if start_date:
+            query = query.where(WeatherData.date >= start_date)
+        
+        if end_date:
+            query = query.where(WeatherData.date <= end_date)
+        
+        dates: List[np.ndarray] = []
+        values: List[np.ndarray] = []
+        # stream() reads through a server-side cursor; yield_per sets how many
+        # rows each fetch from it brings over, so memory stays bounded by one batch
+        result = await db.stream(
+            query.order_by(WeatherData.date).execution_options(yield_per=self.ARRAY_PARTITION_SIZE)
+        )
+        async for partition in result.partitions():
+            dates.append(np.fromiter((row[0] for row in partition), dtype="datetime64[us]", count=len(partition)))
+            values.append(np.array([row[1:] for row in partition], dtype=np.float32))
+        
+        width = len(_WEATHER_ARRAY_COLUMNS)
+        table = np.concatenate(values) if values else np.empty((0, width), dtype=np.float32)
+        arrays = {"date": np.concatenate(dates) if dates else np.empty(0, dtype="datetime64[us]")}
+        for index, column in enumerate(_WEATHER_ARRAY_COLUMNS):
+            # Contiguous copies, so callers get independent 1-D arrays
+            arrays[column.key] = np.ascontiguousarray(table[:, index])
+        return arrays
 
 
 class IrrigationProjectCRUD:
     """CRUD operations for irrigation projects."""
     
-    def create_project(
+    async def create_project(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_in: IrrigationProjectCreate
     ) -> IrrigationProject:
         """Create new irrigation project."""
-        project_data = project_in.model_dump()
+        project_data = dict(project_in)
         db_project = IrrigationProject(**project_data)
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
+        await db.commit()
+        await db.refresh(db_project)
         return db_project
     
-    def get_project_by_id(
+    async def get_project_by_id(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: UUID
     ) -> Optional[IrrigationProject]:
         """Get specific irrigation project by ID."""
-        return db.query(IrrigationProject).filter(
-            IrrigationProject.id == project_id
-        ).first()
+        return await db.get(IrrigationProject, project_id)
     
-    def get_projects(
+    async def get_projects(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         garden_id: Optional[UUID] = None,
         is_active: Optional[bool] = None,
@@ -323,25 +457,26 @@ class IrrigationProjectCRUD:
         limit: int = 100
     ) -> List[IrrigationProject]:
         """Get irrigation projects with optional filtering."""
-        query = db.query(IrrigationProject)
+        query = select(IrrigationProject)
         
         if garden_id:
-            query = query.filter(IrrigationProject.garden_id == garden_id)
+            query = query.where(IrrigationProject.garden_id == garden_id)
         
         if is_active is not None:
-            query = query.filter(IrrigationProject.is_active == is_active)
+            query = query.where(IrrigationProject.is_active == is_active)
         
-        return query.offset(skip).limit(limit).all()
+        result = await db.execute(query.offset(skip).limit(limit))
+        return result.scalars().all()
     
-    def update_project(
+    async def update_project(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: UUID, 
         project_in: IrrigationProjectUpdate
     ) -> Optional[IrrigationProject]:
         """Update irrigation project."""
-        db_project = self.get_project_by_id(db=db, project_id=project_id)
+        db_project = await self.get_project_by_id(db=db, project_id=project_id)
         if not db_project:
             return None
         
@@ -349,24 +484,25 @@ class IrrigationProjectCRUD:
         for field, value in update_data.items():
             setattr(db_project, field, value)
         
-        db.commit()
-        db.refresh(db_project)
+        await db.commit()
+        await db.refresh(db_project)
         return db_project
     
-    def delete_project(self, db: Session, *, project_id: UUID) -> bool:
+    async def delete_project(self, db: AsyncSession, *, project_id: UUID) -> bool:
         """Delete irrigation project."""
-        db_project = self.get_project_by_id(db=db, project_id=project_id)
+        db_project = await self.get_project_by_id(db=db, project_id=project_id)
         if not db_project:
             return False
         
-        db.delete(db_project)
-        db.commit()
+        await db.delete(db_project)
+        await db.commit()
         return True
 
 
 # Initialize CRUD instances
 irrigation_zone_crud = IrrigationZoneCRUD()
 irrigation_equipment_crud = IrrigationEquipmentCRUD()
+irrigation_pipe_crud = IrrigationPipeCRUD()
 irrigation_schedule_crud = IrrigationScheduleCRUD()
 weather_data_crud = WeatherDataCRUD()
 irrigation_project_crud = IrrigationProjectCRUD() 
\ No newline at end of file
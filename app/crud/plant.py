@@ -1,7 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 import uuid
 
 from app.crud.base import CRUDBase
@@ -18,14 +18,30 @@ class CRUDPlant(CRUDBase[Plant, PlantCreate, PlantUpdate]):
         return result.scalars().first()
 
     async def get_multi_by_garden(
-        self, db: AsyncSession, *, garden_id: uuid.UUID, skip: int = 0, limit: int = 100
-    ) -> List[Plant]:
+        self,
+        db: AsyncSession,
+        *,
+        garden_id: uuid.UUID,
+        skip: int = 0,
+        limit: int = 100,
+        columns: Optional[Sequence[Any]] = None
+    ) -> List[Any]:
+        """
+        List a garden's plants. With ``columns`` only those columns are
+        selected and plain rows are returned instead of Plant objects.
+        """
+        if columns:
+            stmt = select(*columns)
+        else:
+            # Load the garden for the whole page in one IN query instead of
+            # a lazy load per plant during serialization.
+            stmt = select(self.model).options(selectinload(self.model.garden))
         result = await db.execute(
-            select(self.model)
+            stmt
             .where(self.model.garden_id == garden_id)
             .offset(skip)
             .limit(limit)
         )
-        return result.scalars().all()
+        return result.all() if columns else result.scalars().all()
 
 plant = CRUDPlant(Plant)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import Optional
+from sqlalchemy import func, or_, select
+from typing import List, Optional
 
 from app.crud.base import CRUDBase
 from app.models.plant_catalog import PlantCatalog
@@ -18,45 +18,58 @@ class CRUDPlantCatalog(CRUDBase[PlantCatalog, PlantCatalogCreate, PlantCatalogSc
         season: Optional[str] = None,
         sun: Optional[str] = None
     ):
-        query = db.query(self.model)
+        query = select(self.model)
 
         if q:
-            query = query.filter(
-                func.lower(self.model.name).contains(q.lower()) |
-                func.lower(self.model.variety).contains(q.lower()) |
-                func.lower(self.model.description).contains(q.lower())
+            # ILIKE on the raw columns can use the pg_trgm GIN indexes;
+            # lower(col) LIKE ... forced a sequential scan.
+            pattern = f"%{q}%"
+            query = query.where(
+                or_(
+                    self.model.name.ilike(pattern),
+                    self.model.variety.ilike(pattern),
+                    self.model.description.ilike(pattern)
+                )
             )
 
         if plant_type:
-            query = query.filter(func.lower(self.model.plant_type) == plant_type.lower())
+            query = query.where(func.lower(self.model.plant_type) == plant_type.lower())
 
         if season:
-            query = query.filter(self.model.planting_season.any(season))
+            query = query.where(self.model.planting_season.any(season))
 
         if sun:
             sun_str = sun.replace('-', ' ').lower()
-            query = query.filter(func.lower(self.model.sun) == sun_str)
-
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
-
-        return items, total
-
-    def get_plant_types(self, db: Session):
-        return db.query(self.model.plant_type).distinct().all()
-
-    def get_planting_seasons(self, db: Session):
-        # This is a bit more complex as it's an array.
-        # A simple distinct on the array column might not be what we want.
-        # Let's get all plants and extract seasons in Python.
-        # This is not super efficient for large datasets, but for a few hundred plants it's fine.
-        all_seasons = set()
-        plants = db.query(self.model.planting_season).all()
-        for plant_seasons in plants:
-            if plant_seasons[0]:
-                for season in plant_seasons[0]:
-                    all_seasons.add(season)
-        return sorted(list(all_seasons))
+            query = query.where(func.lower(self.model.sun) == sun_str)
+
+        # The window count is computed over the whole filtered set before
+        # OFFSET/LIMIT, so the page and the total come back in one query.
+        rows = db.execute(
+            query.add_columns(func.count().over().label("total")).offset(skip).limit(limit)
+        ).all()
+        if rows:
+            return [row[0] for row in rows], rows[0].total
+
+        # An empty page carries no total; only then count separately.
+        total = db.execute(select(func.count()).select_from(query.subquery())).scalar_one() if skip else 0
+        return [], total
+
+    def get_plant_types(self, db: Session) -> List[str]:
+        plant_type = self.model.plant_type
+        result = db.execute(
+            select(plant_type)
+            .where(plant_type.isnot(None), plant_type != "")
+            .distinct()
+            .order_by(plant_type)
+        )
+        return result.scalars().all()
+
+    def get_planting_seasons(self, db: Session) -> List[str]:
+        # planting_season is an array column: unnest it and let Postgres
+        # de-duplicate, so only the distinct season names come back.
+        season = func.unnest(self.model.planting_season).label("season")
+        result = db.execute(select(season).distinct().order_by(season))
+        return result.scalars().all()
 
 
 plant_catalog = CRUDPlantCatalog(PlantCatalog)
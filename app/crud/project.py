@@ -1,27 +1,221 @@
 import uuid
-from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import and_, or_, func, desc, asc
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple
+import jsonpatch
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, or_, case, func, desc, asc, event, exists, lambda_stmt, literal, select, union, update
 from sqlalchemy.exc import IntegrityError
 
-from app.models.project import Project, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus
+from app.models.project import Project, ProjectPayload, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus, clean_project_name
 from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectMemberCreate, ProjectVersionCreate, ProjectCommentCreate
 
+# Higher rank implies every permission of a lower rank
+_PERMISSION_RANK = MappingProxyType({
+    ProjectPermission.OWNER: 4,
+    ProjectPermission.ADMIN: 3,
+    ProjectPermission.EDITOR: 2,
+    ProjectPermission.VIEWER: 1
+})
+
+# Permissions that satisfy each required level, built once at import
+_PERMISSIONS_AT_LEAST = MappingProxyType({
+    required: tuple(permission for permission, rank in _PERMISSION_RANK.items() if rank >= required_rank)
+    for required, required_rank in _PERMISSION_RANK.items()
+})
+
+def permission_satisfies(granted: Optional[ProjectPermission], required: ProjectPermission) -> bool:
+    """Whether a granted permission level (None for no access) covers the required one."""
+    if granted is None:
+        return False
+    return _PERMISSION_RANK.get(granted, 0) >= _PERMISSION_RANK.get(required, 0)
+
+# Activity rows are write-only audit data, so they go through a Core insert
+# and skip ORM instance construction and unit-of-work bookkeeping entirely.
+_INSERT_ACTIVITY = ProjectActivity.__table__.insert()
+
+def _log_activity(db: AsyncSession, **activity: Any) -> None:
+    """
+    Queue a ProjectActivity row on the session instead of adding an ORM
+    object; queued rows are written with the session's next commit.
+    """
+    activity.setdefault("activity_metadata", None)  # executemany needs the same keys on every row
+    db.info.setdefault("pending_activities", []).append(activity)
+
+@event.listens_for(Session, "before_commit")
+def _write_pending_activities(session: Session) -> None:
+    # All activities queued since the last commit go out as one executemany
+    # INSERT in the same transaction as the change they describe.
+    pending = session.info.pop("pending_activities", None)
+    if pending:
+        session.execute(_INSERT_ACTIVITY, pending)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_activities(session: Session) -> None:
+    # Activities for changes that were rolled back must not leak into a later commit
+    session.info.pop("pending_activities", None)
+
+def _project_search_filter(search: str):
+    """
+    Case-insensitive substring match on name, description and location,
+    served by the trigram index on their generated concatenation. ``%`` and
+    ``_`` in the search string match literally.
+    """
+    return Project.search_text.icontains(search, autoescape=True)
+
+def _member_stmt(project_id: uuid.UUID, user_id: uuid.UUID):
+    """
+    Membership lookup as a lambda statement: the SELECT is compiled once and
+    reused from the engine's query cache, only the ids are re-bound per call.
+    """
+    return lambda_stmt(
+        lambda: select(ProjectMember).where(
+            ProjectMember.project_id == project_id,
+            ProjectMember.user_id == user_id
+        )
+    )
+
+# Every VERSION_SNAPSHOT_INTERVAL-th version (1, 51, 101, ...) stores full
+# documents; the versions in between store patches against their predecessor,
+# so rebuilding any version replays at most VERSION_SNAPSHOT_INTERVAL - 1 patches.
+VERSION_SNAPSHOT_INTERVAL = 50
+
+# Versioned document columns and the patch column stored in their place
+_VERSION_PATCH_FIELDS = MappingProxyType({
+    "layout_data": "layout_patch",
+    "plant_data": "plant_patch",
+    "irrigation_data": "irrigation_patch",
+})
+
+def _replay_versions(rows) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (version_number, documents) for consecutive version rows, the
+    first of which must be a snapshot.
+    """
+    documents: Dict[str, Any] = {}
+    for row in rows:
+        if row.is_snapshot:
+            documents = {field: getattr(row, field) for field in _VERSION_PATCH_FIELDS}
+        else:
+            documents = {
+                field: jsonpatch.apply_patch(documents[field], patch) if (patch := getattr(row, patch_field)) else documents[field]
+                for field, patch_field in _VERSION_PATCH_FIELDS.items()
+            }
+        yield row.version_number, documents
+
+async def _version_documents(db: AsyncSession, project_id: uuid.UUID, first: int, last: int) -> Dict[int, Dict[str, Any]]:
+    """
+    Documents of versions ``first``..``last`` of a project, rebuilt in one
+    query from the nearest snapshot at or before ``first``.
+    """
+    base = select(func.max(ProjectVersion.version_number)).where(
+        ProjectVersion.project_id == project_id,
+        ProjectVersion.is_snapshot.is_(True),
+        ProjectVersion.version_number <= first
+    ).scalar_subquery()
+    rows = (await db.execute(
+        select(
+            ProjectVersion.version_number, ProjectVersion.is_snapshot,
+            *(getattr(ProjectVersion, field) for field in _VERSION_PATCH_FIELDS),
+            *(getattr(ProjectVersion, patch_field) for patch_field in _VERSION_PATCH_FIELDS.values())
+        ).where(
+            ProjectVersion.project_id == project_id,
+            ProjectVersion.version_number >= func.coalesce(base, 1),
+            ProjectVersion.version_number <= last
+        ).order_by(ProjectVersion.version_number)
+    )).all()
+    return {number: documents for number, documents in _replay_versions(rows) if number >= first}
+
+async def _fill_version_documents(db: AsyncSession, versions: Sequence[ProjectVersion]) -> None:
+    """Set the *_data attributes of patch-stored versions to their rebuilt documents."""
+    by_project: Dict[uuid.UUID, List[ProjectVersion]] = {}
+    for version in versions:
+        if not version.is_snapshot:
+            by_project.setdefault(version.project_id, []).append(version)
+    for project_id, patched in by_project.items():
+        numbers = [version.version_number for version in patched]
+        documents = await _version_documents(db, project_id, min(numbers), max(numbers))
+        for version in patched:
+            for field, value in documents[version.version_number].items():
+                set_committed_value(version, field, value)
+
+async def _version_storage(
+    db: AsyncSession, project_id: uuid.UUID, version_number: int, documents: Dict[str, Any]
+) -> Dict[str, Any]:
+    """
+    ProjectVersion column values storing ``documents`` as version
+    ``version_number``: a full snapshot or patches against the previous version.
+    """
+    if (version_number - 1) % VERSION_SNAPSHOT_INTERVAL == 0:
+        return {"is_snapshot": True, **documents}
+    previous = (await _version_documents(db, project_id, version_number - 1, version_number - 1)).get(version_number - 1)
+    if previous is None:
+        return {"is_snapshot": True, **documents}
+    return {
+        "is_snapshot": False,
+        **{
+            patch_field: jsonpatch.make_patch(previous[field], documents[field]).patch
+            for field, patch_field in _VERSION_PATCH_FIELDS.items()
+        }
+    }
+
+async def _paginate_with_total(db: AsyncSession, stmt, skip: int, limit: int) -> Tuple[list, int]:
+    """
+    Return one page of ``stmt`` and the total match count in a single
+    round trip, using a window count computed before OFFSET/LIMIT.
+    """
+    result = await db.execute(
+        stmt.add_columns(func.count().over().label("total")).offset(skip).limit(limit)
+    )
+    rows = result.all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    # An empty page carries no total; only past the end is a count needed.
+    if not skip:
+        return [], 0
+    return [], await db.scalar(select(func.count()).select_from(stmt.order_by(None).subquery()))
+
+# Correlated subqueries for the Project query_expression attributes the
+# response schemas read (owner_name, the counts, ...)
+_SUMMARY_EXPRESSIONS = MappingProxyType({
+    "owner_name": select(User.full_name).where(User.id == Project.owner_id).correlate(Project).scalar_subquery(),
+    "last_modified_user_name": select(User.full_name).where(User.id == Project.last_modified_by).correlate(Project).scalar_subquery(),
+    "members_count": select(func.count()).where(ProjectMember.project_id == Project.id).correlate(Project).scalar_subquery(),
+    "comments_count": select(func.count()).where(ProjectComment.project_id == Project.id).correlate(Project).scalar_subquery(),
+    "versions_count": select(func.count()).where(ProjectVersion.project_id == Project.id).correlate(Project).scalar_subquery(),
+})
+
+def with_summary_fields() -> list:
+    """Loader options filling the summary attributes in the same SELECT as the project."""
+    return [with_expression(getattr(Project, name), expr) for name, expr in _SUMMARY_EXPRESSIONS.items()]
+
+async def _load_summary_fields(db: AsyncSession, project: Project) -> None:
+    """Fill the summary attributes on a project that was loaded or written without them."""
+    row = (await db.execute(
+        select(*(expr.label(name) for name, expr in _SUMMARY_EXPRESSIONS.items()))
+        .select_from(Project)
+        .where(Project.id == project.id)
+    )).one()
+    for name in _SUMMARY_EXPRESSIONS:
+        set_committed_value(project, name, getattr(row, name))
+
 class ProjectCRUD:
     """CRUD operations for projects."""
     
-    def create_project(self, db: Session, *, project_in: ProjectCreate, owner_id: uuid.UUID) -> Project:
+    async def create_project(self, db: AsyncSession, *, project_in: ProjectCreate, owner_id: uuid.UUID) -> Project:
         """Create a new project."""
         project_data = project_in.model_dump()
         project_data["owner_id"] = owner_id
         project_data["current_version"] = 1
+        documents = {field: project_data.pop(field, None) for field in _VERSION_PATCH_FIELDS}
         
-        db_project = Project(**project_data)
+        payload = ProjectPayload(**documents)
+        db_project = Project(**project_data, payload=payload)
         db.add(db_project)
-        db.commit()
-        db.refresh(db_project)
+        # Flush to get the project id; everything below commits together
+        await db.flush()
         
         # Create initial version
         initial_version = ProjectVersion(
@@ -30,42 +224,56 @@ class ProjectCRUD:
             created_by=owner_id,
             name="Initial Version",
             description="Initial project version",
-            layout_data=project_data.get("layout_data"),
-            plant_data=project_data.get("plant_data"),
-            irrigation_data=project_data.get("irrigation_data")
+            is_snapshot=True,
+            **documents
         )
         db.add(initial_version)
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=db_project.id,
             user_id=owner_id,
             activity_type="project_created",
             description=f"Project '{db_project.name}' was created"
         )
-        db.add(activity)
         
-        db.commit()
+        await db.commit()
+        await db.refresh(db_project)
+        # refresh() leaves lazy="raise" relationships unloaded
+        set_committed_value(db_project, "payload", payload)
+        await _load_summary_fields(db, db_project)
         return db_project
     
-    def get_project(self, db: Session, project_id: uuid.UUID) -> Optional[Project]:
+    async def get_project(self, db: AsyncSession, project_id: uuid.UUID) -> Optional[Project]:
         """Get a project by ID."""
-        return db.query(Project).filter(Project.id == project_id).first()
+        return await db.get(Project, project_id)
     
-    def get_project_with_details(self, db: Session, project_id: uuid.UUID) -> Optional[Project]:
+    async def get_project_with_details(self, db: AsyncSession, project_id: uuid.UUID) -> Optional[Project]:
         """Get a project with all related data."""
-        return db.query(Project).options(
-            joinedload(Project.owner),
-            joinedload(Project.last_modified_user),
-            joinedload(Project.members).joinedload(ProjectMember.user),
-            joinedload(Project.versions),
-            joinedload(Project.comments).joinedload(ProjectComment.author),
-            joinedload(Project.activities).joinedload(ProjectActivity.user)
-        ).filter(Project.id == project_id).first()
+        project = await db.scalar(
+            select(Project).options(
+                joinedload(Project.owner),
+                joinedload(Project.last_modified_user),
+                joinedload(Project.payload),
+                # One IN query per collection on this session, so everything
+                # is read in the caller's transaction on a single connection
+                selectinload(Project.members).joinedload(ProjectMember.user),
+                selectinload(Project.versions),
+                selectinload(Project.comments).joinedload(ProjectComment.author),
+                selectinload(Project.activities).joinedload(ProjectActivity.user),
+                *with_summary_fields()
+            ).where(Project.id == project_id)
+        )
+        if not project:
+            return None
+        
+        await _fill_version_documents(db, project.versions)
+        return project
     
-    def get_user_projects(
+    async def get_user_projects(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         user_id: uuid.UUID,
         skip: int = 0,
         limit: int = 100,
@@ -73,32 +281,25 @@ class ProjectCRUD:
         search: Optional[str] = None
     ) -> Tuple[List[Project], int]:
         """Get projects for a user with pagination and filtering."""
-        query = db.query(Project).filter(
-            or_(
-                Project.owner_id == user_id,
-                Project.members.any(ProjectMember.user_id == user_id)
-            )
+        # Each branch is a plain index lookup (owner_id / member user_id);
+        # UNION also dedups projects the user both owns and is a member of.
+        accessible_ids = union(
+            select(Project.id).where(Project.owner_id == user_id),
+            select(ProjectMember.project_id).where(ProjectMember.user_id == user_id)
         )
+        query = select(Project).options(*with_summary_fields()).where(Project.id.in_(accessible_ids))
         
         if status:
-            query = query.filter(Project.status == status)
+            query = query.where(Project.status == status)
         
         if search:
-            search_filter = or_(
-                Project.name.ilike(f"%{search}%"),
-                Project.description.ilike(f"%{search}%"),
-                Project.location.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query = query.where(_project_search_filter(search))
         
-        total = query.count()
-        projects = query.offset(skip).limit(limit).all()
-        
-        return projects, total
+        return await _paginate_with_total(db, query, skip, limit)
     
-    def get_public_projects(
+    async def get_public_projects(
         self,
-        db: Session,
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
@@ -106,139 +307,209 @@ class ProjectCRUD:
         soil_type: Optional[str] = None
     ) -> Tuple[List[Project], int]:
         """Get public projects with filtering."""
-        query = db.query(Project).filter(Project.is_public == True, Project.status == ProjectStatus.ACTIVE)
+        query = (
+            select(Project)
+            .options(*with_summary_fields())
+            .where(Project.is_public == True, Project.status == ProjectStatus.ACTIVE)
+        )
         
         if search:
-            search_filter = or_(
-                Project.name.ilike(f"%{search}%"),
-                Project.description.ilike(f"%{search}%"),
-                Project.location.ilike(f"%{search}%")
-            )
-            query = query.filter(search_filter)
+            query = query.where(_project_search_filter(search))
         
         if climate_zone:
-            query = query.filter(Project.climate_zone == climate_zone)
+            query = query.where(Project.climate_zone == climate_zone)
         
         if soil_type:
-            query = query.filter(Project.soil_type == soil_type)
+            query = query.where(Project.soil_type == soil_type)
         
-        total = query.count()
-        projects = query.offset(skip).limit(limit).all()
-        
-        return projects, total
+        return await _paginate_with_total(db, query, skip, limit)
     
-    def update_project(
+    async def update_project(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         project_in: ProjectUpdate, 
         user_id: uuid.UUID
     ) -> Optional[Project]:
         """Update a project."""
-        db_project = self.get_project(db, project_id)
+        update_data = project_in.model_dump(exclude_unset=True)
+        if "name" in update_data:
+            update_data["name"] = clean_project_name(update_data["name"])
+        
+        updated_fields = list(update_data.keys())
+        # Layout/plant/irrigation live in project_payloads; a change to any
+        # of them starts a new version
+        payload_data = {field: update_data.pop(field) for field in _VERSION_PATCH_FIELDS if field in update_data}
+        creates_version = bool(payload_data)
+        if creates_version:
+            update_data["current_version"] = Project.current_version + 1
+        
+        update_data["last_modified_by"] = user_id
+        
+        # One UPDATE ... RETURNING per table replaces the SELECT before and
+        # the refresh after; populate_existing syncs any copy already in the session.
+        db_project = await db.scalar(
+            update(Project)
+            .where(Project.id == project_id)
+            .values(**update_data)
+            .returning(Project)
+            .execution_options(populate_existing=True)
+        )
         if not db_project:
             return None
         
-        update_data = project_in.model_dump(exclude_unset=True)
-        
-        # Create new version if layout/plant/irrigation data changed
-        if any(key in update_data for key in ["layout_data", "plant_data", "irrigation_data"]):
-            new_version = ProjectVersion(
+        if payload_data:
+            payload = await db.scalar(
+                update(ProjectPayload)
+                .where(ProjectPayload.id == project_id)
+                .values(**payload_data)
+                .returning(ProjectPayload)
+                .execution_options(populate_existing=True)
+            )
+        else:
+            payload = await db.get(ProjectPayload, project_id)
+        set_committed_value(db_project, "payload", payload)
+        
+        if creates_version:
+            # The returned rows already hold the new version number and data
+            documents = {field: getattr(payload, field) for field in _VERSION_PATCH_FIELDS}
+            db.add(ProjectVersion(
                 project_id=project_id,
-                version_number=db_project.current_version + 1,
+                version_number=db_project.current_version,
                 created_by=user_id,
-                name=f"Version {db_project.current_version + 1}",
+                name=f"Version {db_project.current_version}",
                 description="Auto-generated version",
-                layout_data=update_data.get("layout_data", db_project.layout_data),
-                plant_data=update_data.get("plant_data", db_project.plant_data),
-                irrigation_data=update_data.get("irrigation_data", db_project.irrigation_data)
-            )
-            db.add(new_version)
-            update_data["current_version"] = db_project.current_version + 1
-        
-        update_data["last_modified_by"] = user_id
-        
-        for field, value in update_data.items():
-            setattr(db_project, field, value)
+                **await _version_storage(db, project_id, db_project.current_version, documents)
+            ))
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=user_id,
             activity_type="project_updated",
             description=f"Project '{db_project.name}' was updated",
-            metadata={"updated_fields": list(update_data.keys())}
+            activity_metadata={"updated_fields": updated_fields}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(db_project)
+        await db.commit()
+        await _load_summary_fields(db, db_project)
         return db_project
     
-    def delete_project(self, db: Session, *, project_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+    async def delete_project(self, db: AsyncSession, *, project_id: uuid.UUID, user_id: uuid.UUID) -> bool:
         """Delete a project (soft delete)."""
-        db_project = self.get_project(db, project_id)
+        db_project = await self.get_project(db, project_id)
         if not db_project or db_project.owner_id != user_id:
             return False
         
         db_project.status = ProjectStatus.DELETED
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=user_id,
             activity_type="project_deleted",
             description=f"Project '{db_project.name}' was deleted"
         )
-        db.add(activity)
         
-        db.commit()
+        await db.commit()
         return True
     
-    def check_user_permission(
+    async def check_user_permission(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         user_id: uuid.UUID, 
         required_permission: ProjectPermission = ProjectPermission.VIEWER
     ) -> bool:
         """Check if user has required permission for project."""
-        project = self.get_project(db, project_id)
-        if not project:
-            return False
+        return await self.user_has_permission(
+            db, project_id=project_id, user_id=user_id, required_permission=required_permission
+        )
+    
+    async def user_has_permission(
+        self, 
+        db: AsyncSession, 
+        *, 
+        project_id: uuid.UUID, 
+        user_id: uuid.UUID, 
+        required_permission: ProjectPermission = ProjectPermission.VIEWER
+    ) -> bool:
+        """Answer a permission check with a single EXISTS query, without loading the project."""
+        granted = _PERMISSIONS_AT_LEAST.get(required_permission, tuple(_PERMISSION_RANK))
         
         # Owner has all permissions
-        if project.owner_id == user_id:
-            return True
-        
-        # Check member permissions
-        member = db.query(ProjectMember).filter(
-            and_(
+        is_owner = exists(
+            select(literal(1)).where(Project.id == project_id, Project.owner_id == user_id).limit(1)
+        )
+        is_member = exists(
+            select(literal(1)).where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == user_id,
+                ProjectMember.permission.in_(granted)
+            ).limit(1)
+        )
+        return bool(await db.scalar(select(or_(is_owner, is_member))))
+    
+    async def get_user_permission(
+        self, 
+        db: AsyncSession, 
+        *, 
+        project_id: uuid.UUID, 
+        user_id: uuid.UUID
+    ) -> Tuple[bool, Optional[ProjectPermission]]:
+        """
+        Whether the project exists, and the user's permission level on it
+        (None without access).
+        """
+        # Existence, owner check and membership lookup in one round trip: no
+        # row means no project, a NULL level means a non-member. Built as a
+        # lambda statement since it runs on every authorised request.
+        stmt = lambda_stmt(
+            lambda: select(
+                Project.id,
+                case(
+                    (Project.owner_id == user_id, literal(ProjectPermission.OWNER.value)),
+                    else_=ProjectMember.permission
+                )
+            )
+            .select_from(Project)
+            .outerjoin(
+                ProjectMember,
+                and_(ProjectMember.project_id == Project.id, ProjectMember.user_id == user_id)
+            )
+            .where(Project.id == project_id)
+        )
+        row = (await db.execute(stmt)).first()
+        if row is None:
+            return False, None
+        granted = row[1]
+        return True, ProjectPermission(granted) if granted is not None else None
+    
+    async def has_project_access(self, db: AsyncSession, *, project_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        """Check whether a user owns or is a member of a project in one round trip."""
+        stmt = union(
+            select(literal(1)).where(
                 ProjectMember.project_id == project_id,
                 ProjectMember.user_id == user_id
+            ),
+            select(literal(1)).where(
+                Project.id == project_id,
+                Project.owner_id == user_id
             )
-        ).first()
-        
-        if not member:
-            return False
-        
-        permission_hierarchy = {
-            ProjectPermission.OWNER: 4,
-            ProjectPermission.ADMIN: 3,
-            ProjectPermission.EDITOR: 2,
-            ProjectPermission.VIEWER: 1
-        }
-        
-        return permission_hierarchy.get(member.permission, 0) >= permission_hierarchy.get(required_permission, 0)
+        ).limit(1)
+        result = await db.execute(stmt)
+        return result.first() is not None
 
 class ProjectMemberCRUD:
     """CRUD operations for project members."""
     
-    def add_member(
+    async def add_member(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         member_in: ProjectMemberCreate, 
@@ -246,17 +517,12 @@ class ProjectMemberCRUD:
     ) -> Optional[ProjectMember]:
         """Add a member to a project."""
         # Find user by email
-        user = db.query(User).filter(User.email == member_in.user_email).first()
+        user = await db.scalar(select(User).where(User.email == member_in.user_email))
         if not user:
             return None
         
         # Check if already a member
-        existing_member = db.query(ProjectMember).filter(
-            and_(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == user.id
-            )
-        ).first()
+        existing_member = await db.scalar(_member_stmt(project_id, user.id))
         
         if existing_member:
             return existing_member
@@ -265,30 +531,29 @@ class ProjectMemberCRUD:
         member_data.update({
             "project_id": project_id,
             "user_id": user.id,
-            "invited_by": invited_by,
-            "invited_at": datetime.utcnow()
+            "invited_by": invited_by
         })
         
         db_member = ProjectMember(**member_data)
         db.add(db_member)
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=invited_by,
             activity_type="member_added",
             description=f"User {user.email} was added to the project",
-            metadata={"member_email": user.email, "permission": member_data["permission"]}
+            activity_metadata={"member_email": user.email, "permission": member_data["permission"]}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(db_member)
+        await db.commit()
+        await db.refresh(db_member)
         return db_member
     
-    def update_member_permission(
+    async def update_member_permission(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         user_id: uuid.UUID, 
@@ -296,12 +561,7 @@ class ProjectMemberCRUD:
         updated_by: uuid.UUID
     ) -> Optional[ProjectMember]:
         """Update member permission."""
-        member = db.query(ProjectMember).filter(
-            and_(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == user_id
-            )
-        ).first()
+        member = await db.scalar(_member_stmt(project_id, user_id))
         
         if not member:
             return None
@@ -310,85 +570,88 @@ class ProjectMemberCRUD:
         member.permission = permission
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=updated_by,
             activity_type="member_permission_updated",
             description=f"Member permission updated from {old_permission} to {permission}",
-            metadata={"member_user_id": user_id, "old_permission": old_permission, "new_permission": permission}
+            activity_metadata={"member_user_id": user_id, "old_permission": old_permission, "new_permission": permission}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(member)
+        await db.commit()
+        await db.refresh(member)
         return member
     
-    def remove_member(
+    async def remove_member(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         user_id: uuid.UUID,
         removed_by: uuid.UUID
     ) -> bool:
         """Remove a member from a project."""
-        member = db.query(ProjectMember).filter(
-            and_(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == user_id
-            )
-        ).first()
+        member = await db.scalar(_member_stmt(project_id, user_id))
         
         if not member:
             return False
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=removed_by,
             activity_type="member_removed",
             description=f"Member was removed from the project",
-            metadata={"removed_user_id": user_id}
+            activity_metadata={"removed_user_id": user_id}
         )
-        db.add(activity)
         
-        db.delete(member)
-        db.commit()
+        await db.delete(member)
+        await db.commit()
         return True
     
-    def get_project_members(
+    async def get_project_members(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         project_id: uuid.UUID
     ) -> List[ProjectMember]:
         """Get all members of a project."""
-        return db.query(ProjectMember).options(
-            joinedload(ProjectMember.user),
-            joinedload(ProjectMember.inviter)
-        ).filter(ProjectMember.project_id == project_id).all()
+        # raiseload('*') turns any other relationship access into an error
+        # instead of a silent per-row query.
+        result = await db.execute(
+            select(ProjectMember).options(
+                selectinload(ProjectMember.user),
+                selectinload(ProjectMember.inviter),
+                raiseload('*')
+            ).where(ProjectMember.project_id == project_id)
+        )
+        return result.scalars().all()
 
 class ProjectVersionCRUD:
     """CRUD operations for project versions."""
     
-    def create_version(
+    async def create_version(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         version_in: ProjectVersionCreate, 
         created_by: uuid.UUID
     ) -> ProjectVersion:
         """Create a new project version."""
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id)
         if not project:
             raise ValueError("Project not found")
         
         version_data = version_in.model_dump()
+        documents = {field: version_data.pop(field) for field in _VERSION_PATCH_FIELDS}
         version_data.update({
             "project_id": project_id,
             "created_by": created_by,
             "version_number": project.current_version + 1
         })
+        version_data.update(await _version_storage(db, project_id, version_data["version_number"], documents))
         
         db_version = ProjectVersion(**version_data)
         db.add(db_version)
@@ -397,67 +660,86 @@ class ProjectVersionCRUD:
         project.current_version = version_data["version_number"]
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=created_by,
             activity_type="version_created",
             description=f"Version '{version_in.name}' was created",
-            metadata={"version_number": version_data["version_number"]}
+            activity_metadata={"version_number": version_data["version_number"]}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(db_version)
+        await db.commit()
+        await db.refresh(db_version)
+        # Patch-stored versions have no documents in their row
+        for field, value in documents.items():
+            set_committed_value(db_version, field, value)
         return db_version
     
-    def get_project_versions(
+    async def get_project_versions(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         project_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50
     ) -> Tuple[List[ProjectVersion], int]:
         """Get versions of a project."""
-        query = db.query(ProjectVersion).filter(ProjectVersion.project_id == project_id)
-        total = query.count()
-        versions = query.order_by(desc(ProjectVersion.version_number)).offset(skip).limit(limit).all()
+        query = select(ProjectVersion).options(
+            selectinload(ProjectVersion.creator),
+            raiseload('*')
+        ).where(ProjectVersion.project_id == project_id)
+        versions, total = await _paginate_with_total(db, query.order_by(desc(ProjectVersion.version_number)), skip, limit)
+        await _fill_version_documents(db, versions)
         return versions, total
     
-    def get_version(
+    async def get_versions_fingerprint(self, db: AsyncSession, project_id: uuid.UUID) -> Tuple[int, Any]:
+        """
+        Count and latest creation time of a project's versions. Versions are
+        never edited in place, so this changes whenever the version list does.
+        """
+        row = (await db.execute(
+            select(func.count(), func.max(ProjectVersion.created_at))
+            .where(ProjectVersion.project_id == project_id)
+        )).one()
+        return row[0], row[1]
+    
+    async def get_version(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         version_id: uuid.UUID
     ) -> Optional[ProjectVersion]:
         """Get a specific version."""
-        return db.query(ProjectVersion).filter(ProjectVersion.id == version_id).first()
+        version = await db.get(ProjectVersion, version_id)
+        if version:
+            await _fill_version_documents(db, [version])
+        return version
     
-    def revert_to_version(
+    async def revert_to_version(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         version_id: uuid.UUID, 
         user_id: uuid.UUID
     ) -> Optional[Project]:
         """Revert project to a specific version."""
-        version = self.get_version(db, version_id)
+        version = await self.get_version(db, version_id)
         if not version or version.project_id != project_id:
             return None
         
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id, options=[joinedload(Project.payload)], populate_existing=True)
         if not project:
             return None
         
         # Create new version with reverted data
+        documents = {field: getattr(version, field) for field in _VERSION_PATCH_FIELDS}
         new_version = ProjectVersion(
             project_id=project_id,
             version_number=project.current_version + 1,
             created_by=user_id,
             name=f"Revert to version {version.version_number}",
             description=f"Reverted to version '{version.name}'",
-            layout_data=version.layout_data,
-            plant_data=version.plant_data,
-            irrigation_data=version.irrigation_data
+            **await _version_storage(db, project_id, project.current_version + 1, documents)
         )
         db.add(new_version)
         
@@ -469,25 +751,28 @@ class ProjectVersionCRUD:
         project.last_modified_by = user_id
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=user_id,
             activity_type="version_reverted",
             description=f"Project reverted to version {version.version_number}",
-            metadata={"reverted_version_id": str(version_id)}
+            activity_metadata={"reverted_version_id": str(version_id)}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(project)
+        payload = project.payload
+        await db.commit()
+        await db.refresh(project)
+        # refresh() leaves lazy="raise" relationships unloaded
+        set_committed_value(project, "payload", payload)
         return project
 
 class ProjectCommentCRUD:
     """CRUD operations for project comments."""
     
-    def create_comment(
+    async def create_comment(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         project_id: uuid.UUID, 
         comment_in: ProjectCommentCreate, 
@@ -504,60 +789,72 @@ class ProjectCommentCRUD:
         db.add(db_comment)
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=project_id,
             user_id=author_id,
             activity_type="comment_added",
             description="A comment was added to the project",
-            metadata={"comment_id": str(db_comment.id)}
+            activity_metadata={"comment_id": str(db_comment.id)}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(db_comment)
+        await db.commit()
+        await db.refresh(db_comment)
         return db_comment
     
-    def get_project_comments(
+    async def get_project_comments(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         project_id: uuid.UUID,
         skip: int = 0,
         limit: int = 50
     ) -> Tuple[List[ProjectComment], int]:
         """Get comments for a project."""
-        query = db.query(ProjectComment).filter(ProjectComment.project_id == project_id)
-        total = query.count()
-        comments = query.order_by(desc(ProjectComment.created_at)).offset(skip).limit(limit).all()
-        return comments, total
+        query = select(ProjectComment).options(
+            selectinload(ProjectComment.author),
+            raiseload('*')
+        ).where(ProjectComment.project_id == project_id)
+        return await _paginate_with_total(db, query.order_by(desc(ProjectComment.created_at)), skip, limit)
+    
+    async def get_comments_fingerprint(self, db: AsyncSession, project_id: uuid.UUID) -> Tuple[int, Any]:
+        """
+        Count and latest modification time of a project's comments; changes
+        whenever a comment is added, removed, edited or resolved.
+        """
+        row = (await db.execute(
+            select(func.count(), func.max(ProjectComment.updated_at))
+            .where(ProjectComment.project_id == project_id)
+        )).one()
+        return row[0], row[1]
     
-    def resolve_comment(
+    async def resolve_comment(
         self, 
-        db: Session, 
+        db: AsyncSession, 
         *, 
         comment_id: uuid.UUID, 
         resolved_by: uuid.UUID
     ) -> Optional[ProjectComment]:
         """Mark a comment as resolved."""
-        comment = db.query(ProjectComment).filter(ProjectComment.id == comment_id).first()
+        comment = await db.get(ProjectComment, comment_id)
         if not comment:
             return None
         
         comment.is_resolved = True
         comment.resolved_by = resolved_by
-        comment.resolved_at = datetime.utcnow()
+        comment.resolved_at = func.now()  # set by the database in the UPDATE
         
         # Create activity log
-        activity = ProjectActivity(
+        _log_activity(
+            db,
             project_id=comment.project_id,
             user_id=resolved_by,
             activity_type="comment_resolved",
             description="A comment was resolved",
-            metadata={"comment_id": str(comment_id)}
+            activity_metadata={"comment_id": str(comment_id)}
         )
-        db.add(activity)
         
-        db.commit()
-        db.refresh(comment)
+        await db.commit()
+        await db.refresh(comment)
         return comment
 
 # Create instances
@@ -5,7 +5,7 @@ from typing import Optional
 from app.crud.base import CRUDBase
 from app.models import User
 from app.schemas import UserCreate, UserUpdate
-from app.core.security import verify_password, get_password_hash
+from app.core.security import averify_and_update_password, aget_password_hash
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
@@ -16,7 +16,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db_obj = User(
             email=obj_in.email.lower(),
             full_name=obj_in.full_name,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await aget_password_hash(obj_in.password),
             is_active=True,
             is_verified=False, # Set to True if you have email verification
         )
@@ -31,8 +31,14 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await averify_and_update_password(password, user.hashed_password)
+        if not verified:
             return None
+        if new_hash:
+            # Transparently migrate the stored hash to the configured cost
+            user.hashed_password = new_hash
+            db.add(user)
+            await db.commit()
         return user
 
 user = CRUDUser(User)
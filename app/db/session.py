@@ -1,14 +1,25 @@
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from app.core.config import settings
+from app.core.config import settings, get_db_connect_args
 
-# Create an async engine with a connection pool
+def _json_serializer(value) -> str:
+    # asyncpg's JSON/JSONB codecs expect text, orjson produces bytes
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# Create an async engine with a connection pool.
+# Async engines use AsyncAdaptedQueuePool by default; don't pass the sync
+# QueuePool explicitly, its blocking checkout can deadlock the event loop.
 engine = create_async_engine(
     settings.DATABASE_URL,
     pool_size=settings.DB_POOL_SIZE,
     max_overflow=settings.DB_MAX_OVERFLOW,
     pool_timeout=settings.DB_POOL_TIMEOUT,
     pool_recycle=settings.DB_POOL_RECYCLE,
-    pool_pre_ping=True,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=get_db_connect_args(),
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    json_serializer=_json_serializer,  # JSON/JSONB columns (layouts, activity metadata)
+    json_deserializer=orjson.loads,
     echo=settings.ENVIRONMENT == "development",  # Log SQL queries in dev
 )
 
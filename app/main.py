@@ -1,9 +1,10 @@
+import logging
 import redis.asyncio as redis
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -13,6 +14,12 @@ from fastapi_csrf_protect.exceptions import CsrfProtectError
 from app.core.config import settings
 from app.core.limiter import limiter
 from app.api.v1.api import api_router
+from app.services.websocket_manager import websocket_manager
+from app.services.plant_catalog_cache import plant_catalog_cache
+from app.schemas.base import rebuild_deferred_models
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
 
 # --- Lifespan Manager for Redis Connection ---
 @asynccontextmanager
@@ -20,6 +27,7 @@ async def lifespan(app: FastAPI):
     """
     Context manager to handle startup and shutdown events.
     Connects to Redis on startup and closes the connection on shutdown.
+    The WebSocket manager shares the client for presence and cross-worker fanout.
     """
     app.state.redis = redis.from_url(
         f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}",
@@ -27,7 +35,22 @@ async def lifespan(app: FastAPI):
         decode_responses=True,
         db=settings.REDIS_DB
     )
+    websocket_manager.bind_redis(app.state.redis)
+    await websocket_manager.start_fanout()
+    # Warm the in-memory plant catalog; if the DB is not reachable yet the
+    # first catalog request loads it instead.
+    try:
+        async with AsyncSessionLocal() as session:
+            await plant_catalog_cache.load(session)
+    except Exception:
+        logger.exception("Plant catalog preload failed; it will load on first use")
+    # Finish the schemas deferred at import in one batch, before any request
+    logger.info("Built %d deferred schemas", rebuild_deferred_models())
+    # Build the OpenAPI document once now (FastAPI caches it on the app) so the
+    # first /docs or openapi.json request does not walk every schema.
+    app.openapi()
     yield
+    await websocket_manager.stop_fanout()
     await app.state.redis.aclose()
 
 # --- App Initialization ---
@@ -36,6 +59,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     version="1.0.0",
     description="A modern, production-ready RESTful API for the Agrotique Garden Planner.",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
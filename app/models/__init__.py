@@ -6,7 +6,7 @@ from .user import User
 from .garden import Garden
 from .plant import Plant
 from .plant_catalog import PlantCatalog
-from .project import Project, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus
+from .project import Project, ProjectPayload, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus
 from .irrigation import (
     IrrigationEquipment, IrrigationZone, IrrigationZoneEquipment, IrrigationPipe,
     IrrigationSchedule, WeatherData, IrrigationProject, EquipmentType, PipeMaterial,
@@ -20,6 +20,7 @@ __all__ = [
     "Plant",
     "PlantCatalog",
     "Project",
+    "ProjectPayload",
     "ProjectMember", 
     "ProjectVersion",
     "ProjectComment",
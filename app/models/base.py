@@ -1,21 +1,30 @@
+import re
 import uuid
 from datetime import datetime
-from sqlalchemy import DateTime, func
+from enum import Enum
+from typing import Optional, Type
+from sqlalchemy import DDL, DateTime, SmallInteger, event, func
+from sqlalchemy.types import TypeDecorator
+from uuid_utils.compat import uuid7
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import as_declarative, Mapped, mapped_column, declared_attr
 
+# Splits CamelCase class names at each capital: "ProjectMember" -> "Project_Member"
+_CAMEL_SPLIT = re.compile(r'(?<!^)(?=[A-Z])')
+
 @as_declarative()
 class Base:
     """Base class for all SQLAlchemy models."""
-    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Time-ordered UUIDv7 keys append to the right edge of the primary key
+    # B-tree instead of landing on random pages like uuid4
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
 
     # Generate __tablename__ automatically
     @declared_attr
     def __tablename__(cls) -> str:
-        import re
-        name = re.sub(r'(?<!^)(?=[A-Z])', '_', cls.__name__).lower()
+        name = _CAMEL_SPLIT.sub('_', cls.__name__).lower()
         # Simple pluralization
         if name.endswith('y'):
             return name[:-1] + 'ies'
@@ -23,3 +32,38 @@ class Base:
             return name + 'es'
         else:
             return name + 's'
+
+class IntEnumType(TypeDecorator):
+    """
+    Store a Python Enum as a 2-byte SMALLINT code instead of its label.
+
+    Codes follow declaration order starting at 1, so new members must only
+    ever be appended to the enum; reordering would remap stored rows.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls: Type[Enum]):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._to_code = {member: code for code, member in enumerate(enum_cls, start=1)}
+        self._from_code = {code: member for member, code in self._to_code.items()}
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        # Accepts members and their values, e.g. the API schemas' mirror enums
+        return self._to_code[self.enum_cls(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._from_code[value]
+
+    @property
+    def python_type(self) -> Type[Enum]:
+        return self.enum_cls
+
+# Some models declare pg_trgm GIN indexes; make sure the extension exists when
+# the schema is created straight from metadata (e.g. the test suite).
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
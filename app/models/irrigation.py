@@ -1,20 +1,21 @@
 from datetime import datetime, time
-from decimal import Decimal
 from enum import Enum
 from typing import Dict, Any, List, Optional
-from uuid import uuid4
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, Enum as SQLEnum, Float, ForeignKey, 
-    Integer, JSON, String, Text, Time, UniqueConstraint
+    Boolean, Column, DateTime, Float, ForeignKey, 
+    Index, Integer, SmallInteger, String, Text, Time
 )
-from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
+from uuid_utils.compat import uuid7
 
-from app.models.base import Base
+from app.models.base import Base, IntEnumType
 
 
+# The enums below are persisted as SMALLINT codes in declaration order (see
+# IntEnumType and migration irrigation_enum_codes_001): append, never reorder.
 class EquipmentType(str, Enum):
     """Types of irrigation equipment."""
     DRIP = "drip"
@@ -51,9 +52,9 @@ class IrrigationEquipment(Base):
     """Model for irrigation equipment (emitters, sprinklers, etc.)."""
     __tablename__ = "irrigation_equipment"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    equipment_type: Mapped[EquipmentType] = mapped_column(SQLEnum(EquipmentType), nullable=False)
+    equipment_type: Mapped[EquipmentType] = mapped_column(IntEnumType(EquipmentType), nullable=False)
     manufacturer: Mapped[str] = mapped_column(String(255), nullable=False)
     model: Mapped[str] = mapped_column(String(255), nullable=False)
     flow_rate_lph: Mapped[float] = mapped_column(Float, nullable=False)  # Liters per hour
@@ -61,7 +62,7 @@ class IrrigationEquipment(Base):
     pressure_range_max: Mapped[float] = mapped_column(Float, nullable=False)  # Bar
     coverage_radius_m: Mapped[float] = mapped_column(Float, nullable=False)  # Meters
     spacing_m: Mapped[float] = mapped_column(Float, nullable=False)  # Recommended spacing
-    cost_per_unit: Mapped[Decimal] = mapped_column(Float, nullable=False)  # USD
+    cost_per_unit: Mapped[float] = mapped_column(Float, nullable=False)  # USD
     specifications: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
@@ -69,17 +70,24 @@ class IrrigationEquipment(Base):
     zone_equipment: Mapped[List["IrrigationZoneEquipment"]] = relationship(
         "IrrigationZoneEquipment", back_populates="equipment", cascade="all, delete-orphan"
     )
+    
+    # Indexes (created in irrigation_equipment_specs_gin_001)
+    __table_args__ = (
+        # jsonb_path_ops only supports @>, but is much smaller than the default opclass
+        Index('idx_equipment_specifications_gin', 'specifications',
+              postgresql_using='gin', postgresql_ops={'specifications': 'jsonb_path_ops'}),
+    )
 
 
 class IrrigationZone(Base):
     """Model for irrigation zones."""
     __tablename__ = "irrigation_zones"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     garden_id: Mapped[UUID] = mapped_column(ForeignKey("gardens.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    status: Mapped[ZoneStatus] = mapped_column(SQLEnum(ZoneStatus), default=ZoneStatus.ACTIVE, nullable=False)
+    status: Mapped[ZoneStatus] = mapped_column(IntEnumType(ZoneStatus), default=ZoneStatus.ACTIVE, nullable=False)
     
     # Hydraulic properties
     required_flow_lph: Mapped[float] = mapped_column(Float, nullable=False)
@@ -89,21 +97,29 @@ class IrrigationZone(Base):
     # Clustering data
     cluster_center_x: Mapped[float] = mapped_column(Float, nullable=False)
     cluster_center_y: Mapped[float] = mapped_column(Float, nullable=False)
-    plant_ids: Mapped[List[int]] = mapped_column(JSON, nullable=False)
+    plant_ids: Mapped[List[int]] = mapped_column(ARRAY(Integer), nullable=False)
     
     # Cost estimation
-    estimated_cost: Mapped[Decimal] = mapped_column(Float, nullable=True)
+    estimated_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
-    # Relationships
+    # Relationships (collections load with one IN query per batch of zones)
     garden: Mapped["Garden"] = relationship("Garden", back_populates="irrigation_zones")
     equipment: Mapped[List["IrrigationZoneEquipment"]] = relationship(
-        "IrrigationZoneEquipment", back_populates="zone", cascade="all, delete-orphan"
+        "IrrigationZoneEquipment", back_populates="zone", cascade="all, delete-orphan", lazy="selectin"
     )
     pipes: Mapped[List["IrrigationPipe"]] = relationship(
-        "IrrigationPipe", back_populates="zone", cascade="all, delete-orphan"
+        "IrrigationPipe", back_populates="zone", cascade="all, delete-orphan", lazy="selectin"
     )
     schedules: Mapped[List["IrrigationSchedule"]] = relationship(
-        "IrrigationSchedule", back_populates="zone", cascade="all, delete-orphan"
+        "IrrigationSchedule", back_populates="zone", cascade="all, delete-orphan", lazy="selectin"
+    )
+    
+    # Indexes (created in irrigation_system_001 and irrigation_arrays_001);
+    # garden_id leads, so it also serves listing every zone of a garden.
+    # The GIN index answers "zones containing plant X" (plant_ids @> ARRAY[X]).
+    __table_args__ = (
+        Index('idx_zone_garden_status', 'garden_id', 'status'),
+        Index('idx_zone_plant_ids', 'plant_ids', postgresql_using='gin'),
     )
 
 
@@ -111,7 +127,7 @@ class IrrigationZoneEquipment(Base):
     """Junction table for zone equipment assignments."""
     __tablename__ = "irrigation_zone_equipment"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     zone_id: Mapped[UUID] = mapped_column(ForeignKey("irrigation_zones.id"), nullable=False)
     equipment_id: Mapped[UUID] = mapped_column(ForeignKey("irrigation_equipment.id"), nullable=False)
     quantity: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -127,11 +143,11 @@ class IrrigationPipe(Base):
     """Model for irrigation pipe network."""
     __tablename__ = "irrigation_pipes"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     zone_id: Mapped[UUID] = mapped_column(ForeignKey("irrigation_zones.id"), nullable=False)
     pipe_name: Mapped[str] = mapped_column(String(255), nullable=False)
     pipe_type: Mapped[str] = mapped_column(String(50), nullable=False)  # main, lateral, sub-lateral
-    material: Mapped[PipeMaterial] = mapped_column(SQLEnum(PipeMaterial), nullable=False)
+    material: Mapped[PipeMaterial] = mapped_column(IntEnumType(PipeMaterial), nullable=False)
     diameter_mm: Mapped[float] = mapped_column(Float, nullable=False)
     length_m: Mapped[float] = mapped_column(Float, nullable=False)
     
@@ -147,8 +163,8 @@ class IrrigationPipe(Base):
     end_y: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Cost
-    cost_per_meter: Mapped[Decimal] = mapped_column(Float, nullable=False)
-    total_cost: Mapped[Decimal] = mapped_column(Float, nullable=False)
+    cost_per_meter: Mapped[float] = mapped_column(Float, nullable=False)
+    total_cost: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Relationships
     zone: Mapped[IrrigationZone] = relationship("IrrigationZone", back_populates="pipes")
@@ -158,17 +174,17 @@ class IrrigationSchedule(Base):
     """Model for irrigation schedules."""
     __tablename__ = "irrigation_schedules"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     zone_id: Mapped[UUID] = mapped_column(ForeignKey("irrigation_zones.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
-    schedule_type: Mapped[ScheduleType] = mapped_column(SQLEnum(ScheduleType), nullable=False)
+    schedule_type: Mapped[ScheduleType] = mapped_column(IntEnumType(ScheduleType), nullable=False)
     
     # Timing
     start_time: Mapped[time] = mapped_column(Time, nullable=False)
     duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
     
     # Frequency
-    days_of_week: Mapped[List[int]] = mapped_column(JSON, nullable=True)  # 0=Monday, 6=Sunday
+    days_of_week: Mapped[Optional[List[int]]] = mapped_column(ARRAY(SmallInteger), nullable=True)  # 0=Monday, 6=Sunday
     interval_days: Mapped[int] = mapped_column(Integer, nullable=True)
     
     # Weather-based settings
@@ -184,13 +200,18 @@ class IrrigationSchedule(Base):
     
     # Relationships
     zone: Mapped[IrrigationZone] = relationship("IrrigationZone", back_populates="schedules")
+    
+    # Indexes (created in irrigation_system_001)
+    __table_args__ = (
+        Index('idx_schedule_zone_type', 'zone_id', 'schedule_type'),
+    )
 
 
 class WeatherData(Base):
     """Model for weather data from external APIs."""
     __tablename__ = "weather_data"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     garden_id: Mapped[UUID] = mapped_column(ForeignKey("gardens.id"), nullable=False)
     date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     
@@ -212,9 +233,15 @@ class WeatherData(Base):
     # Relationships
     garden: Mapped["Garden"] = relationship("Garden", back_populates="weather_data")
     
-    # Constraints
+    # Constraints and indexes (created in irrigation_system_001, rebuilt in
+    # time_partitioning_001, which partitions the table by month of date).
+    # The unique (garden_id, date) B-tree also serves "latest for a garden"
+    # and date-range queries ordered by date DESC via a backward index scan.
     __table_args__ = (
-        UniqueConstraint('garden_id', 'date', name='uq_weather_garden_date'),
+        Index('idx_weather_garden_date', 'garden_id', 'date', unique=True),
+        Index('idx_weather_date', 'date', postgresql_using='brin'),
+        Index('idx_weather_raw_data_gin', 'raw_data',
+              postgresql_using='gin', postgresql_ops={'raw_data': 'jsonb_path_ops'}),
     )
 
 
@@ -222,7 +249,7 @@ class IrrigationProject(Base):
     """Model for irrigation design projects."""
     __tablename__ = "irrigation_projects"
     
-    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     garden_id: Mapped[UUID] = mapped_column(ForeignKey("gardens.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
@@ -233,10 +260,10 @@ class IrrigationProject(Base):
     source_flow_lph: Mapped[float] = mapped_column(Float, nullable=False)
     
     # Cost estimation
-    total_equipment_cost: Mapped[Decimal] = mapped_column(Float, nullable=True)
-    total_pipe_cost: Mapped[Decimal] = mapped_column(Float, nullable=True)
-    total_installation_cost: Mapped[Decimal] = mapped_column(Float, nullable=True)
-    total_project_cost: Mapped[Decimal] = mapped_column(Float, nullable=True)
+    total_equipment_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    total_pipe_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    total_installation_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    total_project_cost: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     
     # Design data
     hydraulic_calculations: Mapped[Dict[str, Any]] = mapped_column(JSONB, nullable=True)
@@ -248,6 +275,15 @@ class IrrigationProject(Base):
     
     # Relationships
     garden: Mapped["Garden"] = relationship("Garden", back_populates="irrigation_projects")
+    # Zones belong to the garden, not the project: read-only view of the
+    # zones sharing this project's garden
     zones: Mapped[List[IrrigationZone]] = relationship(
-        "IrrigationZone", back_populates="garden", cascade="all, delete-orphan"
+        "IrrigationZone",
+        primaryjoin="IrrigationProject.garden_id == foreign(IrrigationZone.garden_id)",
+        viewonly=True
+    )
+    
+    # Indexes (created in irrigation_system_001)
+    __table_args__ = (
+        Index('idx_project_garden_active', 'garden_id', 'is_active'),
     ) 
\ No newline at end of file
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Text, ARRAY
+from typing import List
+from sqlalchemy import Index, Integer, String, Text, ARRAY
+from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
 class PlantCatalog(Base):
@@ -8,19 +10,26 @@ class PlantCatalog(Base):
     """
     __tablename__ = "plant_catalog"
 
-    id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, index=True, nullable=False)
-    variety = Column(String)
-    plant_type = Column(String, index=True)
-    image = Column(String)
-    description = Column(Text)
-    sun = Column(String)
-    water = Column(String)
-    spacing = Column(String)
-    planting_season = Column(ARRAY(String))
-    harvest_season = Column(ARRAY(String))
-    compatibility = Column(ARRAY(String))
-    tips = Column(Text)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    name: Mapped[str] = mapped_column(String, index=True, nullable=False)
+    variety: Mapped[str | None] = mapped_column(String, nullable=True)
+    plant_type: Mapped[str | None] = mapped_column(String, index=True, nullable=True)
+    image: Mapped[str | None] = mapped_column(String, nullable=True)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    sun: Mapped[str | None] = mapped_column(String, nullable=True)
+    water: Mapped[str | None] = mapped_column(String, nullable=True)
+    spacing: Mapped[str | None] = mapped_column(String, nullable=True)
+    planting_season: Mapped[List[str] | None] = mapped_column(ARRAY(String), nullable=True)
+    harvest_season: Mapped[List[str] | None] = mapped_column(ARRAY(String), nullable=True)
+    compatibility: Mapped[List[str] | None] = mapped_column(ARRAY(String), nullable=True)
+    tips: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    # Trigram indexes back the ILIKE '%q%' catalog search
+    __table_args__ = (
+        Index('ix_plant_catalog_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_plant_catalog_variety_trgm', 'variety', postgresql_using='gin', postgresql_ops={'variety': 'gin_trgm_ops'}),
+        Index('ix_plant_catalog_description_trgm', 'description', postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'}),
+    )
 
     def __repr__(self):
         return f"<PlantCatalog(id={self.id}, name='{self.name}')>"
@@ -2,8 +2,9 @@ import uuid
 import json
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import String, ForeignKey, Float, Text, Boolean, JSON, Integer, DateTime, Index
-from sqlalchemy.orm import Mapped, mapped_column, relationship, validates
+from sqlalchemy import String, ForeignKey, Float, Text, Boolean, JSON, Integer, DateTime, Index, Computed, func
+from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship, validates
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from app.models.base import Base
 from typing import TYPE_CHECKING, Dict, Any, List
@@ -33,7 +34,7 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     status: Mapped[ProjectStatus] = mapped_column(String(50), default=ProjectStatus.DRAFT, nullable=False)
-    owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    owner_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     
     # Metadata
     location: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -41,10 +42,18 @@ class Project(Base):
     soil_type: Mapped[str | None] = mapped_column(String(100), nullable=True)
     garden_size: Mapped[float | None] = mapped_column(Float, nullable=True)  # in square meters
     
-    # Layout and data
-    layout_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
-    plant_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
-    irrigation_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    # Layout and data live in project_payloads (see ProjectPayload) so that
+    # project rows stay narrow; these proxies read and write through .payload,
+    # which has to be loaded explicitly, e.g. with joinedload(Project.payload)
+    layout_data: AssociationProxy[Dict[str, Any] | None] = association_proxy(
+        "payload", "layout_data", creator=lambda value: ProjectPayload(layout_data=value)
+    )
+    plant_data: AssociationProxy[Dict[str, Any] | None] = association_proxy(
+        "payload", "plant_data", creator=lambda value: ProjectPayload(plant_data=value)
+    )
+    irrigation_data: AssociationProxy[Dict[str, Any] | None] = association_proxy(
+        "payload", "irrigation_data", creator=lambda value: ProjectPayload(irrigation_data=value)
+    )
     
     # Versioning
     current_version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
@@ -55,12 +64,36 @@ class Project(Base):
     allow_comments: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     allow_forking: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     
+    # Searched text kept up to date by Postgres; never loaded unless asked for
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        Computed("name || ' ' || coalesce(description, '') || ' ' || coalesce(location, '')", persisted=True),
+        nullable=True,
+        deferred=True
+    )
+    
+    # Values the project response schemas show but the row does not hold. The
+    # loaders fill them in their own SELECT with with_expression() (see
+    # crud.project.with_summary_fields); left None when a query doesn't ask.
+    owner_name: Mapped[str | None] = query_expression()
+    last_modified_user_name: Mapped[str | None] = query_expression()
+    members_count: Mapped[int | None] = query_expression()
+    comments_count: Mapped[int | None] = query_expression()
+    versions_count: Mapped[int | None] = query_expression()
+    
     # Relationships
     owner: Mapped["User"] = relationship("User", foreign_keys=[owner_id], back_populates="owned_projects")
     last_modified_user: Mapped["User | None"] = relationship("User", foreign_keys=[last_modified_by])
+    # lazy="raise": a forgotten eager load fails loudly instead of costing a query per project
+    payload: Mapped["ProjectPayload | None"] = relationship(
+        "ProjectPayload", back_populates="project", cascade="all, delete-orphan", lazy="raise"
+    )
+    # Collections stay lazy: list pages never read them, and the loaders
+    # that need them eager-load at query level
     members: Mapped[List["ProjectMember"]] = relationship("ProjectMember", back_populates="project", cascade="all, delete-orphan")
     versions: Mapped[List["ProjectVersion"]] = relationship("ProjectVersion", back_populates="project", cascade="all, delete-orphan")
     comments: Mapped[List["ProjectComment"]] = relationship("ProjectComment", back_populates="project", cascade="all, delete-orphan")
+    activities: Mapped[List["ProjectActivity"]] = relationship("ProjectActivity", back_populates="project", cascade="all, delete-orphan")
     gardens: Mapped[List["Garden"]] = relationship("Garden", back_populates="project", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -68,21 +101,41 @@ class Project(Base):
 
     @validates('name')
     def validate_name(self, key, name):
-        if not name or len(name.strip()) == 0:
-            raise ValueError("Project name cannot be empty")
-        if len(name) > 255:
-            raise ValueError("Project name cannot exceed 255 characters")
-        return name.strip()
+        return clean_project_name(name)
+
+class ProjectPayload(Base):
+    """Large, rarely listed design documents of a project, one row per project."""
+    __tablename__ = 'project_payloads'
+
+    # Shares the project's primary key
+    id: Mapped[uuid.UUID] = mapped_column("project_id", ForeignKey("projects.id"), primary_key=True)
+    layout_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    plant_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    irrigation_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+
+    # Relationships
+    project: Mapped["Project"] = relationship("Project", back_populates="payload")
+
+    def __repr__(self):
+        return f"<ProjectPayload(project_id={self.id})>"
+
+def clean_project_name(name: str) -> str:
+    """Validate and normalise a project name; shared with bulk UPDATE paths that bypass @validates."""
+    if not name or len(name.strip()) == 0:
+        raise ValueError("Project name cannot be empty")
+    if len(name) > 255:
+        raise ValueError("Project name cannot exceed 255 characters")
+    return name.strip()
 
 class ProjectMember(Base):
     """Project member with permissions."""
     __tablename__ = 'project_members'
 
-    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), index=True, nullable=False)
-    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), index=True, nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     permission: Mapped[ProjectPermission] = mapped_column(String(50), default=ProjectPermission.VIEWER, nullable=False)
     invited_by: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("users.id"), nullable=True)
-    invited_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    invited_at: Mapped[datetime | None] = mapped_column(DateTime, default=func.now(), nullable=True)
     accepted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     
     # Relationships
@@ -90,6 +143,15 @@ class ProjectMember(Base):
     user: Mapped["User"] = relationship("User", foreign_keys=[user_id])
     inviter: Mapped["User | None"] = relationship("User", foreign_keys=[invited_by])
 
+    # Read by the ProjectMember response schema; loaders eager-load .user
+    @property
+    def user_email(self) -> str:
+        return self.user.email
+
+    @property
+    def user_full_name(self) -> str | None:
+        return self.user.full_name
+
     def __repr__(self):
         return f"<ProjectMember(project_id={self.project_id}, user_id={self.user_id}, permission='{self.permission}')>"
 
@@ -97,16 +159,23 @@ class ProjectVersion(Base):
     """Project version for git-like versioning."""
     __tablename__ = 'project_versions'
 
-    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), index=True, nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
     version_number: Mapped[int] = mapped_column(Integer, nullable=False)
     created_by: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     
-    # Version data
+    # Version data. Snapshot versions store the full documents in the *_data
+    # columns; every other version stores RFC 6902 patches against the
+    # previous version number in *_patch and has NULL *_data in the table
+    # (the CRUD layer fills them in when versions are read).
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    is_snapshot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     layout_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     plant_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     irrigation_data: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    layout_patch: Mapped[List[Dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)
+    plant_patch: Mapped[List[Dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)
+    irrigation_patch: Mapped[List[Dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)
     
     # Version metadata
     is_tagged: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
@@ -116,7 +185,7 @@ class ProjectVersion(Base):
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="versions")
     creator: Mapped["User"] = relationship("User", foreign_keys=[created_by])
-    parent_version: Mapped["ProjectVersion | None"] = relationship("ProjectVersion", remote_side=[id])
+    parent_version: Mapped["ProjectVersion | None"] = relationship("ProjectVersion", remote_side="ProjectVersion.id")
 
     def __repr__(self):
         return f"<ProjectVersion(project_id={self.project_id}, version={self.version_number}, name='{self.name}')>"
@@ -125,7 +194,7 @@ class ProjectComment(Base):
     """Project comments for collaboration."""
     __tablename__ = 'project_comments'
 
-    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), index=True, nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
     author_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     parent_comment_id: Mapped[uuid.UUID | None] = mapped_column(ForeignKey("project_comments.id"), nullable=True)
     
@@ -144,37 +213,48 @@ class ProjectComment(Base):
     project: Mapped["Project"] = relationship("Project", back_populates="comments")
     author: Mapped["User"] = relationship("User", foreign_keys=[author_id])
     resolver: Mapped["User | None"] = relationship("User", foreign_keys=[resolved_by])
-    parent_comment: Mapped["ProjectComment | None"] = relationship("ProjectComment", remote_side=[id])
+    parent_comment: Mapped["ProjectComment | None"] = relationship("ProjectComment", remote_side="ProjectComment.id")
     replies: Mapped[List["ProjectComment"]] = relationship("ProjectComment", back_populates="parent_comment")
 
     def __repr__(self):
         return f"<ProjectComment(id={self.id}, project_id={self.project_id}, author_id={self.author_id})>"
 
 class ProjectActivity(Base):
-    """Project activity log for audit trail."""
+    """
+    Project activity log for audit trail. The table is partitioned by month
+    of created_at (time_partitioning_001); expired months are dropped whole.
+    """
     __tablename__ = 'project_activities'
 
-    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), index=True, nullable=False)
+    project_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("projects.id"), nullable=False)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
     
     # Activity data
     activity_type: Mapped[str] = mapped_column(String(100), nullable=False)  # e.g., 'project_created', 'layout_updated'
     description: Mapped[str] = mapped_column(Text, nullable=False)
-    metadata: Mapped[Dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    # "metadata" is reserved on declarative classes, so the attribute is renamed;
+    # the column key follows it so Core inserts keyed "activity_metadata" land here
+    activity_metadata: Mapped[Dict[str, Any] | None] = mapped_column("metadata", JSONB, nullable=True, key="activity_metadata")
     
     # Relationships
-    project: Mapped["Project"] = relationship("Project")
+    project: Mapped["Project"] = relationship("Project", back_populates="activities")
     user: Mapped["User"] = relationship("User", foreign_keys=[user_id])
 
     def __repr__(self):
         return f"<ProjectActivity(project_id={self.project_id}, user_id={self.user_id}, type='{self.activity_type}')>"
 
-# Update User model to include project relationships
-if TYPE_CHECKING:
-    from .user import User
-
-# Add indexes for better performance
+# Add indexes for better performance. Each foreign key leads one of these
+# composites, so the FK columns carry no single-column index of their own.
 Index('idx_project_owner_status', Project.owner_id, Project.status)
 Index('idx_project_member_user', ProjectMember.user_id, ProjectMember.project_id)
 Index('idx_project_version_number', ProjectVersion.project_id, ProjectVersion.version_number)
-Index('idx_project_activity_project', ProjectActivity.project_id, ProjectActivity.created_at) 
\ No newline at end of file
+Index('idx_project_activity_project', ProjectActivity.project_id, ProjectActivity.created_at)
+Index('idx_project_member_project_user', ProjectMember.project_id, ProjectMember.user_id, unique=True)
+Index('idx_project_comment_project', ProjectComment.project_id, ProjectComment.created_at)
+Index('idx_comment_project_parent', ProjectComment.project_id, ProjectComment.parent_comment_id)
+
+# Full-text index for project search, trigram indexes for the ILIKE fallback
+Index('ix_projects_search_text_trgm', Project.search_text, postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'})
+Index('ix_projects_name_trgm', Project.name, postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+Index('ix_projects_description_trgm', Project.description, postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+Index('ix_projects_location_trgm', Project.location, postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'})
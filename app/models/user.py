@@ -1,3 +1,4 @@
+import re
 from sqlalchemy import String, Boolean
 from sqlalchemy.orm import Mapped, mapped_column, validates, relationship
 from app.models.base import Base
@@ -7,6 +8,9 @@ if TYPE_CHECKING:
     from .garden import Garden
     from .project import Project, ProjectMember, ProjectComment, ProjectActivity
 
+# One "@", no whitespace, and a dot in the domain part
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
 class User(Base):
     """User model."""
     __tablename__ = 'users'
@@ -26,11 +30,16 @@ class User(Base):
 
     @validates('email')
     def validate_email(self, key, email):
-        if not email:
-            raise ValueError("Email cannot be empty.")
-        if '@' not in email:
-            raise ValueError("Invalid email address format.")
-        return email.lower()
+        return clean_email(email)
 
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}')>"
+
+def clean_email(email: str) -> str:
+    """Validate and lower-case an email; shared with bulk INSERT paths that bypass @validates."""
+    if not email:
+        raise ValueError("Email cannot be empty.")
+    if not _EMAIL_RE.match(email):
+        raise ValueError("Invalid email address format.")
+    # Most addresses arrive lower-case already; skip building a copy
+    return email if email.islower() else email.lower()
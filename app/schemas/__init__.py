@@ -1,7 +1,33 @@
 # This file makes the 'schemas' directory a Python package.
+#
+# The re-exports below are resolved lazily (PEP 562), so importing one schema
+# module, e.g. app.schemas.irrigation, does not build every other model too.
 
-from .user import User, UserCreate, UserUpdate, UserPublic, UserWithGardens
-from .garden import Garden, GardenCreate, GardenUpdate, GardenWithPlants
-from .plant import Plant, PlantCreate, PlantUpdate
-from .token import Token, TokenData
-from .message import Message
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .user import User, UserCreate, UserUpdate, UserPublic, UserWithGardens
+    from .garden import Garden, GardenCreate, GardenUpdate, GardenWithPlants
+    from .plant import Plant, PlantCreate, PlantUpdate
+    from .token import Token, TokenData
+    from .message import Message
+
+_EXPORTS = {
+    "User": "user", "UserCreate": "user", "UserUpdate": "user", "UserPublic": "user", "UserWithGardens": "user",
+    "Garden": "garden", "GardenCreate": "garden", "GardenUpdate": "garden", "GardenWithPlants": "garden",
+    "Plant": "plant", "PlantCreate": "plant", "PlantUpdate": "plant",
+    "Token": "token", "TokenData": "token",
+    "Message": "message",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
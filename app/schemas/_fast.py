@@ -0,0 +1,102 @@
+"""
+msgspec mirrors of the bulk compute inputs. The hydraulic and cost endpoints
+receive hundreds of nested zones/pipes per request and only do arithmetic on
+them, so they decode straight into these Structs instead of building pydantic
+models. The pydantic classes in ``app.schemas.irrigation`` stay the documented
+contract; keep field names and types here in step with them.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import msgspec
+
+from app.schemas.irrigation import EquipmentType, PipeMaterial, ZoneStatus
+
+
+class HydraulicZoneFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``IrrigationZone``."""
+    id: UUID
+    garden_id: UUID
+    name: str
+    description: Optional[str] = None
+    status: ZoneStatus = ZoneStatus.ACTIVE
+    required_flow_lph: float
+    operating_pressure_bar: float
+    total_area_m2: float
+    cluster_center_x: float
+    cluster_center_y: float
+    plant_ids: List[int]
+    estimated_cost: Optional[float] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class HydraulicPipeFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``IrrigationPipe``."""
+    id: UUID
+    zone_id: UUID
+    pipe_name: str
+    pipe_type: str
+    material: PipeMaterial
+    diameter_mm: float
+    length_m: float
+    flow_rate_lph: float
+    velocity_ms: float
+    pressure_loss_bar: float
+    start_x: float
+    start_y: float
+    end_x: float
+    end_y: float
+    cost_per_meter: float
+    total_cost: float
+    created_at: datetime
+    updated_at: datetime
+
+
+class EquipmentFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``IrrigationEquipment``."""
+    id: UUID
+    name: str
+    equipment_type: EquipmentType
+    manufacturer: str
+    model: str
+    flow_rate_lph: float
+    pressure_range_min: float
+    pressure_range_max: float
+    coverage_radius_m: float
+    spacing_m: float
+    cost_per_unit: float
+    specifications: Optional[Dict[str, Any]] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class EquipmentSelectionFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``EquipmentSelectionResult``."""
+    recommended_equipment: EquipmentFast
+    quantity_needed: int
+    total_cost: float
+    coverage_efficiency: float
+    justification: str
+
+
+class HydraulicCalculationInputFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``HydraulicCalculationInput``."""
+    zones: List[HydraulicZoneFast]
+    source_pressure_bar: float
+    source_flow_lph: float
+    pipe_material: PipeMaterial
+    pipe_diameter_mm: float
+
+
+class CostEstimationInputFast(msgspec.Struct, kw_only=True):
+    """Mirror of ``CostEstimationInput``."""
+    zones: List[HydraulicZoneFast]
+    equipment_selections: List[EquipmentSelectionFast]
+    pipe_network: List[HydraulicPipeFast]
+    installation_complexity: str
+
+
+hydraulic_input_decoder = msgspec.json.Decoder(HydraulicCalculationInputFast)
+cost_input_decoder = msgspec.json.Decoder(CostEstimationInputFast)
@@ -0,0 +1,193 @@
+from enum import Enum
+from typing import Annotated, Any, ClassVar, Dict, FrozenSet, Optional, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, PlainSerializer, PlainValidator, WithJsonSchema, create_model
+from pydantic.fields import FieldInfo
+
+from app.core.config import settings
+
+
+def _enum_of(annotation: Any) -> Optional[Type[Enum]]:
+    """Return the Enum class behind ``annotation`` (also through ``Optional[...]``), if any."""
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    if get_origin(annotation) is Union:
+        for arg in get_args(annotation):
+            if isinstance(arg, type) and issubclass(arg, Enum):
+                return arg
+    return None
+
+
+def F(default: Any = ..., *, description: Optional[str] = None, **kwargs: Any) -> Any:
+    """``Field()`` whose description is dropped when ``SKIP_FIELD_DOCS`` is set."""
+    if settings.SKIP_FIELD_DOCS:
+        description = None
+    return Field(default, description=description, **kwargs)
+
+
+def _json_object(value: Any) -> Dict[str, Any]:
+    if isinstance(value, (str, bytes, bytearray)):
+        value = orjson.loads(value)
+    if not isinstance(value, dict):
+        raise ValueError("expected a JSON object")
+    return value
+
+
+# A free-form JSON object (JSONB blobs such as provider payloads or saved
+# calculations). Dict[str, Any] would rebuild the dict key by key on every
+# validation; this only checks that the value is an object and hands the same
+# dict to the serializer. Raw JSON text is accepted and parsed once.
+OpaqueJSON = Annotated[
+    Any,
+    PlainValidator(_json_object),
+    PlainSerializer(lambda value: value, return_type=Any),
+    WithJsonSchema({"type": "object", "additionalProperties": True}),
+]
+
+
+class FastBaseModel(BaseModel):
+    """
+    Base for the bulk of our schemas. Their validators are built on first use
+    instead of at import; ``rebuild_deferred_models`` finishes the rest in
+    one pass at startup.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
+def rebuild_deferred_models() -> int:
+    """
+    Complete every FastBaseModel subclass not built yet; returns how many were built.
+    Models whose forward references only resolve through their own accessor
+    (``get_user_with_gardens_schema``) are left for that accessor.
+    """
+    built = 0
+    pending = list(FastBaseModel.__subclasses__())
+    while pending:
+        cls = pending.pop()
+        pending.extend(cls.__subclasses__())
+        if cls.model_rebuild(raise_errors=False):
+            built += 1
+    return built
+
+
+_PARTIALS: Dict[Tuple[Type[BaseModel], FrozenSet[Tuple[str, int]]], Type[BaseModel]] = {}
+
+
+def optional_of(field: FieldInfo) -> Any:
+    """The optional (``None`` default) counterpart of a shared field, for Update schemas."""
+    return Field(None, description=field.description)
+
+
+def make_partial(base: Type[BaseModel], **extra_fields: Any) -> Type[BaseModel]:
+    """
+    Generate the Update schema for ``base``: every field becomes optional with a
+    ``None`` default. ``extra_fields`` adds update-only fields as ``name=annotation``.
+    ``FooBase`` yields ``FooUpdate``; results are cached per base.
+    """
+    # Keyed by identity: annotations such as OpaqueJSON carry unhashable metadata
+    key = (base, frozenset((name, id(annotation)) for name, annotation in extra_fields.items()))
+    partial = _PARTIALS.get(key)
+    if partial is None:
+        fields: Dict[str, Any] = {}
+        for name, field in base.model_fields.items():
+            # Constraints and validators stay on the inner type so that None skips them
+            annotation = Annotated[(field.annotation, *field.metadata)] if field.metadata else field.annotation
+            fields[name] = (Optional[annotation], optional_of(field))
+        fields.update((name, (Optional[annotation], None)) for name, annotation in extra_fields.items())
+        model_name = base.__name__.removesuffix("Base") + "Update"
+        partial = create_model(model_name, __base__=FastBaseModel, __module__=base.__module__, **fields)
+        partial.__doc__ = f"Schema for partial updates; every field of {base.__name__} is optional."
+        _PARTIALS[key] = partial
+    return partial
+
+
+class ORMResponse(FastBaseModel):
+    """
+    Base for response schemas built from ORM rows. Rows coming out of our own
+    database are already typed by their columns, so ``from_orm_fast`` copies the
+    attributes straight into the model without running validation again.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    # Per-class plan for from_orm_fast, worked out on first use (annotations
+    # may still be forward references when the class is created).
+    _orm_fields: ClassVar[FrozenSet[str]]
+    _orm_attrs: ClassVar[Dict[str, str]]
+    _orm_enums: ClassVar[Dict[str, Type[Enum]]]
+    _orm_nested: ClassVar[Dict[str, Tuple[Type["ORMResponse"], bool]]]
+
+    @classmethod
+    def _prepare_orm_plan(cls) -> None:
+        fields = cls.model_fields
+        cls._orm_attrs = {name: _attribute_name(name, field) for name, field in fields.items()}
+        cls._orm_enums = {
+            name: enum_cls for name, field in fields.items() if (enum_cls := _enum_of(field.annotation)) is not None
+        }
+        cls._orm_nested = {
+            name: nested for name, field in fields.items() if (nested := _nested_of(field.annotation)) is not None
+        }
+        cls._orm_fields = frozenset(fields)
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any):
+        """
+        Build the schema from a trusted ORM object via ``model_construct``.
+        Only use this for rows loaded from the database; client input still
+        goes through ``model_validate``.
+        """
+        if "_orm_fields" not in cls.__dict__:
+            cls._prepare_orm_plan()
+        data = {}
+        for name, attr in cls._orm_attrs.items():
+            value = getattr(obj, attr, _MISSING)
+            if value is _MISSING:
+                field = cls.model_fields[name]
+                if field.is_required():
+                    raise AttributeError(f"{type(obj).__name__} has no attribute {attr!r} for {cls.__name__}.{name}")
+                value = field.get_default(call_default_factory=True)
+            data[name] = value
+        for name, enum_cls in cls._orm_enums.items():
+            value = data[name]
+            # The models declare their own copies of the enums; map them by value.
+            if value is not None and type(value) is not enum_cls:
+                data[name] = enum_cls(value)
+        for name, (schema, many) in cls._orm_nested.items():
+            value = data[name]
+            if value is None:
+                continue
+            if many:
+                data[name] = [item if isinstance(item, schema) else schema.from_orm_fast(item) for item in value]
+            elif not isinstance(value, schema):
+                data[name] = schema.from_orm_fast(value)
+        return cls.model_construct(_fields_set=cls._orm_fields, **data)
+
+
+_MISSING = object()
+
+
+def _attribute_name(name: str, field: FieldInfo) -> str:
+    """The ORM attribute a field reads: its validation alias if it has one."""
+    alias = field.validation_alias
+    if isinstance(alias, str):
+        return alias
+    if isinstance(alias, AliasChoices):
+        return next((choice for choice in alias.choices if isinstance(choice, str)), name)
+    return name
+
+
+def _nested_of(annotation: Any) -> Optional[Tuple[Type[ORMResponse], bool]]:
+    """``(schema, is_list)`` when the field holds ORMResponse model(s), also through ``Optional``."""
+    origin = get_origin(annotation)
+    if origin is Union:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _nested_of(args[0]) if len(args) == 1 else None
+    if origin is list:
+        args = get_args(annotation)
+        item = _nested_of(args[0]) if args else None
+        return (item[0], True) if item is not None and not item[1] else None
+    if isinstance(annotation, type) and issubclass(annotation, ORMResponse):
+        return annotation, False
+    return None
@@ -3,6 +3,8 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
+from app.schemas.base import ORMResponse
+
 # --- Base ---
 class GardenBase(BaseModel):
     name: str
@@ -17,15 +19,12 @@ class GardenUpdate(GardenBase):
     name: Optional[str] = None # All fields optional for update
 
 # --- InDB ---
-class GardenInDBBase(GardenBase):
+class GardenInDBBase(GardenBase, ORMResponse):
     id: uuid.UUID
     owner_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # --- Public ---
 class Garden(GardenInDBBase):
     pass
@@ -1,14 +1,17 @@
 from datetime import datetime, time
 from decimal import Decimal
-from enum import Enum
-from typing import Dict, Any, List, Optional, Union
+from enum import StrEnum
+from typing import Annotated, Dict, Any, List, Optional, Union
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+import numpy as np
+from pydantic import ConfigDict, PlainSerializer, model_validator, PlainValidator, WithJsonSchema
+
+from app.schemas.base import F, FastBaseModel, OpaqueJSON, ORMResponse, make_partial
 
 
 # Enums
-class EquipmentType(str, Enum):
+class EquipmentType(StrEnum):
     """Types of irrigation equipment."""
     DRIP = "drip"
     SPRINKLER = "sprinkler"
@@ -17,7 +20,7 @@ class EquipmentType(str, Enum):
     SPRAY = "spray"
 
 
-class PipeMaterial(str, Enum):
+class PipeMaterial(StrEnum):
     """Types of pipe materials."""
     PVC = "pvc"
     PE = "pe"
@@ -25,14 +28,14 @@ class PipeMaterial(str, Enum):
     COPPER = "copper"
 
 
-class ZoneStatus(str, Enum):
+class ZoneStatus(StrEnum):
     """Status of irrigation zones."""
     ACTIVE = "active"
     INACTIVE = "inactive"
     MAINTENANCE = "maintenance"
 
 
-class ScheduleType(str, Enum):
+class ScheduleType(StrEnum):
     """Types of irrigation schedules."""
     DAILY = "daily"
     WEEKLY = "weekly"
@@ -40,7 +43,7 @@ class ScheduleType(str, Enum):
     MANUAL = "manual"
 
 
-class WaterSourceType(str, Enum):
+class WaterSourceType(StrEnum):
     """Types of water sources."""
     TAP = "tap"
     WELL = "well"
@@ -48,100 +51,162 @@ class WaterSourceType(str, Enum):
     STREAM = "stream"
 
 
+_INT32 = np.iinfo(np.int32)
+
+
+def _to_int_array(value: Any) -> np.ndarray:
+    # Convert without a dtype first: casting straight to int32 would truncate
+    # floats, accept bools and raise OverflowError for out-of-range values
+    try:
+        array = np.asarray(value)
+    except (OverflowError, TypeError) as exc:
+        raise ValueError("expected a flat list of integers") from exc
+    if array.ndim != 1 or (array.size and array.dtype.kind not in "iuf"):
+        raise ValueError("expected a flat list of integers")
+    if array.dtype.kind == "f" and not np.all(np.isfinite(array) & (array == np.trunc(array))):
+        raise ValueError("ids must be whole numbers")
+    if array.size and (array.min() < _INT32.min or array.max() > _INT32.max):
+        raise ValueError(f"ids must be between {_INT32.min} and {_INT32.max}")
+    return array.astype(np.int32, copy=False)
+
+
+def _int_array_to_list(value: Any) -> List[int]:
+    # Rows built with from_orm_fast keep the list the database returned
+    return value.tolist() if isinstance(value, np.ndarray) else list(value)
+
+
+# A list of ids held as one int32 array: validated by a single np.asarray call
+# and cheap to intersect/group in the clustering and hydraulic code.
+NPIntArray = Annotated[
+    np.ndarray,
+    PlainValidator(_to_int_array),
+    PlainSerializer(_int_array_to_list),
+    WithJsonSchema({"type": "array", "items": {"type": "integer"}}),
+]
+
+
+def _to_point_array(value: Any) -> np.ndarray:
+    return np.asarray(value, dtype=np.float32).reshape(-1, 2)
+
+
+# (N, 2) float32 x/y coordinates, the layout the clustering code works on.
+NPPointArray = Annotated[
+    np.ndarray,
+    PlainValidator(_to_point_array),
+    PlainSerializer(lambda value: np.asarray(value).tolist()),
+    WithJsonSchema({
+        "type": "array",
+        "items": {"type": "array", "items": {"type": "number"}, "minItems": 2, "maxItems": 2},
+    }),
+]
+
+
+# Shared field descriptors, reused by every schema that declares the field
+GARDEN_ID = F(..., description="Garden ID")
+ZONE_ID = F(..., description="Zone ID")
+FLOW_RATE_LPH = F(..., description="Flow rate in liters per hour")
+PIPE_MATERIAL = F(..., description="Pipe material")
+PIPE_DIAMETER_MM = F(..., description="Pipe diameter in millimeters")
+FLOW_VELOCITY_MS = F(..., description="Flow velocity in meters per second")
+TOTAL_COST = F(..., description="Total cost in USD")
+SOURCE_PRESSURE_BAR = F(..., description="Source pressure in bar")
+SOURCE_FLOW_LPH = F(..., description="Source flow rate in liters per hour")
+
+
 # Base schemas
-class IrrigationEquipmentBase(BaseModel):
+class IrrigationEquipmentBase(FastBaseModel):
     """Base schema for irrigation equipment."""
-    name: str = Field(..., description="Equipment name")
-    equipment_type: EquipmentType = Field(..., description="Type of equipment")
-    manufacturer: str = Field(..., description="Manufacturer name")
-    model: str = Field(..., description="Model number")
-    flow_rate_lph: float = Field(..., description="Flow rate in liters per hour")
-    pressure_range_min: float = Field(..., description="Minimum operating pressure in bar")
-    pressure_range_max: float = Field(..., description="Maximum operating pressure in bar")
-    coverage_radius_m: float = Field(..., description="Coverage radius in meters")
-    spacing_m: float = Field(..., description="Recommended spacing in meters")
-    cost_per_unit: float = Field(..., description="Cost per unit in USD")
-    specifications: Optional[Dict[str, Any]] = Field(None, description="Additional specifications")
-
-
-class IrrigationZoneBase(BaseModel):
+    name: str = F(..., description="Equipment name")
+    equipment_type: EquipmentType = F(..., description="Type of equipment")
+    manufacturer: str = F(..., description="Manufacturer name")
+    model: str = F(..., description="Model number")
+    flow_rate_lph: float = FLOW_RATE_LPH
+    pressure_range_min: float = F(..., description="Minimum operating pressure in bar")
+    pressure_range_max: float = F(..., description="Maximum operating pressure in bar")
+    coverage_radius_m: float = F(..., description="Coverage radius in meters")
+    spacing_m: float = F(..., description="Recommended spacing in meters")
+    cost_per_unit: float = F(..., description="Cost per unit in USD")
+    specifications: Optional[OpaqueJSON] = F(None, description="Additional specifications")
+
+
+class IrrigationZoneBase(FastBaseModel):
     """Base schema for irrigation zones."""
-    name: str = Field(..., description="Zone name")
-    description: Optional[str] = Field(None, description="Zone description")
-    status: ZoneStatus = Field(default=ZoneStatus.ACTIVE, description="Zone status")
-    required_flow_lph: float = Field(..., description="Required flow rate in liters per hour")
-    operating_pressure_bar: float = Field(..., description="Operating pressure in bar")
-    total_area_m2: float = Field(..., description="Total area in square meters")
-    cluster_center_x: float = Field(..., description="Cluster center X coordinate")
-    cluster_center_y: float = Field(..., description="Cluster center Y coordinate")
-    plant_ids: List[int] = Field(..., description="List of plant IDs in this zone")
-    estimated_cost: Optional[float] = Field(None, description="Estimated cost in USD")
-
-
-class IrrigationPipeBase(BaseModel):
+    name: str = F(..., description="Zone name")
+    description: Optional[str] = F(None, description="Zone description")
+    status: ZoneStatus = F(default=ZoneStatus.ACTIVE, description="Zone status")
+    required_flow_lph: float = F(..., description="Required flow rate in liters per hour")
+    operating_pressure_bar: float = F(..., description="Operating pressure in bar")
+    total_area_m2: float = F(..., description="Total area in square meters")
+    cluster_center_x: float = F(..., description="Cluster center X coordinate")
+    cluster_center_y: float = F(..., description="Cluster center Y coordinate")
+    plant_ids: NPIntArray = F(..., description="List of plant IDs in this zone")
+    estimated_cost: Optional[float] = F(None, description="Estimated cost in USD")
+
+
+class IrrigationPipeBase(FastBaseModel):
     """Base schema for irrigation pipes."""
-    pipe_name: str = Field(..., description="Pipe name")
-    pipe_type: str = Field(..., description="Type of pipe (main, lateral, sub-lateral)")
-    material: PipeMaterial = Field(..., description="Pipe material")
-    diameter_mm: float = Field(..., description="Pipe diameter in millimeters")
-    length_m: float = Field(..., description="Pipe length in meters")
-    flow_rate_lph: float = Field(..., description="Flow rate in liters per hour")
-    velocity_ms: float = Field(..., description="Flow velocity in meters per second")
-    pressure_loss_bar: float = Field(..., description="Pressure loss in bar")
-    start_x: float = Field(..., description="Start X coordinate")
-    start_y: float = Field(..., description="Start Y coordinate")
-    end_x: float = Field(..., description="End X coordinate")
-    end_y: float = Field(..., description="End Y coordinate")
-    cost_per_meter: float = Field(..., description="Cost per meter in USD")
-    total_cost: float = Field(..., description="Total cost in USD")
-
-
-class IrrigationScheduleBase(BaseModel):
+    pipe_name: str = F(..., description="Pipe name")
+    pipe_type: str = F(..., description="Type of pipe (main, lateral, sub-lateral)")
+    material: PipeMaterial = PIPE_MATERIAL
+    diameter_mm: float = PIPE_DIAMETER_MM
+    length_m: float = F(..., description="Pipe length in meters")
+    flow_rate_lph: float = FLOW_RATE_LPH
+    velocity_ms: float = FLOW_VELOCITY_MS
+    pressure_loss_bar: float = F(..., description="Pressure loss in bar")
+    start_x: float = F(..., description="Start X coordinate")
+    start_y: float = F(..., description="Start Y coordinate")
+    end_x: float = F(..., description="End X coordinate")
+    end_y: float = F(..., description="End Y coordinate")
+    cost_per_meter: float = F(..., description="Cost per meter in USD")
+    total_cost: float = TOTAL_COST
+
+
+class IrrigationScheduleBase(FastBaseModel):
     """Base schema for irrigation schedules."""
-    name: str = Field(..., description="Schedule name")
-    schedule_type: ScheduleType = Field(..., description="Type of schedule")
-    start_time: time = Field(..., description="Start time")
-    duration_minutes: int = Field(..., description="Duration in minutes")
-    days_of_week: Optional[List[int]] = Field(None, description="Days of week (0=Monday, 6=Sunday)")
-    interval_days: Optional[int] = Field(None, description="Interval in days")
-    min_temperature_c: Optional[float] = Field(None, description="Minimum temperature in Celsius")
-    max_temperature_c: Optional[float] = Field(None, description="Maximum temperature in Celsius")
-    min_humidity_percent: Optional[float] = Field(None, description="Minimum humidity percentage")
-    max_humidity_percent: Optional[float] = Field(None, description="Maximum humidity percentage")
-    min_rainfall_mm: Optional[float] = Field(None, description="Minimum rainfall in millimeters")
-    is_active: bool = Field(default=True, description="Whether schedule is active")
-    priority: int = Field(default=1, description="Schedule priority")
-
-
-class WeatherDataBase(BaseModel):
+    name: str = F(..., description="Schedule name")
+    schedule_type: ScheduleType = F(..., description="Type of schedule")
+    start_time: time = F(..., description="Start time")
+    duration_minutes: int = F(..., description="Duration in minutes")
+    days_of_week: Optional[List[int]] = F(None, description="Days of week (0=Monday, 6=Sunday)")
+    interval_days: Optional[int] = F(None, description="Interval in days")
+    min_temperature_c: Optional[float] = F(None, description="Minimum temperature in Celsius")
+    max_temperature_c: Optional[float] = F(None, description="Maximum temperature in Celsius")
+    min_humidity_percent: Optional[float] = F(None, description="Minimum humidity percentage")
+    max_humidity_percent: Optional[float] = F(None, description="Maximum humidity percentage")
+    min_rainfall_mm: Optional[float] = F(None, description="Minimum rainfall in millimeters")
+    is_active: bool = F(default=True, description="Whether schedule is active")
+    priority: int = F(default=1, description="Schedule priority")
+
+
+class WeatherDataBase(FastBaseModel):
     """Base schema for weather data."""
-    date: datetime = Field(..., description="Weather data date")
-    temperature_c: float = Field(..., description="Temperature in Celsius")
-    humidity_percent: float = Field(..., description="Humidity percentage")
-    rainfall_mm: float = Field(..., description="Rainfall in millimeters")
-    wind_speed_kmh: float = Field(..., description="Wind speed in kilometers per hour")
-    solar_radiation_mj_m2: float = Field(..., description="Solar radiation in MJ/m²")
-    evapotranspiration_mm: float = Field(..., description="Evapotranspiration in millimeters")
-    irrigation_need_mm: float = Field(..., description="Irrigation need in millimeters")
-    source: str = Field(..., description="Weather data source")
-    raw_data: Optional[Dict[str, Any]] = Field(None, description="Raw weather data")
-
-
-class IrrigationProjectBase(BaseModel):
+    date: datetime = F(..., description="Weather data date")
+    temperature_c: float = F(..., description="Temperature in Celsius")
+    humidity_percent: float = F(..., description="Humidity percentage")
+    rainfall_mm: float = F(..., description="Rainfall in millimeters")
+    wind_speed_kmh: float = F(..., description="Wind speed in kilometers per hour")
+    solar_radiation_mj_m2: float = F(..., description="Solar radiation in MJ/m²")
+    evapotranspiration_mm: float = F(..., description="Evapotranspiration in millimeters")
+    irrigation_need_mm: float = F(..., description="Irrigation need in millimeters")
+    source: str = F(..., description="Weather data source")
+    raw_data: Optional[OpaqueJSON] = F(None, description="Raw weather data")
+
+
+class IrrigationProjectBase(FastBaseModel):
     """Base schema for irrigation projects."""
-    name: str = Field(..., description="Project name")
-    description: Optional[str] = Field(None, description="Project description")
-    water_source_type: WaterSourceType = Field(..., description="Type of water source")
-    source_pressure_bar: float = Field(..., description="Source pressure in bar")
-    source_flow_lph: float = Field(..., description="Source flow rate in liters per hour")
-    total_equipment_cost: Optional[float] = Field(None, description="Total equipment cost in USD")
-    total_pipe_cost: Optional[float] = Field(None, description="Total pipe cost in USD")
-    total_installation_cost: Optional[float] = Field(None, description="Total installation cost in USD")
-    total_project_cost: Optional[float] = Field(None, description="Total project cost in USD")
-    hydraulic_calculations: Optional[Dict[str, Any]] = Field(None, description="Hydraulic calculations data")
-    network_layout: Optional[Dict[str, Any]] = Field(None, description="Network layout data")
-    equipment_selection: Optional[Dict[str, Any]] = Field(None, description="Equipment selection data")
-    is_active: bool = Field(default=True, description="Whether project is active")
+    name: str = F(..., description="Project name")
+    description: Optional[str] = F(None, description="Project description")
+    water_source_type: WaterSourceType = F(..., description="Type of water source")
+    source_pressure_bar: float = SOURCE_PRESSURE_BAR
+    source_flow_lph: float = SOURCE_FLOW_LPH
+    total_equipment_cost: Optional[float] = F(None, description="Total equipment cost in USD")
+    total_pipe_cost: Optional[float] = F(None, description="Total pipe cost in USD")
+    total_installation_cost: Optional[float] = F(None, description="Total installation cost in USD")
+    total_project_cost: Optional[float] = F(None, description="Total project cost in USD")
+    hydraulic_calculations: Optional[OpaqueJSON] = F(None, description="Hydraulic calculations data")
+    network_layout: Optional[OpaqueJSON] = F(None, description="Network layout data")
+    equipment_selection: Optional[OpaqueJSON] = F(None, description="Equipment selection data")
+    is_active: bool = F(default=True, description="Whether project is active")
 
 
 # Create schemas
@@ -152,293 +217,242 @@ class IrrigationEquipmentCreate(IrrigationEquipmentBase):
 
 class IrrigationZoneCreate(IrrigationZoneBase):
     """Schema for creating irrigation zones."""
-    garden_id: UUID = Field(..., description="Garden ID")
+    garden_id: UUID = GARDEN_ID
 
 
 class IrrigationPipeCreate(IrrigationPipeBase):
     """Schema for creating irrigation pipes."""
-    zone_id: UUID = Field(..., description="Zone ID")
+    zone_id: UUID = ZONE_ID
 
 
 class IrrigationScheduleCreate(IrrigationScheduleBase):
     """Schema for creating irrigation schedules."""
-    zone_id: UUID = Field(..., description="Zone ID")
+    zone_id: UUID = ZONE_ID
 
 
 class WeatherDataCreate(WeatherDataBase):
     """Schema for creating weather data."""
-    garden_id: UUID = Field(..., description="Garden ID")
+    garden_id: UUID = GARDEN_ID
 
 
 class IrrigationProjectCreate(IrrigationProjectBase):
     """Schema for creating irrigation projects."""
-    garden_id: UUID = Field(..., description="Garden ID")
+    garden_id: UUID = GARDEN_ID
 
 
 # Update schemas
-class IrrigationEquipmentUpdate(BaseModel):
-    """Schema for updating irrigation equipment."""
-    name: Optional[str] = None
-    equipment_type: Optional[EquipmentType] = None
-    manufacturer: Optional[str] = None
-    model: Optional[str] = None
-    flow_rate_lph: Optional[float] = None
-    pressure_range_min: Optional[float] = None
-    pressure_range_max: Optional[float] = None
-    coverage_radius_m: Optional[float] = None
-    spacing_m: Optional[float] = None
-    cost_per_unit: Optional[float] = None
-    specifications: Optional[Dict[str, Any]] = None
-    is_active: Optional[bool] = None
-
-
-class IrrigationZoneUpdate(BaseModel):
-    """Schema for updating irrigation zones."""
-    name: Optional[str] = None
-    description: Optional[str] = None
-    status: Optional[ZoneStatus] = None
-    required_flow_lph: Optional[float] = None
-    operating_pressure_bar: Optional[float] = None
-    total_area_m2: Optional[float] = None
-    cluster_center_x: Optional[float] = None
-    cluster_center_y: Optional[float] = None
-    plant_ids: Optional[List[int]] = None
-    estimated_cost: Optional[float] = None
-
-
-class IrrigationPipeUpdate(BaseModel):
-    """Schema for updating irrigation pipes."""
-    pipe_name: Optional[str] = None
-    pipe_type: Optional[str] = None
-    material: Optional[PipeMaterial] = None
-    diameter_mm: Optional[float] = None
-    length_m: Optional[float] = None
-    flow_rate_lph: Optional[float] = None
-    velocity_ms: Optional[float] = None
-    pressure_loss_bar: Optional[float] = None
-    start_x: Optional[float] = None
-    start_y: Optional[float] = None
-    end_x: Optional[float] = None
-    end_y: Optional[float] = None
-    cost_per_meter: Optional[float] = None
-    total_cost: Optional[float] = None
-
-
-class IrrigationScheduleUpdate(BaseModel):
-    """Schema for updating irrigation schedules."""
-    name: Optional[str] = None
-    schedule_type: Optional[ScheduleType] = None
-    start_time: Optional[time] = None
-    duration_minutes: Optional[int] = None
-    days_of_week: Optional[List[int]] = None
-    interval_days: Optional[int] = None
-    min_temperature_c: Optional[float] = None
-    max_temperature_c: Optional[float] = None
-    min_humidity_percent: Optional[float] = None
-    max_humidity_percent: Optional[float] = None
-    min_rainfall_mm: Optional[float] = None
-    is_active: Optional[bool] = None
-    priority: Optional[int] = None
-
-
-class IrrigationProjectUpdate(BaseModel):
-    """Schema for updating irrigation projects."""
-    name: Optional[str] = None
-    description: Optional[str] = None
-    water_source_type: Optional[WaterSourceType] = None
-    source_pressure_bar: Optional[float] = None
-    source_flow_lph: Optional[float] = None
-    total_equipment_cost: Optional[float] = None
-    total_pipe_cost: Optional[float] = None
-    total_installation_cost: Optional[float] = None
-    total_project_cost: Optional[float] = None
-    hydraulic_calculations: Optional[Dict[str, Any]] = None
-    network_layout: Optional[Dict[str, Any]] = None
-    equipment_selection: Optional[Dict[str, Any]] = None
-    is_active: Optional[bool] = None
+IrrigationEquipmentUpdate = make_partial(IrrigationEquipmentBase, is_active=bool)
+IrrigationZoneUpdate = make_partial(IrrigationZoneBase)
+IrrigationPipeUpdate = make_partial(IrrigationPipeBase)
+IrrigationScheduleUpdate = make_partial(IrrigationScheduleBase)
+IrrigationProjectUpdate = make_partial(IrrigationProjectBase)
 
 
 # Response schemas
-class IrrigationEquipment(IrrigationEquipmentBase):
+class IrrigationEquipment(IrrigationEquipmentBase, ORMResponse):
     """Schema for returning irrigation equipment."""
     id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 
-class IrrigationZone(IrrigationZoneBase):
+class IrrigationZone(IrrigationZoneBase, ORMResponse):
     """Schema for returning irrigation zones."""
     id: UUID
     garden_id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 
-class IrrigationPipe(IrrigationPipeBase):
+class IrrigationPipe(IrrigationPipeBase, ORMResponse):
     """Schema for returning irrigation pipes."""
     id: UUID
     zone_id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
+
+    @classmethod
+    def to_arrays(cls, pipes: List["IrrigationPipe"]) -> Dict[str, np.ndarray]:
+        """The numeric columns the hydraulic calculations need, one array per field."""
+        count = len(pipes)
+        return {
+            field: np.fromiter((getattr(pipe, field) for pipe in pipes), dtype=np.float64, count=count)
+            for field in ("diameter_mm", "length_m", "flow_rate_lph")
+        }
 
 
-class IrrigationSchedule(IrrigationScheduleBase):
+class IrrigationSchedule(IrrigationScheduleBase, ORMResponse):
     """Schema for returning irrigation schedules."""
     id: UUID
     zone_id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 
-class WeatherData(WeatherDataBase):
+class WeatherData(WeatherDataBase, ORMResponse):
     """Schema for returning weather data."""
     id: UUID
     garden_id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 
-class IrrigationProject(IrrigationProjectBase):
+class IrrigationProject(IrrigationProjectBase, ORMResponse):
     """Schema for returning irrigation projects."""
     id: UUID
     garden_id: UUID
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 
 # Specialized schemas for hydraulic calculations
-class HydraulicCalculationInput(BaseModel):
+class HydraulicCalculationInput(FastBaseModel):
     """Input for hydraulic calculations."""
     zones: List[IrrigationZone]
-    source_pressure_bar: float = Field(..., description="Source pressure in bar")
-    source_flow_lph: float = Field(..., description="Source flow rate in liters per hour")
-    pipe_material: PipeMaterial = Field(..., description="Pipe material")
-    pipe_diameter_mm: float = Field(..., description="Pipe diameter in millimeters")
+    source_pressure_bar: float = SOURCE_PRESSURE_BAR
+    source_flow_lph: float = SOURCE_FLOW_LPH
+    pipe_material: PipeMaterial = PIPE_MATERIAL
+    pipe_diameter_mm: float = PIPE_DIAMETER_MM
 
 
-class HydraulicCalculationResult(BaseModel):
+class HydraulicCalculationResult(FastBaseModel):
     """Result of hydraulic calculations."""
-    total_flow_lph: float = Field(..., description="Total flow rate in liters per hour")
-    total_pressure_loss_bar: float = Field(..., description="Total pressure loss in bar")
-    final_pressure_bar: float = Field(..., description="Final pressure in bar")
-    velocity_ms: float = Field(..., description="Flow velocity in meters per second")
-    reynolds_number: float = Field(..., description="Reynolds number")
-    friction_factor: float = Field(..., description="Friction factor")
-    warnings: List[str] = Field(default_factory=list, description="Calculation warnings")
-    is_system_viable: bool = Field(..., description="Whether the system is viable")
+    total_flow_lph: float = F(..., description="Total flow rate in liters per hour")
+    total_pressure_loss_bar: float = F(..., description="Total pressure loss in bar")
+    final_pressure_bar: float = F(..., description="Final pressure in bar")
+    velocity_ms: float = FLOW_VELOCITY_MS
+    reynolds_number: float = F(..., description="Reynolds number")
+    friction_factor: float = F(..., description="Friction factor")
+    warnings: List[str] = F(default_factory=list, description="Calculation warnings")
+    is_system_viable: bool = F(..., description="Whether the system is viable")
 
 
-class EquipmentSelectionInput(BaseModel):
+class EquipmentSelectionInput(FastBaseModel):
     """Input for equipment selection."""
-    zone_area_m2: float = Field(..., description="Zone area in square meters")
-    water_needs: str = Field(..., description="Water needs (low, moderate, high)")
-    budget_constraint: Optional[float] = Field(None, description="Budget constraint in USD")
-    preferred_equipment_type: Optional[EquipmentType] = Field(None, description="Preferred equipment type")
+    zone_area_m2: float = F(..., description="Zone area in square meters")
+    water_needs: str = F(..., description="Water needs (low, moderate, high)")
+    budget_constraint: Optional[float] = F(None, description="Budget constraint in USD")
+    preferred_equipment_type: Optional[EquipmentType] = F(None, description="Preferred equipment type")
 
 
-class EquipmentSelectionResult(BaseModel):
+class EquipmentSelectionResult(FastBaseModel):
     """Result of equipment selection."""
     recommended_equipment: IrrigationEquipment
-    quantity_needed: int = Field(..., description="Quantity of equipment needed")
-    total_cost: float = Field(..., description="Total cost in USD")
-    coverage_efficiency: float = Field(..., description="Coverage efficiency percentage")
-    justification: str = Field(..., description="Selection justification")
+    quantity_needed: int = F(..., description="Quantity of equipment needed")
+    total_cost: float = TOTAL_COST
+    coverage_efficiency: float = F(..., description="Coverage efficiency percentage")
+    justification: str = F(..., description="Selection justification")
 
 
-class ClusteringInput(BaseModel):
+class ClusteringInput(FastBaseModel):
     """Input for plant clustering."""
-    plants: List[Dict[str, Any]] = Field(..., description="List of plants with coordinates and water needs")
-    max_zones: int = Field(..., description="Maximum number of zones")
-    min_plants_per_zone: int = Field(default=1, description="Minimum plants per zone")
+    plants: List[Dict[str, Any]] = F(..., description="List of plants with coordinates and water needs")
+    max_zones: int = F(..., description="Maximum number of zones")
+    min_plants_per_zone: int = F(default=1, description="Minimum plants per zone")
 
 
-class ClusteringResult(BaseModel):
+class ClusteringResult(FastBaseModel):
     """Result of plant clustering."""
     zones: List[IrrigationZone]
-    cluster_centers: List[Dict[str, float]] = Field(..., description="Cluster center coordinates")
-    total_cost: float = Field(..., description="Total estimated cost")
-    efficiency_score: float = Field(..., description="Clustering efficiency score")
+    cluster_centers: List[Dict[str, float]] = F(..., description="Cluster center coordinates")
+    total_cost: float = F(..., description="Total estimated cost")
+    efficiency_score: float = F(..., description="Clustering efficiency score")
 
 
-class WeatherForecastInput(BaseModel):
+class WeatherForecastInput(FastBaseModel):
     """Input for weather forecast integration."""
-    garden_id: UUID = Field(..., description="Garden ID")
-    days_ahead: int = Field(default=7, description="Number of days to forecast")
-    location: Optional[str] = Field(None, description="Location for weather data")
+    garden_id: UUID = GARDEN_ID
+    days_ahead: int = F(default=7, description="Number of days to forecast")
+    location: Optional[str] = F(None, description="Location for weather data")
 
 
-class WeatherForecastResult(BaseModel):
+class WeatherForecastResult(FastBaseModel):
     """Result of weather forecast."""
-    forecast_data: List[WeatherData] = Field(..., description="Weather forecast data")
-    irrigation_recommendations: List[Dict[str, Any]] = Field(..., description="Irrigation recommendations")
-    water_savings_potential: float = Field(..., description="Potential water savings in liters")
+    forecast_data: List[WeatherData] = F(..., description="Weather forecast data")
+    irrigation_recommendations: List[Dict[str, Any]] = F(..., description="Irrigation recommendations")
+    water_savings_potential: float = F(..., description="Potential water savings in liters")
 
 
-class CostEstimationInput(BaseModel):
+class CostEstimationInput(FastBaseModel):
     """Input for cost estimation."""
     zones: List[IrrigationZone]
     equipment_selections: List[EquipmentSelectionResult]
     pipe_network: List[IrrigationPipe]
-    installation_complexity: str = Field(..., description="Installation complexity (simple, moderate, complex)")
+    installation_complexity: str = F(..., description="Installation complexity (simple, moderate, complex)")
 
 
-class CostEstimationResult(BaseModel):
+class CostEstimationResult(FastBaseModel):
     """Result of cost estimation."""
-    equipment_cost: float = Field(..., description="Equipment cost in USD")
-    pipe_cost: float = Field(..., description="Pipe cost in USD")
-    installation_cost: float = Field(..., description="Installation cost in USD")
-    total_cost: float = Field(..., description="Total cost in USD")
-    cost_breakdown: Dict[str, float] = Field(..., description="Detailed cost breakdown")
-    roi_estimate: float = Field(..., description="Return on investment estimate")
+    equipment_cost: float = F(..., description="Equipment cost in USD")
+    pipe_cost: float = F(..., description="Pipe cost in USD")
+    installation_cost: float = F(..., description="Installation cost in USD")
+    total_cost: float = TOTAL_COST
+    cost_breakdown: Dict[str, float] = F(..., description="Detailed cost breakdown")
+    roi_estimate: float = F(..., description="Return on investment estimate")
 
 
 # Legacy schemas for backward compatibility
-class PlantLocation(BaseModel):
+class PlantLocation(FastBaseModel):
     """Represents a plant and its location, used for irrigation planning."""
     plant_id: int
-    water_needs: str = Field(json_schema_extra={"example": "Moderate"})  # Low, Moderate, High
+    water_needs: str = F(json_schema_extra={"example": "Moderate"})  # Low, Moderate, High
     x: float
     y: float
 
+    model_config = ConfigDict(frozen=True)
+
 
-class ZoneInput(BaseModel):
+class ZoneInputFast(FastBaseModel):
+    """Column-wise (structure of arrays) form of ZoneInput."""
+    plant_ids: NPIntArray
+    xy: NPPointArray
+    water_needs: List[str]
+
+    @model_validator(mode="after")
+    def _check_lengths(self) -> "ZoneInputFast":
+        if not len(self.plant_ids) == len(self.xy) == len(self.water_needs):
+            raise ValueError("plant_ids, xy and water_needs must have the same length")
+        return self
+
+
+class ZoneInput(FastBaseModel):
     """Input for calculating watering zones."""
     plants: List[PlantLocation]
 
+    def to_soa(self) -> ZoneInputFast:
+        """Copy the plants into contiguous id/coordinate arrays in one pass."""
+        count = len(self.plants)
+        plant_ids = np.fromiter((plant.plant_id for plant in self.plants), dtype=np.int32, count=count)
+        xy = np.fromiter(
+            (coord for plant in self.plants for coord in (plant.x, plant.y)), dtype=np.float32, count=2 * count
+        ).reshape(-1, 2)
+        water_needs = [plant.water_needs for plant in self.plants]
+        return ZoneInputFast.model_construct(plant_ids=plant_ids, xy=xy, water_needs=water_needs)
 
-class WateringZone(BaseModel):
+
+class WateringZone(FastBaseModel):
     """Represents a single watering zone with a list of plant IDs."""
     zone_id: int
     water_needs: str
-    plant_ids: List[int]
+    plant_ids: NPIntArray
+
+    model_config = ConfigDict(frozen=True)
 
 
-class ZoneOutput(BaseModel):
+class ZoneOutput(FastBaseModel):
     """Output of the watering zone calculation."""
     zones: List[WateringZone]
 
 
-class FlowInput(BaseModel):
+class FlowInput(FastBaseModel):
     """Input for calculating flow and pressure."""
     zones: List[WateringZone]
-    pipe_diameter_mm: float = Field(json_schema_extra={"example": 16.0})
-    source_pressure_bar: float = Field(json_schema_extra={"example": 2.5})
+    pipe_diameter_mm: float = F(json_schema_extra={"example": 16.0})
+    source_pressure_bar: float = F(json_schema_extra={"example": 2.5})
 
 
-class FlowOutput(BaseModel):
+class FlowOutput(FastBaseModel):
     """Output of the flow and pressure calculation."""
-    required_flow_lph: float = Field(json_schema_extra={"example": 450.5})  # Liters per hour
-    pressure_at_end_bar: float = Field(json_schema_extra={"example": 1.8})
+    required_flow_lph: float = F(json_schema_extra={"example": 450.5})  # Liters per hour
+    pressure_at_end_bar: float = F(json_schema_extra={"example": 1.8})
     warnings: List[str] = []
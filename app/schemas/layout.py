@@ -1,6 +1,10 @@
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Dict
 
+# Packed record layout the layout optimizer iterates over
+POSITION_DTYPE = np.dtype([("plant_id", "i4"), ("x", "f8"), ("y", "f8")])
+
 class PlantPosition(BaseModel):
     """
     Represents a single plant's position in the garden layout.
@@ -9,6 +13,8 @@ class PlantPosition(BaseModel):
     x: float = Field(json_schema_extra={"example": 10.5})
     y: float = Field(json_schema_extra={"example": 20.0})
 
+    model_config = ConfigDict(frozen=True)
+
 class LayoutInput(BaseModel):
     """
     Input schema for the layout optimizer.
@@ -17,6 +23,13 @@ class LayoutInput(BaseModel):
     garden_length: float = Field(json_schema_extra={"example": 200.0})
     plants: List[PlantPosition]
 
+    def to_positions(self) -> np.ndarray:
+        """The plants as one contiguous POSITION_DTYPE record array."""
+        return np.fromiter(
+            ((plant.plant_id, plant.x, plant.y) for plant in self.plants),
+            dtype=POSITION_DTYPE, count=len(self.plants)
+        )
+
 class LayoutOutput(BaseModel):
     """
     Output schema from the layout optimizer.
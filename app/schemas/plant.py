@@ -3,6 +3,8 @@ import uuid
 from datetime import datetime, date
 from typing import Optional
 
+from app.schemas.base import ORMResponse, make_partial
+
 # Base schema with fields common to create and update
 class PlantBase(BaseModel):
     name: str = Field(..., min_length=1, max_length=100, description="Name of the plant")
@@ -15,22 +17,15 @@ class PlantCreate(PlantBase):
     garden_id: uuid.UUID = Field(..., description="The ID of the garden this plant belongs to")
 
 # Schema for updating a plant (all fields are optional)
-class PlantUpdate(BaseModel):
-    name: Optional[str] = Field(None, min_length=1, max_length=100)
-    species: Optional[str] = Field(None, max_length=100)
-    planting_date: Optional[date] = None
-    notes: Optional[str] = Field(None, max_length=500)
+PlantUpdate = make_partial(PlantBase)
 
 # Base schema for data returned from the DB, includes all model fields
-class PlantInDBBase(PlantBase):
+class PlantInDBBase(PlantBase, ORMResponse):
     id: uuid.UUID
     garden_id: uuid.UUID
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 # Public schema for returning a plant to the client
 class Plant(PlantInDBBase):
     pass
@@ -1,6 +1,8 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import List, Optional
 
+from app.schemas.base import ORMResponse
+
 # Shared properties
 class PlantCatalogBase(BaseModel):
     name: str
@@ -16,17 +18,16 @@ class PlantCatalogBase(BaseModel):
     compatibility: Optional[List[str]] = []
     tips: Optional[str] = None
 
+    model_config = ConfigDict(frozen=True)
+
 # Properties to receive on item creation
 class PlantCatalogCreate(PlantCatalogBase):
     pass
 
 # Properties to return to client
-class PlantCatalog(PlantCatalogBase):
+class PlantCatalog(PlantCatalogBase, ORMResponse):
     id: int
 
-    class Config:
-        from_attributes = True
-
 # Properties for paginated response
 class PaginatedPlantCatalog(BaseModel):
     total: int
@@ -1,9 +1,13 @@
+import time
 import uuid
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import AliasChoices, BaseModel, Field
 from enum import Enum
 
+from app.schemas.base import OpaqueJSON, ORMResponse, make_partial
+
 # --- Enums ---
 class ProjectPermission(str, Enum):
     """Project permission levels."""
@@ -19,11 +23,15 @@ class ProjectStatus(str, Enum):
     ARCHIVED = "archived"
     DELETED = "deleted"
 
+# --- Shared Fields ---
+PROJECT_NAME = Field(..., min_length=1, max_length=255, json_schema_extra={"example": "My Vegetable Garden"})
+PROJECT_DESCRIPTION = Field(default=None, json_schema_extra={"example": "A small garden for herbs and vegetables."})
+
 # --- Base Project Schemas ---
 class ProjectBase(BaseModel):
     """Base schema for project data."""
-    name: str = Field(..., min_length=1, max_length=255, json_schema_extra={"example": "My Vegetable Garden"})
-    description: Optional[str] = Field(default=None, json_schema_extra={"example": "A small garden for herbs and vegetables."})
+    name: str = PROJECT_NAME
+    description: Optional[str] = PROJECT_DESCRIPTION
     location: Optional[str] = Field(default=None, max_length=500, json_schema_extra={"example": "Backyard, Zone 5"})
     climate_zone: Optional[str] = Field(default=None, max_length=50, json_schema_extra={"example": "5b"})
     soil_type: Optional[str] = Field(default=None, max_length=100, json_schema_extra={"example": "Loamy soil"})
@@ -35,21 +43,16 @@ class ProjectCreate(ProjectBase):
     allow_comments: bool = Field(default=True, json_schema_extra={"example": True})
     allow_forking: bool = Field(default=True, json_schema_extra={"example": True})
 
-class ProjectUpdate(BaseModel):
-    """Schema for updating a project. All fields are optional."""
-    name: Optional[str] = Field(default=None, min_length=1, max_length=255)
-    description: Optional[str] = Field(default=None)
-    location: Optional[str] = Field(default=None, max_length=500)
-    climate_zone: Optional[str] = Field(default=None, max_length=50)
-    soil_type: Optional[str] = Field(default=None, max_length=100)
-    garden_size: Optional[float] = Field(default=None, gt=0)
-    status: Optional[ProjectStatus] = Field(default=None)
-    is_public: Optional[bool] = Field(default=None)
-    allow_comments: Optional[bool] = Field(default=None)
-    allow_forking: Optional[bool] = Field(default=None)
-    layout_data: Optional[Dict[str, Any]] = Field(default=None)
-    plant_data: Optional[Dict[str, Any]] = Field(default=None)
-    irrigation_data: Optional[Dict[str, Any]] = Field(default=None)
+ProjectUpdate = make_partial(
+    ProjectBase,
+    status=ProjectStatus,
+    is_public=bool,
+    allow_comments=bool,
+    allow_forking=bool,
+    layout_data=OpaqueJSON,
+    plant_data=OpaqueJSON,
+    irrigation_data=OpaqueJSON,
+)
 
 # --- Project Member Schemas ---
 class ProjectMemberBase(BaseModel):
@@ -64,7 +67,7 @@ class ProjectMemberUpdate(BaseModel):
     """Schema for updating project member permissions."""
     permission: ProjectPermission
 
-class ProjectMember(ProjectMemberBase):
+class ProjectMember(ProjectMemberBase, ORMResponse):
     """Schema for project member response."""
     id: uuid.UUID
     project_id: uuid.UUID
@@ -74,8 +77,6 @@ class ProjectMember(ProjectMemberBase):
     invited_by: Optional[uuid.UUID]
     invited_at: Optional[datetime]
     accepted_at: Optional[datetime]
-    
-    model_config = ConfigDict(from_attributes=True)
 
 # --- Project Version Schemas ---
 class ProjectVersionBase(BaseModel):
@@ -85,28 +86,26 @@ class ProjectVersionBase(BaseModel):
 
 class ProjectVersionCreate(ProjectVersionBase):
     """Schema for creating a new project version."""
-    layout_data: Optional[Dict[str, Any]] = Field(default=None)
-    plant_data: Optional[Dict[str, Any]] = Field(default=None)
-    irrigation_data: Optional[Dict[str, Any]] = Field(default=None)
+    layout_data: Optional[OpaqueJSON] = Field(default=None)
+    plant_data: Optional[OpaqueJSON] = Field(default=None)
+    irrigation_data: Optional[OpaqueJSON] = Field(default=None)
     is_tagged: bool = Field(default=False)
     tag_name: Optional[str] = Field(default=None, max_length=100)
 
-class ProjectVersion(ProjectVersionBase):
+class ProjectVersion(ProjectVersionBase, ORMResponse):
     """Schema for project version response."""
     id: uuid.UUID
     project_id: uuid.UUID
     version_number: int
     created_by: uuid.UUID
     creator_name: str
-    layout_data: Optional[Dict[str, Any]]
-    plant_data: Optional[Dict[str, Any]]
-    irrigation_data: Optional[Dict[str, Any]]
+    layout_data: Optional[OpaqueJSON]
+    plant_data: Optional[OpaqueJSON]
+    irrigation_data: Optional[OpaqueJSON]
     is_tagged: bool
     tag_name: Optional[str]
     parent_version_id: Optional[uuid.UUID]
     created_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 # --- Project Comment Schemas ---
 class ProjectCommentBase(BaseModel):
@@ -124,7 +123,7 @@ class ProjectCommentUpdate(BaseModel):
     """Schema for updating a project comment."""
     content: str = Field(..., min_length=1)
 
-class ProjectComment(ProjectCommentBase):
+class ProjectComment(ProjectCommentBase, ORMResponse):
     """Schema for project comment response."""
     id: uuid.UUID
     project_id: uuid.UUID
@@ -137,11 +136,9 @@ class ProjectComment(ProjectCommentBase):
     replies_count: int
     created_at: datetime
     updated_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 # --- Project Activity Schemas ---
-class ProjectActivity(BaseModel):
+class ProjectActivity(ORMResponse):
     """Schema for project activity response."""
     id: uuid.UUID
     project_id: uuid.UUID
@@ -149,21 +146,16 @@ class ProjectActivity(BaseModel):
     user_name: str
     activity_type: str
     description: str
-    metadata: Optional[Dict[str, Any]]
+    metadata: Optional[OpaqueJSON] = Field(validation_alias=AliasChoices("activity_metadata", "metadata"))
     created_at: datetime
-    
-    model_config = ConfigDict(from_attributes=True)
 
 # --- Project Response Schemas ---
-class Project(ProjectBase):
-    """Schema for returning a project to the client."""
+class ProjectSummary(ProjectBase, ORMResponse):
+    """Schema for a project in list views, without the layout/plant/irrigation data."""
     id: uuid.UUID
     owner_id: uuid.UUID
-    owner_name: str
+    owner_name: Optional[str]
     status: ProjectStatus
-    layout_data: Dict[str, Any] = Field(default_factory=dict)
-    plant_data: Dict[str, Any] = Field(default_factory=dict)
-    irrigation_data: Dict[str, Any] = Field(default_factory=dict)
     current_version: int
     last_modified_by: Optional[uuid.UUID]
     last_modified_user_name: Optional[str]
@@ -176,7 +168,11 @@ class Project(ProjectBase):
     created_at: datetime
     updated_at: datetime
 
-    model_config = ConfigDict(from_attributes=True)
+class Project(ProjectSummary):
+    """Schema for returning a project to the client."""
+    layout_data: OpaqueJSON = Field(default_factory=dict)
+    plant_data: OpaqueJSON = Field(default_factory=dict)
+    irrigation_data: OpaqueJSON = Field(default_factory=dict)
 
 class ProjectDetail(Project):
     """Detailed project schema with related data."""
@@ -188,7 +184,7 @@ class ProjectDetail(Project):
 # --- Project List Response ---
 class ProjectList(BaseModel):
     """Schema for project list response."""
-    projects: List[Project]
+    projects: List[ProjectSummary]
     total: int
     page: int
     size: int
@@ -202,16 +198,16 @@ class ProjectExport(BaseModel):
     versions: List[ProjectVersion]
     comments: List[ProjectComment]
     activities: List[ProjectActivity]
-    export_metadata: Dict[str, Any] = Field(default_factory=dict)
+    export_metadata: OpaqueJSON = Field(default_factory=dict)
 
 class ProjectImport(BaseModel):
     """Schema for project import data."""
-    name: str = Field(..., min_length=1, max_length=255)
-    description: Optional[str] = Field(default=None)
-    layout_data: Optional[Dict[str, Any]] = Field(default=None)
-    plant_data: Optional[Dict[str, Any]] = Field(default=None)
-    irrigation_data: Optional[Dict[str, Any]] = Field(default=None)
-    import_metadata: Dict[str, Any] = Field(default_factory=dict)
+    name: str = PROJECT_NAME
+    description: Optional[str] = PROJECT_DESCRIPTION
+    layout_data: Optional[OpaqueJSON] = Field(default=None)
+    plant_data: Optional[OpaqueJSON] = Field(default=None)
+    irrigation_data: Optional[OpaqueJSON] = Field(default=None)
+    import_metadata: OpaqueJSON = Field(default_factory=dict)
 
 # --- Project Search and Filter Schemas ---
 class ProjectFilter(BaseModel):
@@ -231,12 +227,16 @@ class ProjectSort(BaseModel):
     direction: str = Field(default="desc", json_schema_extra={"example": "asc"})
 
 # --- WebSocket Message Schemas ---
+def _epoch_ms() -> int:
+    """Current time as integer epoch milliseconds, the WebSocket timestamp format."""
+    return time.time_ns() // 1_000_000
+
 class ProjectWebSocketMessage(BaseModel):
     """Schema for WebSocket messages."""
     type: str = Field(..., json_schema_extra={"example": "project_updated"})
     project_id: uuid.UUID
     data: Dict[str, Any]
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    ts: int = Field(default_factory=_epoch_ms)
     user_id: Optional[uuid.UUID] = Field(default=None)
     user_name: Optional[str] = Field(default=None)
 
@@ -247,4 +247,27 @@ class ProjectCollaborationMessage(BaseModel):
     user_id: uuid.UUID
     user_name: str
     data: Optional[Dict[str, Any]] = Field(default=None)
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    ts: int = Field(default_factory=_epoch_ms)
+
+# Broadcast frames are built from already-serialized data and only ever turned
+# into JSON, so the WebSocket paths use these unvalidated twins of the models
+# above; they keep the same fields and produce the same keys.
+@dataclass(slots=True)
+class ProjectWebSocketMessageDC:
+    """Slotted twin of ProjectWebSocketMessage for broadcasts."""
+    type: str
+    project_id: uuid.UUID
+    data: Dict[str, Any]
+    ts: int = field(default_factory=_epoch_ms)
+    user_id: Optional[uuid.UUID] = None
+    user_name: Optional[str] = None
+
+@dataclass(slots=True)
+class ProjectCollaborationMessageDC:
+    """Slotted twin of ProjectCollaborationMessage for broadcasts."""
+    type: str
+    project_id: uuid.UUID
+    user_id: uuid.UUID
+    user_name: str
+    data: Optional[Dict[str, Any]] = None
+    ts: int = field(default_factory=_epoch_ms)
@@ -1,6 +1,13 @@
 import uuid
+from typing import TYPE_CHECKING, Type
+
 from pydantic import BaseModel, EmailStr, Field
 
+from app.schemas.base import ORMResponse
+
+if TYPE_CHECKING:
+    from .garden import Garden
+
 # --- Base User Schemas ---
 class UserBase(BaseModel):
     """
@@ -25,7 +32,7 @@ class UserUpdate(UserBase):
     password: str | None = Field(default=None, min_length=8)
 
 # --- Schemas for Database and API Responses ---
-class User(UserBase):
+class User(UserBase, ORMResponse):
     """
     Schema for a user object stored in the database (or in-memory store).
     Includes the hashed password.
@@ -33,9 +40,7 @@ class User(UserBase):
     id: uuid.UUID
     hashed_password: str
 
-    model_config = {"from_attributes": True}
-
-class UserPublic(UserBase):
+class UserPublic(UserBase, ORMResponse):
     """
     Schema for returning a user to the client. Excludes the password.
     """
@@ -43,13 +48,18 @@ class UserPublic(UserBase):
     is_active: bool
     is_verified: bool
 
-    model_config = {"from_attributes": True}
-
-
-from .garden import Garden # Import here to avoid circular dependency issues
-
 class UserWithGardens(UserPublic):
     """
     Extends UserPublic to include a list of the user's gardens.
+    Resolve it through get_user_with_gardens_schema() before use.
+    """
+    gardens: "list[Garden]" = []
+
+def get_user_with_gardens_schema() -> Type[UserWithGardens]:
+    """
+    UserWithGardens with its Garden reference resolved. The garden schemas are
+    only imported here, so auth code importing User/UserPublic never builds them.
     """
-    gardens: list[Garden] = []
+    from .garden import Garden  # noqa: F401 - resolved by model_rebuild from this frame
+    UserWithGardens.model_rebuild()
+    return UserWithGardens
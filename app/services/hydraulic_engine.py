@@ -165,6 +165,40 @@ class HydraulicEngine:
         
         return pressure_loss_bar, velocity_ms, reynolds_number, friction_factor
     
+    def calculate_pressure_loss_arrays(
+        self,
+        flow_rate_lph: np.ndarray,
+        diameter_m: np.ndarray,
+        length_m: np.ndarray,
+        roughness_m: np.ndarray,
+        iterations: int = 8
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized Darcy-Weisbach over a whole pipe network.
+        
+        Same model as calculate_pressure_loss_darcy_weisbach, but the
+        Colebrook-White equation is solved by fixed-point iteration (seeded
+        with Swamee-Jain) for all turbulent pipes at once.
+        
+        Returns:
+            Arrays of (pressure_loss_bar, velocity_ms, reynolds_number, friction_factor)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            area_m2 = np.pi * (diameter_m / 2) ** 2
+            velocity_ms = flow_rate_lph / (1000 * 3600) / area_m2
+            reynolds_number = (self.WATER_DENSITY * velocity_ms * diameter_m) / self.WATER_VISCOSITY
+            relative_roughness = roughness_m / diameter_m
+            
+            # x = 1/sqrt(f); x <- -2 log10(e/3.7D + 2.51 x / Re)
+            x = -2.0 * np.log10(relative_roughness / 3.7 + 5.74 / reynolds_number ** 0.9)
+            for _ in range(iterations):
+                x = -2.0 * np.log10(relative_roughness / 3.7 + 2.51 * x / reynolds_number)
+            turbulent_f = np.clip(1.0 / x ** 2, 0.001, 0.1)
+            friction_factor = np.where(reynolds_number < 2300, 64.0 / reynolds_number, turbulent_f)
+            
+            pressure_loss_pa = friction_factor * (length_m / diameter_m) * (self.WATER_DENSITY * velocity_ms ** 2) / 2
+        return pressure_loss_pa / 100000, velocity_ms, reynolds_number, friction_factor
+    
     def calculate_minor_losses(self, flow_rate_lph: float, diameter_m: float, k_factors: List[float]) -> float:
         """
         Calculate minor losses from fittings and valves.
@@ -289,32 +323,18 @@ class HydraulicEngine:
         else:
             warnings = []
         
-        # Calculate pressure losses for each pipe
-        total_pressure_loss = 0.0
-        pipe_results = []
+        # Calculate pressure losses for all pipes at once
+        columns = IrrigationPipe.to_arrays(pipes)
+        roughness_m = np.fromiter(
+            (self.PIPE_PROPERTIES[pipe.material]["roughness_mm"] / 1000.0 for pipe in pipes),
+            dtype=np.float64, count=len(pipes)
+        )
+        pressure_loss_bar, velocity_ms, reynolds_number, friction_factor = self.calculate_pressure_loss_arrays(
+            columns["flow_rate_lph"], columns["diameter_mm"] / 1000.0, columns["length_m"], roughness_m
+        )
         
-        for pipe in pipes:
-            pipe_props = self.PIPE_PROPERTIES[pipe.material]
-            roughness_mm = pipe_props["roughness_mm"]
-            
-            pressure_loss_bar, velocity_ms, reynolds_number, friction_factor = self.calculate_pressure_loss_darcy_weisbach(
-                pipe.flow_rate_lph, pipe.diameter_m, pipe.length_m, roughness_mm / 1000.0
-            )
-            
-            # Add minor losses (estimated 10% of major losses)
-            minor_losses = pressure_loss_bar * 0.1
-            total_pipe_loss = pressure_loss_bar + minor_losses
-            
-            total_pressure_loss += total_pipe_loss
-            
-            pipe_results.append({
-                "pipe_id": str(pipe.id),
-                "pressure_loss_bar": total_pipe_loss,
-                "velocity_ms": velocity_ms,
-                "reynolds_number": reynolds_number,
-                "friction_factor": friction_factor,
-                "flow_regime": self.determine_flow_regime(reynolds_number).value
-            })
+        # Add minor losses (estimated 10% of major losses)
+        total_pressure_loss = float(np.sum(pressure_loss_bar * 1.1))
         
         final_pressure = source_pressure_bar - total_pressure_loss
         
@@ -328,8 +348,8 @@ class HydraulicEngine:
             warnings.append("System pressure is critically low - consider redesign")
         
         # Calculate average velocity and Reynolds number for the system
-        avg_velocity = np.mean([pr["velocity_ms"] for pr in pipe_results])
-        avg_reynolds = np.mean([pr["reynolds_number"] for pr in pipe_results])
+        avg_velocity = np.mean(velocity_ms)
+        avg_reynolds = np.mean(reynolds_number)
         
         return HydraulicCalculationResult(
             total_flow_lph=total_flow_lph,
@@ -337,7 +357,7 @@ class HydraulicEngine:
             final_pressure_bar=final_pressure,
             velocity_ms=avg_velocity,
             reynolds_number=avg_reynolds,
-            friction_factor=np.mean([pr["friction_factor"] for pr in pipe_results]),
+            friction_factor=np.mean(friction_factor),
             warnings=warnings,
             is_system_viable=is_system_viable
         )
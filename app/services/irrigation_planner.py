@@ -4,6 +4,8 @@ from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import asyncio
 
+import numpy as np
+
 from app.schemas.irrigation import (
     ZoneInput, ZoneOutput, FlowInput, FlowOutput, WateringZone,
     ClusteringInput, ClusteringResult, HydraulicCalculationInput, HydraulicCalculationResult,
@@ -37,19 +39,23 @@ class IrrigationPlanner:
         Returns:
             Zone output with optimized zones
         """
+        plants = zone_input.to_soa()
         try:
             # Convert to clustering input format
-            plants_data = []
-            for plant in zone_input.plants:
-                plants_data.append({
-                    "plant_id": plant.plant_id,
-                    "x": plant.x,
-                    "y": plant.y,
-                    "water_needs": plant.water_needs,
+            plants_data = [
+                {
+                    "plant_id": plant_id,
+                    "x": x,
+                    "y": y,
+                    "water_needs": water_needs,
                     "area_m2": 1.0,  # Default area
                     "growth_stage": "vegetative",
                     "crop_coefficient": 0.8
-                })
+                }
+                for plant_id, (x, y), water_needs in zip(
+                    plants.plant_ids.tolist(), plants.xy.tolist(), plants.water_needs
+                )
+            ]
             
             # Perform clustering
             clustering_input = ClusteringInput(
@@ -74,16 +80,13 @@ class IrrigationPlanner:
             
         except Exception as e:
             self.logger.error(f"Error calculating watering zones: {e}")
-            # Fallback to simple grouping by water needs
-            zones_by_needs = {}
-            for plant in zone_input.plants:
-                if plant.water_needs not in zones_by_needs:
-                    zones_by_needs[plant.water_needs] = []
-                zones_by_needs[plant.water_needs].append(plant.plant_id)
-            
+            # Fallback to simple grouping by water needs, in order of first appearance
+            needs, first_seen, group_of = np.unique(
+                np.asarray(plants.water_needs, dtype=str), return_index=True, return_inverse=True
+            )
             zones = [
-                WateringZone(zone_id=i + 1, water_needs=needs, plant_ids=plant_ids)
-                for i, (needs, plant_ids) in enumerate(zones_by_needs.items())
+                WateringZone(zone_id=i + 1, water_needs=str(needs[group]), plant_ids=plants.plant_ids[group_of == group])
+                for i, group in enumerate(np.argsort(first_seen))
             ]
             
             return ZoneOutput(zones=zones)
@@ -12,12 +12,16 @@ def optimize_layout(layout_input: LayoutInput) -> LayoutOutput:
 
     For now, it just returns a slightly modified version of the input layout.
     """
-    # Mock logic: slightly shift the plants and add a warning.
-    optimized_positions = []
-    for plant in layout_input.plants:
-        optimized_positions.append(
-            PlantPosition(plant_id=plant.plant_id, x=plant.x + 1, y=plant.y + 1)
-        )
+    # Mock logic: slightly shift the plants and add a warning. The optimizer
+    # works on the packed position array; the already validated values are
+    # copied back with model_construct.
+    positions = layout_input.to_positions()
+    positions["x"] += 1
+    positions["y"] += 1
+    optimized_positions = [
+        PlantPosition.model_construct(plant_id=plant_id, x=x, y=y)
+        for plant_id, x, y in positions.tolist()
+    ]
 
     return LayoutOutput(
         optimized_layout=optimized_positions,
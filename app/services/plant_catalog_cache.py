@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.plant_catalog import PlantCatalog
+from app.schemas.plant_catalog import PlantCatalog as PlantCatalogSchema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class _CatalogEntry:
+    """A catalog plant plus the lower-cased fields and sets its filters compare against."""
+    plant: PlantCatalogSchema
+    name: str
+    variety: str
+    description: str
+    plant_type: str
+    sun: str
+    planting_season: FrozenSet[str]
+
+
+class PlantCatalogCache:
+    """
+    In-memory copy of the plant catalog. The catalog is static reference
+    data, so it is read from Postgres once and every catalog request is
+    answered from these read-only mappings.
+    """
+
+    def __init__(self):
+        self._entries: Tuple[_CatalogEntry, ...] = ()
+        self._by_id: Mapping[int, PlantCatalogSchema] = MappingProxyType({})
+        self._by_name: Mapping[str, Tuple[PlantCatalogSchema, ...]] = MappingProxyType({})
+        self._plant_types: Tuple[str, ...] = ()
+        self._planting_seasons: Tuple[str, ...] = ()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def load(self, db: AsyncSession) -> None:
+        """(Re)load the whole catalog; readers keep the old snapshot until the swap."""
+        rows = (await db.scalars(select(PlantCatalog).order_by(PlantCatalog.id))).all()
+        entries = tuple(
+            _CatalogEntry(
+                plant=PlantCatalogSchema.from_orm_fast(row),
+                name=row.name.lower(),
+                variety=(row.variety or "").lower(),
+                description=(row.description or "").lower(),
+                plant_type=(row.plant_type or "").lower(),
+                sun=(row.sun or "").lower(),
+                planting_season=frozenset(row.planting_season or ()),
+            )
+            for row in rows
+        )
+
+        by_name: Dict[str, List[PlantCatalogSchema]] = {}
+        for entry in entries:
+            by_name.setdefault(entry.name, []).append(entry.plant)
+
+        self._entries = entries
+        self._by_id = MappingProxyType({entry.plant.id: entry.plant for entry in entries})
+        self._by_name = MappingProxyType({name: tuple(plants) for name, plants in by_name.items()})
+        self._plant_types = tuple(sorted({entry.plant.plant_type for entry in entries if entry.plant.plant_type}))
+        self._planting_seasons = tuple(sorted(set().union(*(entry.planting_season for entry in entries))))
+        self._loaded = True
+        logger.info("Loaded %d plant catalog entries", len(entries))
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """Load on first use if startup could not; concurrent callers share one load."""
+        if self._loaded:
+            return
+        async with self._lock:
+            if not self._loaded:
+                await self.load(db)
+
+    def invalidate(self) -> None:
+        """Force a reload on next use, e.g. after the catalog table was edited."""
+        self._loaded = False
+
+    def get(self, plant_id: int) -> Optional[PlantCatalogSchema]:
+        return self._by_id.get(plant_id)
+
+    def get_by_name(self, name: str) -> Tuple[PlantCatalogSchema, ...]:
+        return self._by_name.get(name.lower(), ())
+
+    def subset(self, plant_ids: Iterable[int]) -> Dict[int, PlantCatalogSchema]:
+        return {plant_id: self._by_id[plant_id] for plant_id in plant_ids if plant_id in self._by_id}
+
+    def search(
+        self,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        q: Optional[str] = None,
+        plant_type: Optional[str] = None,
+        season: Optional[str] = None,
+        sun: Optional[str] = None
+    ) -> Tuple[List[PlantCatalogSchema], int]:
+        """Filter and page the catalog with the same semantics as the SQL query it replaces."""
+        matches: Iterable[_CatalogEntry] = self._entries
+        if q:
+            needle = q.lower()
+            matches = (e for e in matches if needle in e.name or needle in e.variety or needle in e.description)
+        if plant_type:
+            wanted_type = plant_type.lower()
+            matches = (e for e in matches if e.plant_type == wanted_type)
+        if season:
+            matches = (e for e in matches if season in e.planting_season)
+        if sun:
+            wanted_sun = sun.replace('-', ' ').lower()
+            matches = (e for e in matches if e.sun == wanted_sun)
+        plants = [entry.plant for entry in matches]
+        return plants[skip:skip + limit], len(plants)
+
+    def plant_types(self) -> List[str]:
+        return list(self._plant_types)
+
+    def planting_seasons(self) -> List[str]:
+        return list(self._planting_seasons)
+
+
+plant_catalog_cache = PlantCatalogCache()
@@ -4,14 +4,38 @@ import os
 from datetime import datetime
 from typing import Dict, Any, Optional
 from pathlib import Path
-from sqlalchemy.orm import Session
+import orjson
+from sqlalchemy import Text, cast, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 import tempfile
 import zipfile
 from io import BytesIO
 
-from app.models.project import Project, ProjectVersion, ProjectComment, ProjectActivity
+from app.models.project import Project, ProjectPayload, ProjectVersion, ProjectComment, ProjectActivity
 from app.schemas.project import ProjectExport, ProjectImport, ProjectCreate
-from app.crud.project import project_crud
+from app.crud.project import project_crud, _INSERT_ACTIVITY, _fill_version_documents
+
+# Suffix marking columns selected as raw JSON text by _jsonb_text
+_RAW_JSON = "__json"
+
+def _jsonb_text(column, name: Optional[str] = None):
+    """Select a JSONB column as its JSON text instead of a parsed Python value."""
+    return cast(column, Text).label(f"{name or column.key}{_RAW_JSON}")
+
+def _row_to_json(row) -> Dict[str, Any]:
+    """Export dict for a result row, embedding raw JSON columns as orjson fragments."""
+    data = {}
+    for key, value in row._mapping.items():
+        if key.endswith(_RAW_JSON):
+            data[key[:-len(_RAW_JSON)]] = orjson.Fragment(value) if value is not None else None
+        else:
+            data[key] = value
+    return data
+
+async def _get_project_with_payload(db: AsyncSession, project_id: uuid.UUID) -> Optional[Project]:
+    """Load a project together with its design documents (Project.payload is lazy="raise")."""
+    return await db.get(Project, project_id, options=[joinedload(Project.payload)], populate_existing=True)
 
 class ProjectExportService:
     """Service for exporting and importing projects in various formats."""
@@ -20,26 +44,36 @@ class ProjectExportService:
         self.export_dir = Path("exports")
         self.export_dir.mkdir(exist_ok=True)
     
-    def export_project(self, db: Session, project_id: uuid.UUID) -> ProjectExport:
+    async def export_project(self, db: AsyncSession, project_id: uuid.UUID) -> ProjectExport:
         """Export a project with all its data."""
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await _get_project_with_payload(db, project_id)
         if not project:
             raise ValueError("Project not found")
         
         # Get all versions
-        versions = db.query(ProjectVersion).filter(
-            ProjectVersion.project_id == project_id
-        ).order_by(ProjectVersion.version_number).all()
+        result = await db.execute(
+            select(ProjectVersion).where(
+                ProjectVersion.project_id == project_id
+            ).order_by(ProjectVersion.version_number)
+        )
+        versions = result.scalars().all()
+        await _fill_version_documents(db, versions)
         
         # Get all comments
-        comments = db.query(ProjectComment).filter(
-            ProjectComment.project_id == project_id
-        ).order_by(ProjectComment.created_at).all()
+        result = await db.execute(
+            select(ProjectComment).where(
+                ProjectComment.project_id == project_id
+            ).order_by(ProjectComment.created_at)
+        )
+        comments = result.scalars().all()
         
         # Get all activities
-        activities = db.query(ProjectActivity).filter(
-            ProjectActivity.project_id == project_id
-        ).order_by(ProjectActivity.created_at).all()
+        result = await db.execute(
+            select(ProjectActivity).where(
+                ProjectActivity.project_id == project_id
+            ).order_by(ProjectActivity.created_at)
+        )
+        activities = result.scalars().all()
         
         return ProjectExport(
             project=project,
@@ -55,82 +89,84 @@ class ProjectExportService:
             }
         )
     
-    def export_to_json(self, db: Session, project_id: uuid.UUID) -> str:
-        """Export project to JSON file."""
-        export_data = self.export_project(db, project_id)
+    async def export_to_json(self, db: AsyncSession, project_id: uuid.UUID) -> str:
+        """
+        Export project to JSON file.
+        
+        JSONB columns are read as text and embedded verbatim as orjson
+        fragments, so the design blobs are never parsed into Python objects
+        only to be serialized again.
+        """
+        project = (await db.execute(
+            select(
+                Project.id, Project.name, Project.description, Project.location,
+                Project.climate_zone, Project.soil_type, Project.garden_size,
+                _jsonb_text(ProjectPayload.layout_data), _jsonb_text(ProjectPayload.plant_data),
+                _jsonb_text(ProjectPayload.irrigation_data),
+                Project.status, Project.is_public, Project.allow_comments, Project.allow_forking,
+                Project.created_at, Project.updated_at
+            ).outerjoin(ProjectPayload, ProjectPayload.id == Project.id).where(Project.id == project_id)
+        )).one_or_none()
+        if project is None:
+            raise ValueError("Project not found")
         
-        # Convert to JSON-serializable format
+        # Versions are exported as stored: snapshots carry full documents,
+        # the others their JSON patches against the previous version
+        versions = (await db.execute(
+            select(
+                ProjectVersion.id, ProjectVersion.version_number, ProjectVersion.name,
+                ProjectVersion.description, ProjectVersion.is_snapshot, _jsonb_text(ProjectVersion.layout_data),
+                _jsonb_text(ProjectVersion.plant_data), _jsonb_text(ProjectVersion.irrigation_data),
+                _jsonb_text(ProjectVersion.layout_patch), _jsonb_text(ProjectVersion.plant_patch),
+                _jsonb_text(ProjectVersion.irrigation_patch),
+                ProjectVersion.is_tagged, ProjectVersion.tag_name, ProjectVersion.created_at
+            ).where(
+                ProjectVersion.project_id == project_id
+            ).order_by(ProjectVersion.version_number)
+        )).all()
+        
+        comments = (await db.execute(
+            select(
+                ProjectComment.id, ProjectComment.content, ProjectComment.position_x,
+                ProjectComment.position_y, ProjectComment.element_id, ProjectComment.parent_comment_id,
+                ProjectComment.is_resolved, ProjectComment.created_at, ProjectComment.updated_at
+            ).where(
+                ProjectComment.project_id == project_id
+            ).order_by(ProjectComment.created_at)
+        )).all()
+        
+        activities = (await db.execute(
+            select(
+                ProjectActivity.id, ProjectActivity.activity_type, ProjectActivity.description,
+                _jsonb_text(ProjectActivity.activity_metadata, "metadata"), ProjectActivity.created_at
+            ).where(
+                ProjectActivity.project_id == project_id
+            ).order_by(ProjectActivity.created_at)
+        )).all()
+        
+        # orjson writes UUIDs, datetimes and str enums natively
         json_data = {
-            "project": {
-                "id": str(export_data.project.id),
-                "name": export_data.project.name,
-                "description": export_data.project.description,
-                "location": export_data.project.location,
-                "climate_zone": export_data.project.climate_zone,
-                "soil_type": export_data.project.soil_type,
-                "garden_size": export_data.project.garden_size,
-                "layout_data": export_data.project.layout_data,
-                "plant_data": export_data.project.plant_data,
-                "irrigation_data": export_data.project.irrigation_data,
-                "status": export_data.project.status.value,
-                "is_public": export_data.project.is_public,
-                "allow_comments": export_data.project.allow_comments,
-                "allow_forking": export_data.project.allow_forking,
-                "created_at": export_data.project.created_at.isoformat(),
-                "updated_at": export_data.project.updated_at.isoformat()
-            },
-            "versions": [
-                {
-                    "id": str(version.id),
-                    "version_number": version.version_number,
-                    "name": version.name,
-                    "description": version.description,
-                    "layout_data": version.layout_data,
-                    "plant_data": version.plant_data,
-                    "irrigation_data": version.irrigation_data,
-                    "is_tagged": version.is_tagged,
-                    "tag_name": version.tag_name,
-                    "created_at": version.created_at.isoformat()
-                }
-                for version in export_data.versions
-            ],
-            "comments": [
-                {
-                    "id": str(comment.id),
-                    "content": comment.content,
-                    "position_x": comment.position_x,
-                    "position_y": comment.position_y,
-                    "element_id": comment.element_id,
-                    "parent_comment_id": str(comment.parent_comment_id) if comment.parent_comment_id else None,
-                    "is_resolved": comment.is_resolved,
-                    "created_at": comment.created_at.isoformat(),
-                    "updated_at": comment.updated_at.isoformat()
-                }
-                for comment in export_data.comments
-            ],
-            "activities": [
-                {
-                    "id": str(activity.id),
-                    "activity_type": activity.activity_type,
-                    "description": activity.description,
-                    "metadata": activity.metadata,
-                    "created_at": activity.created_at.isoformat()
-                }
-                for activity in export_data.activities
-            ],
-            "export_metadata": export_data.export_metadata
+            "project": _row_to_json(project),
+            "versions": [_row_to_json(version) for version in versions],
+            "comments": [_row_to_json(comment) for comment in comments],
+            "activities": [_row_to_json(activity) for activity in activities],
+            "export_metadata": {
+                "exported_at": datetime.utcnow().isoformat(),
+                "export_version": "1.0",
+                "total_versions": len(versions),
+                "total_comments": len(comments),
+                "total_activities": len(activities)
+            }
         }
         
         # Create file
         filename = f"project_{project_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
         file_path = self.export_dir / filename
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(json_data, f, indent=2, ensure_ascii=False)
+        file_path.write_bytes(orjson.dumps(json_data, option=orjson.OPT_INDENT_2))
         
         return str(file_path)
     
-    def export_to_pdf(self, db: Session, project_id: uuid.UUID) -> str:
+    async def export_to_pdf(self, db: AsyncSession, project_id: uuid.UUID) -> str:
         """Export project to PDF file."""
         try:
             from reportlab.lib.pagesizes import letter, A4
@@ -141,7 +177,7 @@ class ProjectExportService:
         except ImportError:
             raise ImportError("reportlab is required for PDF export. Install with: pip install reportlab")
         
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await _get_project_with_payload(db, project_id)
         if not project:
             raise ValueError("Project not found")
         
@@ -214,9 +250,12 @@ class ProjectExportService:
             story.append(Spacer(1, 20))
         
         # Versions summary
-        versions = db.query(ProjectVersion).filter(
-            ProjectVersion.project_id == project_id
-        ).order_by(ProjectVersion.version_number.desc()).limit(5).all()
+        result = await db.execute(
+            select(ProjectVersion).where(
+                ProjectVersion.project_id == project_id
+            ).order_by(ProjectVersion.version_number.desc()).limit(5)
+        )
+        versions = result.scalars().all()
         
         if versions:
             story.append(Paragraph("Recent Versions", styles['Heading2']))
@@ -244,9 +283,12 @@ class ProjectExportService:
             story.append(Spacer(1, 20))
         
         # Comments summary
-        comments = db.query(ProjectComment).filter(
-            ProjectComment.project_id == project_id
-        ).order_by(ProjectComment.created_at.desc()).limit(5).all()
+        result = await db.execute(
+            select(ProjectComment).where(
+                ProjectComment.project_id == project_id
+            ).order_by(ProjectComment.created_at.desc()).limit(5)
+        )
+        comments = result.scalars().all()
         
         if comments:
             story.append(Paragraph("Recent Comments", styles['Heading2']))
@@ -261,7 +303,7 @@ class ProjectExportService:
         doc.build(story)
         return str(file_path)
     
-    def export_to_png(self, db: Session, project_id: uuid.UUID) -> str:
+    async def export_to_png(self, db: AsyncSession, project_id: uuid.UUID) -> str:
         """Export project layout as PNG image."""
         try:
             from PIL import Image, ImageDraw, ImageFont
@@ -269,7 +311,7 @@ class ProjectExportService:
         except ImportError:
             raise ImportError("Pillow is required for PNG export. Install with: pip install Pillow")
         
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await _get_project_with_payload(db, project_id)
         if not project:
             raise ValueError("Project not found")
         
@@ -316,9 +358,9 @@ class ProjectExportService:
         img.save(str(file_path))
         return str(file_path)
     
-    def export_to_zip(self, db: Session, project_id: uuid.UUID) -> str:
+    async def export_to_zip(self, db: AsyncSession, project_id: uuid.UUID) -> str:
         """Export project as ZIP file containing all formats."""
-        project = db.query(Project).filter(Project.id == project_id).first()
+        project = await db.get(Project, project_id)
         if not project:
             raise ValueError("Project not found")
         
@@ -327,9 +369,9 @@ class ProjectExportService:
             temp_path = Path(temp_dir)
             
             # Export to different formats
-            json_path = self.export_to_json(db, project_id)
-            pdf_path = self.export_to_pdf(db, project_id)
-            png_path = self.export_to_png(db, project_id)
+            json_path = await self.export_to_json(db, project_id)
+            pdf_path = await self.export_to_pdf(db, project_id)
+            png_path = await self.export_to_png(db, project_id)
             
             # Create ZIP file
             zip_filename = f"project_{project_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.zip"
@@ -362,7 +404,7 @@ class ProjectExportService:
             
             return str(zip_path)
     
-    def import_project(self, db: Session, project_import: ProjectImport, owner_id: uuid.UUID) -> Project:
+    async def import_project(self, db: AsyncSession, project_import: ProjectImport, owner_id: uuid.UUID) -> Project:
         """Import a project from JSON data."""
         # Create project from import data
         project_data = {
@@ -378,28 +420,26 @@ class ProjectExportService:
         
         # Create the project
         project_create = ProjectCreate(**project_data)
-        project = project_crud.create_project(
+        project = await project_crud.create_project(
             db=db, project_in=project_create, owner_id=owner_id
         )
         
         # Add import metadata as activity
-        from app.models.project import ProjectActivity
-        activity = ProjectActivity(
-            project_id=project.id,
-            user_id=owner_id,
-            activity_type="project_imported",
-            description=f"Project imported from external source",
-            metadata={
+        await db.execute(_INSERT_ACTIVITY, {
+            "project_id": project.id,
+            "user_id": owner_id,
+            "activity_type": "project_imported",
+            "description": f"Project imported from external source",
+            "activity_metadata": {
                 "import_metadata": project_import.import_metadata,
                 "original_name": project_import.name
             }
-        )
-        db.add(activity)
-        db.commit()
+        })
+        await db.commit()
         
         return project
     
-    def import_from_json_file(self, db: Session, file_path: str, owner_id: uuid.UUID) -> Project:
+    async def import_from_json_file(self, db: AsyncSession, file_path: str, owner_id: uuid.UUID) -> Project:
         """Import a project from a JSON file."""
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
@@ -421,7 +461,7 @@ class ProjectExportService:
             }
         )
         
-        return self.import_project(db, project_import, owner_id)
+        return await self.import_project(db, project_import, owner_id)
 
 # Create service instance
 project_export_service = ProjectExportService() 
\ No newline at end of file
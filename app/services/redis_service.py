@@ -1,6 +1,18 @@
+import hashlib
+import json
+import uuid
 from datetime import timedelta
+from typing import Any, Optional
 import redis.asyncio as redis
 
+# Cached value for "no access", so misses for outsiders are cached too
+NO_PERMISSION = "none"
+
+# Set to a fresh random token on every project write; part of each public
+# listing cache key and ETag. A counter would restart at 0 after Redis is
+# flushed or restarted and make ETags of older data match again.
+PUBLIC_PROJECTS_VERSION_KEY = "pubproj:version"
+
 class RedisService:
     def __init__(self, redis_client: redis.Redis):
         self.redis_client = redis_client
@@ -18,6 +30,67 @@ class RedisService:
         """
         return await self.redis_client.exists(f"denylist:{jti}") == 1
 
+    async def get_project_permission(self, project_id: uuid.UUID, user_id: uuid.UUID) -> Optional[str]:
+        """
+        Returns the cached permission level of a user on a project,
+        NO_PERMISSION if the user is known to have none, or None on a miss.
+        """
+        return await self.redis_client.get(f"perm:{project_id}:{user_id}")
+
+    async def set_project_permission(
+        self, project_id: uuid.UUID, user_id: uuid.UUID, permission: str, expires_in: int
+    ):
+        """
+        Caches a user's permission level on a project for `expires_in` seconds.
+        """
+        await self.redis_client.setex(f"perm:{project_id}:{user_id}", expires_in, permission)
+
+    async def invalidate_project_permissions(self, project_id: uuid.UUID, user_id: Optional[uuid.UUID] = None):
+        """
+        Drops the cached permission of one user on a project, or of every
+        user on the project when no user is given.
+        """
+        if user_id is not None:
+            await self.redis_client.delete(f"perm:{project_id}:{user_id}")
+            return
+        keys = [key async for key in self.redis_client.scan_iter(match=f"perm:{project_id}:*")]
+        if keys:
+            await self.redis_client.delete(*keys)
+
+    async def public_projects_etag(self, params: list[Any]) -> str:
+        """
+        Returns the ETag of a public project listing for the given filter and
+        page arguments. It changes whenever any project write bumps the
+        listing version, so it doubles as the listing's cache key.
+        """
+        version = await self.redis_client.get(PUBLIC_PROJECTS_VERSION_KEY)
+        if version is None:
+            # First read after a flush or restart: start a new random epoch
+            await self.redis_client.set(PUBLIC_PROJECTS_VERSION_KEY, uuid.uuid4().hex, nx=True)
+            version = await self.redis_client.get(PUBLIC_PROJECTS_VERSION_KEY)
+        digest = hashlib.sha1(json.dumps([version, params], default=str).encode()).hexdigest()
+        return f'"{digest}"'
+
+    async def get_public_projects_page(self, etag: str) -> Optional[str]:
+        """
+        Returns the cached JSON body of the public project listing with the
+        given ETag, or None on a miss.
+        """
+        return await self.redis_client.get(f"pubproj:{etag}")
+
+    async def set_public_projects_page(self, etag: str, body: str, expires_in: int):
+        """
+        Caches the JSON body of a public project listing for `expires_in` seconds.
+        """
+        await self.redis_client.setex(f"pubproj:{etag}", expires_in, body)
+
+    async def invalidate_public_projects(self):
+        """
+        Makes every cached public listing stale by replacing the key version;
+        old entries simply expire.
+        """
+        await self.redis_client.set(PUBLIC_PROJECTS_VERSION_KEY, uuid.uuid4().hex)
+
 # Note: A dependency injection system would be ideal here to provide the
 # RedisService instance to the parts of the app that need it.
 # For simplicity in this context, we might instantiate it where needed,
@@ -6,6 +6,8 @@ import asyncio
 import aiohttp
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.schemas.irrigation import (
     WeatherData, WeatherForecastInput, WeatherForecastResult,
     WeatherDataCreate
@@ -241,6 +243,47 @@ class WeatherService:
         
         return max(0, et0)  # Ensure non-negative
     
+    def calculate_evapotranspiration_array(
+        self,
+        temperature_c: np.ndarray,
+        humidity_percent: np.ndarray,
+        wind_speed_kmh: np.ndarray,
+        solar_radiation_mj_m2: np.ndarray,
+        atmospheric_pressure_hpa: float = 1013.25
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_evapotranspiration over whole weather series.
+        
+        Args:
+            temperature_c: Temperatures in °C
+            humidity_percent: Relative humidity in %
+            wind_speed_kmh: Wind speeds in km/h
+            solar_radiation_mj_m2: Solar radiation in MJ/m²
+            atmospheric_pressure_hpa: Atmospheric pressure in hPa
+            
+        Returns:
+            Reference evapotranspiration in mm/day (float32)
+        """
+        temperature_c = np.asarray(temperature_c, dtype=np.float32)
+        humidity_fraction = np.asarray(humidity_percent, dtype=np.float32) / 100
+        wind_speed_ms = np.asarray(wind_speed_kmh, dtype=np.float32) / 3.6
+        temperature_k = temperature_c + 273.15
+        
+        saturation_vapor_pressure = 0.6108 * np.exp(17.27 * temperature_c / (temperature_c + 237.3))
+        vapor_pressure_deficit = saturation_vapor_pressure * (1 - humidity_fraction)
+        slope_vapor_pressure = 4098 * saturation_vapor_pressure / temperature_k ** 2
+        psychrometric_constant = self.PSYCHROMETRIC_CONSTANT * atmospheric_pressure_hpa / 1000
+        
+        net_radiation = np.asarray(solar_radiation_mj_m2, dtype=np.float32) * 0.77 - 0.26 * (1 - humidity_fraction)
+        # Soil heat flux is 10% of net radiation, as in the scalar version
+        available_energy = 0.9 * net_radiation
+        
+        numerator = 0.408 * slope_vapor_pressure * available_energy + \
+                   psychrometric_constant * (900 / temperature_k) * wind_speed_ms * vapor_pressure_deficit
+        denominator = slope_vapor_pressure + psychrometric_constant * (1 + 0.34 * wind_speed_ms)
+        
+        return np.maximum(numerator / denominator, 0).astype(np.float32, copy=False)
+    
     def calculate_irrigation_need(
         self, 
         et0: float, 
@@ -1,13 +1,36 @@
+import asyncio
 import json
 import logging
+import orjson
+import time
 from datetime import datetime
 from typing import Dict, Set, Any, Optional
 from collections import defaultdict
 from fastapi import WebSocket
+import redis.asyncio as redis
 import uuid
 
 logger = logging.getLogger(__name__)
 
+# Presence sets are refreshed on every join; the TTL only reaps sets left
+# behind by a worker that died without running its disconnect handlers.
+PRESENCE_TTL_SECONDS = 3600
+
+# Presence is a hash of user id -> open connection count, so a user with two
+# tabs stays present until both close. Decrement and removal run as one
+# script so a join landing in between cannot be lost.
+_LEAVE_PRESENCE_SCRIPT = """
+local remaining = redis.call('HINCRBY', KEYS[1], ARGV[1], -1)
+if remaining <= 0 then
+    redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return remaining
+"""
+
+# Backoff between attempts to resubscribe the fanout listener after a Redis error
+FANOUT_RETRY_INITIAL_SECONDS = 1.0
+FANOUT_RETRY_MAX_SECONDS = 30.0
+
 class WebSocketManager:
     """Enhanced WebSocket manager for real-time collaboration."""
     
@@ -27,6 +50,12 @@ class WebSocketManager:
         # Connection health tracking
         self.connection_heartbeats: Dict[str, datetime] = {}
         self.last_activity: Dict[str, datetime] = {}
+        
+        # Cross-worker presence and fanout (bound at startup)
+        self.redis: Optional[redis.Redis] = None
+        self._pubsub = None
+        self._fanout_task: Optional[asyncio.Task] = None
+        self._leave_presence = None
     
     # --- Agronomic WebSocket Methods (existing) ---
     
@@ -117,7 +146,7 @@ class WebSocketManager:
         self.cursor_positions[project_id][user_id] = {
             "x": 0,
             "y": 0,
-            "last_update": datetime.utcnow().isoformat()
+            "last_update": time.time_ns() // 1_000_000
         }
         
         logger.info(f"Project connection added for user {user_id} to project {project_id}")
@@ -140,26 +169,71 @@ class WebSocketManager:
         
         logger.info(f"Project connection removed for user {user_id} from project {project_id}")
     
+    async def join_project(self, project_id: str, user_id: str, websocket: WebSocket) -> Set[str]:
+        """Register a project connection and return the users present across all workers."""
+        self.add_project_connection(project_id, user_id, websocket)
+        if self.redis is None:
+            return set(self.get_project_users(project_id))
+        
+        # One round trip for the presence write, its TTL refresh and the roster read
+        key = f"presence:conns:{project_id}"
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hincrby(key, user_id, 1)
+            pipe.expire(key, PRESENCE_TTL_SECONDS)
+            pipe.hkeys(key)
+            _, _, members = await pipe.execute()
+        return set(members)
+    
+    async def leave_project(self, project_id: str, user_id: str):
+        """
+        Unregister a project connection; the user leaves the shared presence
+        set once their last connection to the project closes.
+        """
+        self.remove_project_connection(project_id, user_id)
+        if self.redis is None:
+            return
+        
+        try:
+            await self._leave_presence(keys=[f"presence:conns:{project_id}"], args=[user_id])
+        except Exception as e:
+            logger.error(f"Failed to clear presence for user {user_id} in project {project_id}: {str(e)}")
+    
     async def broadcast_to_project(
         self, 
         project_id: str, 
         message: Dict[str, Any], 
         exclude_user_id: Optional[str] = None
     ):
-        """Broadcast message to all users in a project."""
+        """Broadcast message to all users in a project, on every worker."""
+        if self.redis is None:
+            await self._send_to_local_project(project_id, message, exclude_user_id)
+            return
+        
+        envelope = {"message": message, "exclude_user_id": exclude_user_id}
+        await self.redis.publish(f"project:{project_id}", orjson.dumps(envelope))
+    
+    async def _send_to_local_project(
+        self, 
+        project_id: str, 
+        message: Dict[str, Any], 
+        exclude_user_id: Optional[str] = None
+    ):
+        """Send a message to the project connections held by this worker."""
         if project_id not in self.project_connections:
             logger.warning(f"No connections for project {project_id}")
             return
         
         connections = self.project_connections[project_id].copy()
         failed_sends = []
+        # Encode once for the whole room rather than once per socket
+        text = orjson.dumps(message).decode()
         
         for user_id, websocket in connections.items():
             if exclude_user_id and user_id == exclude_user_id:
                 continue
             
             try:
-                await websocket.send_text(json.dumps(message))
+                await websocket.send_text(text)
             except Exception as e:
                 logger.error(f"Failed to send project message to user {user_id}: {str(e)}")
                 failed_sends.append(user_id)
@@ -175,7 +249,7 @@ class WebSocketManager:
             if user_id in connections:
                 try:
                     websocket = connections[user_id]
-                    await websocket.send_text(json.dumps(message))
+                    await websocket.send_text(orjson.dumps(message).decode())
                     return
                 except Exception as e:
                     logger.error(f"Failed to send project message to user {user_id}: {str(e)}")
@@ -192,7 +266,7 @@ class WebSocketManager:
         self.cursor_positions[project_id][user_id] = {
             "x": x,
             "y": y,
-            "last_update": datetime.utcnow().isoformat()
+            "last_update": time.time_ns() // 1_000_000
         }
     
     def get_project_cursors(self, project_id: str) -> Dict[str, Dict[str, Any]]:
@@ -207,6 +281,81 @@ class WebSocketManager:
         """Get all projects a user is currently connected to."""
         return self.user_projects.get(user_id, set())
     
+    # --- Cross-worker Fanout ---
+    
+    def bind_redis(self, redis_client: redis.Redis):
+        """Attach the shared Redis client used for presence and pub/sub fanout."""
+        self.redis = redis_client
+        self._leave_presence = redis_client.register_script(_LEAVE_PRESENCE_SCRIPT)
+    
+    async def start_fanout(self):
+        """Start the listener that subscribes this worker to all project channels."""
+        if self.redis is None or self._fanout_task is not None:
+            return
+        
+        self._fanout_task = asyncio.create_task(self._fanout_loop())
+    
+    async def stop_fanout(self):
+        """Stop the pub/sub listener started by `start_fanout`."""
+        if self._fanout_task is not None:
+            self._fanout_task.cancel()
+            try:
+                await self._fanout_task
+            except asyncio.CancelledError:
+                pass
+            self._fanout_task = None
+        
+        await self._close_pubsub()
+    
+    async def _close_pubsub(self):
+        """Close the current pub/sub connection, if any."""
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is None:
+            return
+        try:
+            await pubsub.aclose()
+        except Exception as e:
+            logger.error(f"Failed to close project fanout subscription: {str(e)}")
+    
+    async def _fanout_loop(self):
+        """
+        Deliver published project messages to the sockets held by this worker.
+        A Redis error or dropped connection is logged and the subscription is
+        re-established with exponential backoff, so fanout never stops for good.
+        """
+        delay = FANOUT_RETRY_INITIAL_SECONDS
+        while True:
+            try:
+                self._pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                await self._pubsub.psubscribe("project:*")
+                delay = FANOUT_RETRY_INITIAL_SECONDS
+                async for event in self._pubsub.listen():
+                    await self._deliver_fanout_event(event)
+                logger.warning("Project fanout subscription ended; resubscribing")
+            except Exception as e:
+                logger.error(f"Project fanout failed, resubscribing in {delay:.0f}s: {str(e)}")
+            
+            await self._close_pubsub()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, FANOUT_RETRY_MAX_SECONDS)
+    
+    async def _deliver_fanout_event(self, event: Dict[str, Any]):
+        """Send one published project message to the matching local sockets."""
+        if event.get("type") != "pmessage":
+            return
+        
+        project_id = event["channel"].split(":", 1)[1]
+        if project_id not in self.project_connections:
+            return
+        
+        try:
+            envelope = orjson.loads(event["data"])
+            await self._send_to_local_project(
+                project_id, envelope["message"], envelope.get("exclude_user_id")
+            )
+        except Exception as e:
+            logger.error(f"Failed to fan out message for project {project_id}: {str(e)}")
+    
     # --- Token Validation (simplified) ---
     
     def validate_token(self, token: str) -> Optional[str]:
@@ -1,7 +1,6 @@
 import uuid
 from fastapi.testclient import TestClient
 from unittest.mock import MagicMock
-from jose import jwt
 
 from app.core.config import settings
 from app.core import security
@@ -1,4 +1,7 @@
 import uuid
+
+import httpx
+import pytest
 from fastapi.testclient import TestClient
 from app.core import security
 
@@ -98,3 +101,49 @@ def test_project_crud_and_permissions(client: TestClient):
     # 10. The project is now gone
     response = client.get(f"/api/v1/projects/{project_id}", headers=headers_a)
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_project_responses_include_summary_fields(auth_client: httpx.AsyncClient):
+    """
+    Create, list, read and update go through ORMResponse.from_orm_fast, which
+    needs owner_name and the member/comment/version counts on the loaded rows.
+    """
+    response = await auth_client.post(
+        "/api/v1/projects/",
+        json={"name": "Summary Fields Project", "is_public": True},
+    )
+    assert response.status_code == 201
+    created = response.json()
+    project_id = created["id"]
+    assert created["owner_name"] == "Test User"
+    assert (created["members_count"], created["comments_count"], created["versions_count"]) == (0, 0, 1)
+
+    response = await auth_client.get("/api/v1/projects/")
+    assert response.status_code == 200
+    [listed] = response.json()["projects"]
+    assert listed["id"] == project_id
+    assert listed["owner_name"] == "Test User"
+    assert listed["versions_count"] == 1
+
+    response = await auth_client.get(f"/api/v1/projects/{project_id}")
+    assert response.status_code == 200
+    detail = response.json()
+    assert detail["owner_name"] == "Test User"
+    assert detail["versions_count"] == 1
+
+    response = await auth_client.put(
+        f"/api/v1/projects/{project_id}",
+        json={"status": "active", "layout_data": {"beds": []}},
+    )
+    assert response.status_code == 200
+    updated = response.json()
+    assert updated["last_modified_user_name"] == "Test User"
+    assert updated["versions_count"] == 2
+
+    # Only active public projects are listed publicly
+    response = await auth_client.get("/api/v1/projects/public")
+    assert response.status_code == 200
+    [public] = response.json()["projects"]
+    assert public["id"] == project_id
+    assert public["owner_name"] == "Test User"
@@ -4,18 +4,24 @@ from fastapi.testclient import TestClient
 from typing import Generator, AsyncGenerator
 from unittest.mock import MagicMock
 
+import httpx
+
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
 from app.db.session import get_db
+from app.api.deps import get_current_user
 from app.models.base import Base
+from app.models.user import User
 from app.core.config import settings
 
 # Create a new async engine for the test database
 test_engine = create_async_engine(settings.DATABASE_URL, echo=True)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine, class_=AsyncSession)
+# expire_on_commit=False like app.db.session.AsyncSessionLocal: the CRUD layer
+# returns committed instances that the endpoints go on to serialize
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine, class_=AsyncSession, expire_on_commit=False)
 
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
@@ -39,6 +45,26 @@ async def db_session() -> AsyncGenerator[AsyncSession, None]:
     async with test_engine.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
 
+@pytest.fixture(scope="function")
+def db(db_session: AsyncSession) -> AsyncSession:
+    """The per-test session, under the name the CRUD and service tests use."""
+    return db_session
+
+@pytest_asyncio.fixture(scope="function")
+async def test_user(db_session: AsyncSession) -> User:
+    """A persisted, active user to own the projects created in a test."""
+    user = User(
+        email="test@example.com",
+        full_name="Test User",
+        hashed_password="hashed_password",
+        is_active=True,
+        is_verified=True,
+    )
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+    return user
+
 @pytest.fixture(scope="function")
 def client(db_session: AsyncSession) -> Generator:
     """
@@ -60,6 +86,27 @@ def client(db_session: AsyncSession) -> Generator:
     del app.dependency_overrides[get_db]
     limiter.enabled = True
 
+@pytest_asyncio.fixture(scope="function")
+async def auth_client(db_session: AsyncSession, test_user: User) -> AsyncGenerator[httpx.AsyncClient, None]:
+    """
+    Async client on the test's event loop and session, with requests
+    authenticated as test_user.
+    """
+    async def override_get_db():
+        yield db_session
+
+    from app.core.limiter import limiter
+    limiter.enabled = False
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: test_user
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+
+    del app.dependency_overrides[get_current_user]
+    del app.dependency_overrides[get_db]
+    limiter.enabled = True
+
 
 @pytest.fixture(scope="function", autouse=True)
 def mock_email_service(mocker) -> dict[str, MagicMock]:
@@ -68,11 +115,11 @@ def mock_email_service(mocker) -> dict[str, MagicMock]:
     This is set to autouse=True to apply to all tests automatically.
     """
     mock_send_verification = mocker.patch(
-        "app.api.v1.endpoints.auth.send_verification_email",
+        "app.services.email_service.send_verification_email",
         autospec=True
     )
     mock_send_password_reset = mocker.patch(
-        "app.api.v1.endpoints.auth.send_password_reset_email",
+        "app.services.email_service.send_password_reset_email",
         autospec=True
     )
     return {
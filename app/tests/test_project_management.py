@@ -1,10 +1,12 @@
 import pytest
+import pytest_asyncio
 import uuid
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.testclient import TestClient
 
-from app.models.project import Project, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus
+from app.models.project import Project, ProjectPayload, ProjectMember, ProjectVersion, ProjectComment, ProjectActivity, ProjectPermission, ProjectStatus
 from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectUpdate, ProjectMemberCreate, ProjectVersionCreate, ProjectCommentCreate
 from app.crud.project import project_crud, project_member_crud, project_version_crud, project_comment_crud
@@ -14,7 +16,8 @@ from app.services.project_export_service import project_export_service
 class TestProjectCRUD:
     """Test project CRUD operations."""
     
-    def test_create_project(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_create_project(self, db: AsyncSession, test_user: User):
         """Test creating a new project."""
         project_data = ProjectCreate(
             name="Test Garden Project",
@@ -28,7 +31,7 @@ class TestProjectCRUD:
             allow_forking=True
         )
         
-        project = project_crud.create_project(
+        project = await project_crud.create_project(
             db=db, project_in=project_data, owner_id=test_user.id
         )
         
@@ -40,54 +43,59 @@ class TestProjectCRUD:
         assert project.is_public == False
         
         # Check that initial version was created
-        versions = db.query(ProjectVersion).filter(ProjectVersion.project_id == project.id).all()
+        result = await db.execute(select(ProjectVersion).where(ProjectVersion.project_id == project.id))
+        versions = result.scalars().all()
         assert len(versions) == 1
         assert versions[0].version_number == 1
         assert versions[0].name == "Initial Version"
         
         # Check that activity was logged
-        activities = db.query(ProjectActivity).filter(ProjectActivity.project_id == project.id).all()
+        result = await db.execute(select(ProjectActivity).where(ProjectActivity.project_id == project.id))
+        activities = result.scalars().all()
         assert len(activities) == 1
         assert activities[0].activity_type == "project_created"
     
-    def test_get_project(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_get_project(self, db: AsyncSession, test_user: User):
         """Test getting a project by ID."""
         # Create a project first
         project_data = ProjectCreate(name="Test Project", description="Test description")
-        project = project_crud.create_project(db=db, project_in=project_data, owner_id=test_user.id)
+        project = await project_crud.create_project(db=db, project_in=project_data, owner_id=test_user.id)
         
         # Get the project
-        retrieved_project = project_crud.get_project(db=db, project_id=project.id)
+        retrieved_project = await project_crud.get_project(db=db, project_id=project.id)
         
         assert retrieved_project is not None
         assert retrieved_project.id == project.id
         assert retrieved_project.name == "Test Project"
     
-    def test_get_user_projects(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_get_user_projects(self, db: AsyncSession, test_user: User):
         """Test getting projects for a user."""
         # Create multiple projects
-        project1 = project_crud.create_project(
+        project1 = await project_crud.create_project(
             db=db, 
             project_in=ProjectCreate(name="Project 1"), 
             owner_id=test_user.id
         )
-        project2 = project_crud.create_project(
+        project2 = await project_crud.create_project(
             db=db, 
             project_in=ProjectCreate(name="Project 2"), 
             owner_id=test_user.id
         )
         
-        projects, total = project_crud.get_user_projects(db=db, user_id=test_user.id)
+        projects, total = await project_crud.get_user_projects(db=db, user_id=test_user.id)
         
         assert total == 2
         assert len(projects) == 2
         assert any(p.id == project1.id for p in projects)
         assert any(p.id == project2.id for p in projects)
     
-    def test_update_project(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_update_project(self, db: AsyncSession, test_user: User):
         """Test updating a project."""
         # Create a project
-        project = project_crud.create_project(
+        project = await project_crud.create_project(
             db=db, 
             project_in=ProjectCreate(name="Original Name"), 
             owner_id=test_user.id
@@ -100,7 +108,7 @@ class TestProjectCRUD:
             status=ProjectStatus.ACTIVE
         )
         
-        updated_project = project_crud.update_project(
+        updated_project = await project_crud.update_project(
             db=db, project_id=project.id, project_in=update_data, user_id=test_user.id
         )
         
@@ -109,31 +117,90 @@ class TestProjectCRUD:
         assert updated_project.status == ProjectStatus.ACTIVE
         assert updated_project.current_version == 2  # New version created
     
-    def test_delete_project(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_activity_metadata_persisted(self, db: AsyncSession, test_user: User):
+        """Test that activity metadata queued for the Core insert is stored."""
+        project = await project_crud.create_project(
+            db=db,
+            project_in=ProjectCreate(name="Audited Project"),
+            owner_id=test_user.id
+        )
+        
+        await project_crud.update_project(
+            db=db, project_id=project.id, project_in=ProjectUpdate(name="Renamed Project"), user_id=test_user.id
+        )
+        
+        stored = await db.scalar(
+            select(ProjectActivity.activity_metadata)
+            .where(ProjectActivity.project_id == project.id, ProjectActivity.activity_type == "project_updated")
+        )
+        assert stored == {"updated_fields": ["name"]}
+    
+    @pytest.mark.asyncio
+    async def test_update_project_payload(self, db: AsyncSession, test_user: User):
+        """Test that design documents are written to the payload side table."""
+        project = await project_crud.create_project(
+            db=db,
+            project_in=ProjectCreate(name="Payload Project"),
+            owner_id=test_user.id
+        )
+        
+        updated_project = await project_crud.update_project(
+            db=db, project_id=project.id, project_in=ProjectUpdate(layout_data={"beds": 2}), user_id=test_user.id
+        )
+        
+        assert updated_project.layout_data == {"beds": 2}
+        stored = await db.scalar(select(ProjectPayload.layout_data).where(ProjectPayload.id == project.id))
+        assert stored == {"beds": 2}
+    
+    @pytest.mark.asyncio
+    async def test_delete_project(self, db: AsyncSession, test_user: User):
         """Test deleting a project (soft delete)."""
         # Create a project
-        project = project_crud.create_project(
+        project = await project_crud.create_project(
             db=db, 
             project_in=ProjectCreate(name="To Delete"), 
             owner_id=test_user.id
         )
         
         # Delete the project
-        success = project_crud.delete_project(
+        success = await project_crud.delete_project(
             db=db, project_id=project.id, user_id=test_user.id
         )
         
         assert success == True
         
         # Check that project is soft deleted
-        deleted_project = project_crud.get_project(db=db, project_id=project.id)
+        deleted_project = await project_crud.get_project(db=db, project_id=project.id)
         assert deleted_project.status == ProjectStatus.DELETED
+    
+    @pytest.mark.asyncio
+    async def test_get_project_with_details_query_count(self, db: AsyncSession, test_user: User, test_project: Project, query_counter: list):
+        """Test that loading project details doesn't grow with collection sizes."""
+        for i in range(3):
+            await project_comment_crud.create_comment(
+                db=db,
+                comment_in=ProjectCommentCreate(content=f"Comment {i}"),
+                project_id=test_project.id,
+                author_id=test_user.id
+            )
+        db.expire_all()
+        query_counter.clear()
+        
+        project = await project_crud.get_project_with_details(db=db, project_id=test_project.id)
+        
+        assert len(project.comments) == 3
+        assert len(project.versions) == 1
+        assert len(project.activities) >= 1
+        # One query for the project plus at most one per eager-loaded relationship
+        assert len(query_counter) <= 7
 
 
 class TestProjectMemberCRUD:
     """Test project member CRUD operations."""
     
-    def test_add_member(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_add_member(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test adding a member to a project."""
         # Create another user
         other_user = User(
@@ -142,14 +209,14 @@ class TestProjectMemberCRUD:
             hashed_password="hashed_password"
         )
         db.add(other_user)
-        db.commit()
+        await db.commit()
         
         member_data = ProjectMemberCreate(
             user_email="member@example.com",
             permission=ProjectPermission.EDITOR
         )
         
-        member = project_member_crud.add_member(
+        member = await project_member_crud.add_member(
             db=db, project_id=test_project.id, member_in=member_data, invited_by=test_user.id
         )
         
@@ -158,54 +225,79 @@ class TestProjectMemberCRUD:
         assert member.permission == ProjectPermission.EDITOR
         assert member.invited_by == test_user.id
     
-    def test_update_member_permission(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_update_member_permission(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test updating member permission."""
         # Add a member first
         other_user = User(email="member@example.com", hashed_password="hashed_password")
         db.add(other_user)
-        db.commit()
+        await db.commit()
         
         member_data = ProjectMemberCreate(user_email="member@example.com", permission=ProjectPermission.VIEWER)
-        member = project_member_crud.add_member(
+        member = await project_member_crud.add_member(
             db=db, project_id=test_project.id, member_in=member_data, invited_by=test_user.id
         )
         
         # Update permission
-        updated_member = project_member_crud.update_member_permission(
+        updated_member = await project_member_crud.update_member_permission(
             db=db, project_id=test_project.id, user_id=other_user.id, 
             permission=ProjectPermission.ADMIN, updated_by=test_user.id
         )
         
         assert updated_member.permission == ProjectPermission.ADMIN
     
-    def test_remove_member(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_remove_member(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test removing a member from a project."""
         # Add a member first
         other_user = User(email="member@example.com", hashed_password="hashed_password")
         db.add(other_user)
-        db.commit()
+        await db.commit()
         
         member_data = ProjectMemberCreate(user_email="member@example.com", permission=ProjectPermission.VIEWER)
-        member = project_member_crud.add_member(
+        member = await project_member_crud.add_member(
             db=db, project_id=test_project.id, member_in=member_data, invited_by=test_user.id
         )
         
         # Remove member
-        success = project_member_crud.remove_member(
+        success = await project_member_crud.remove_member(
             db=db, project_id=test_project.id, user_id=other_user.id, removed_by=test_user.id
         )
         
         assert success == True
         
         # Check that member is removed
-        members = project_member_crud.get_project_members(db=db, project_id=test_project.id)
+        members = await project_member_crud.get_project_members(db=db, project_id=test_project.id)
         assert len(members) == 0
+    
+    @pytest.mark.asyncio
+    async def test_get_project_members_query_count(self, db: AsyncSession, test_user: User, test_project: Project, query_counter: list):
+        """Test that listing members loads users in batches, not per member."""
+        for i in range(3):
+            db.add(User(email=f"member{i}@example.com", hashed_password="hashed_password"))
+        await db.commit()
+        for i in range(3):
+            await project_member_crud.add_member(
+                db=db, project_id=test_project.id,
+                member_in=ProjectMemberCreate(user_email=f"member{i}@example.com"),
+                invited_by=test_user.id
+            )
+        db.expire_all()
+        query_counter.clear()
+        
+        members = await project_member_crud.get_project_members(db=db, project_id=test_project.id)
+        
+        assert len(members) == 3
+        assert all(member.user is not None for member in members)
+        # Members, then at most one IN query each for users and inviters
+        assert len(query_counter) <= 3
 
 
 class TestProjectVersionCRUD:
     """Test project version CRUD operations."""
     
-    def test_create_version(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_create_version(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test creating a new project version."""
         version_data = ProjectVersionCreate(
             name="Test Version",
@@ -215,7 +307,7 @@ class TestProjectVersionCRUD:
             tag_name="v1.0"
         )
         
-        version = project_version_crud.create_version(
+        version = await project_version_crud.create_version(
             db=db, project_id=test_project.id, version_in=version_data, created_by=test_user.id
         )
         
@@ -226,30 +318,32 @@ class TestProjectVersionCRUD:
         assert version.tag_name == "v1.0"
         
         # Check that project version was updated
-        updated_project = project_crud.get_project(db=db, project_id=test_project.id)
+        updated_project = await project_crud.get_project(db=db, project_id=test_project.id)
         assert updated_project.current_version == version.version_number
     
-    def test_get_project_versions(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_get_project_versions(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test getting versions of a project."""
         # Create multiple versions
-        version1 = project_version_crud.create_version(
+        version1 = await project_version_crud.create_version(
             db=db, project_id=test_project.id, 
             version_in=ProjectVersionCreate(name="Version 1"), 
             created_by=test_user.id
         )
-        version2 = project_version_crud.create_version(
+        version2 = await project_version_crud.create_version(
             db=db, project_id=test_project.id, 
             version_in=ProjectVersionCreate(name="Version 2"), 
             created_by=test_user.id
         )
         
-        versions, total = project_version_crud.get_project_versions(db=db, project_id=test_project.id)
+        versions, total = await project_version_crud.get_project_versions(db=db, project_id=test_project.id)
         
         assert total >= 3  # Including initial version
         assert len(versions) >= 3
         assert versions[0].version_number > versions[1].version_number  # Ordered by version number desc
     
-    def test_revert_to_version(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_revert_to_version(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test reverting to a specific version."""
         # Create a version with specific data
         version_data = ProjectVersionCreate(
@@ -257,24 +351,53 @@ class TestProjectVersionCRUD:
             layout_data={"revert": "data"},
             plant_data={"plants": "data"}
         )
-        version = project_version_crud.create_version(
+        version = await project_version_crud.create_version(
             db=db, project_id=test_project.id, version_in=version_data, created_by=test_user.id
         )
         
         # Revert to this version
-        reverted_project = project_version_crud.revert_to_version(
+        reverted_project = await project_version_crud.revert_to_version(
             db=db, project_id=test_project.id, version_id=version.id, user_id=test_user.id
         )
         
         assert reverted_project.layout_data == {"revert": "data"}
         assert reverted_project.plant_data == {"plants": "data"}
         assert reverted_project.current_version == version.version_number + 1
+    
+    @pytest.mark.asyncio
+    async def test_versions_stored_as_patches(self, db: AsyncSession, test_user: User, test_project: Project):
+        """Test that non-snapshot versions store patches and are rebuilt on read."""
+        first = await project_version_crud.create_version(
+            db=db, project_id=test_project.id,
+            version_in=ProjectVersionCreate(name="First", layout_data={"beds": [1, 2]}),
+            created_by=test_user.id
+        )
+        second = await project_version_crud.create_version(
+            db=db, project_id=test_project.id,
+            version_in=ProjectVersionCreate(name="Second", layout_data={"beds": [1, 2, 3]}),
+            created_by=test_user.id
+        )
+        
+        stored = (await db.execute(
+            select(ProjectVersion.is_snapshot, ProjectVersion.layout_data, ProjectVersion.layout_patch)
+            .where(ProjectVersion.id == second.id)
+        )).one()
+        assert stored.is_snapshot is False
+        assert stored.layout_data is None
+        assert stored.layout_patch
+        
+        db.expunge_all()
+        versions, _ = await project_version_crud.get_project_versions(db=db, project_id=test_project.id)
+        layouts = {version.id: version.layout_data for version in versions}
+        assert layouts[first.id] == {"beds": [1, 2]}
+        assert layouts[second.id] == {"beds": [1, 2, 3]}
 
 
 class TestProjectCommentCRUD:
     """Test project comment CRUD operations."""
     
-    def test_create_comment(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_create_comment(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test creating a new project comment."""
         comment_data = ProjectCommentCreate(
             content="This is a test comment",
@@ -283,7 +406,7 @@ class TestProjectCommentCRUD:
             element_id="test_element"
         )
         
-        comment = project_comment_crud.create_comment(
+        comment = await project_comment_crud.create_comment(
             db=db, project_id=test_project.id, comment_in=comment_data, author_id=test_user.id
         )
         
@@ -293,38 +416,40 @@ class TestProjectCommentCRUD:
         assert comment.element_id == "test_element"
         assert comment.author_id == test_user.id
     
-    def test_get_project_comments(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_get_project_comments(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test getting comments for a project."""
         # Create multiple comments
-        comment1 = project_comment_crud.create_comment(
+        comment1 = await project_comment_crud.create_comment(
             db=db, project_id=test_project.id,
             comment_in=ProjectCommentCreate(content="Comment 1"),
             author_id=test_user.id
         )
-        comment2 = project_comment_crud.create_comment(
+        comment2 = await project_comment_crud.create_comment(
             db=db, project_id=test_project.id,
             comment_in=ProjectCommentCreate(content="Comment 2"),
             author_id=test_user.id
         )
         
-        comments, total = project_comment_crud.get_project_comments(db=db, project_id=test_project.id)
+        comments, total = await project_comment_crud.get_project_comments(db=db, project_id=test_project.id)
         
         assert total == 2
         assert len(comments) == 2
         assert any(c.content == "Comment 1" for c in comments)
         assert any(c.content == "Comment 2" for c in comments)
     
-    def test_resolve_comment(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_resolve_comment(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test resolving a comment."""
         # Create a comment
-        comment = project_comment_crud.create_comment(
+        comment = await project_comment_crud.create_comment(
             db=db, project_id=test_project.id,
             comment_in=ProjectCommentCreate(content="Test comment"),
             author_id=test_user.id
         )
         
         # Resolve the comment
-        resolved_comment = project_comment_crud.resolve_comment(
+        resolved_comment = await project_comment_crud.resolve_comment(
             db=db, comment_id=comment.id, resolved_by=test_user.id
         )
         
@@ -336,52 +461,54 @@ class TestProjectCommentCRUD:
 class TestProjectPermissions:
     """Test project permission checking."""
     
-    def test_owner_permissions(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_owner_permissions(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test that project owner has all permissions."""
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=test_user.id, 
             required_permission=ProjectPermission.OWNER
         ) == True
         
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=test_user.id, 
             required_permission=ProjectPermission.ADMIN
         ) == True
         
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=test_user.id, 
             required_permission=ProjectPermission.EDITOR
         ) == True
         
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=test_user.id, 
             required_permission=ProjectPermission.VIEWER
         ) == True
     
-    def test_member_permissions(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_member_permissions(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test member permissions."""
         # Create another user and add as member
         other_user = User(email="member@example.com", hashed_password="hashed_password")
         db.add(other_user)
-        db.commit()
+        await db.commit()
         
         member_data = ProjectMemberCreate(user_email="member@example.com", permission=ProjectPermission.EDITOR)
-        project_member_crud.add_member(
+        await project_member_crud.add_member(
             db=db, project_id=test_project.id, member_in=member_data, invited_by=test_user.id
         )
         
         # Test permissions
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=other_user.id, 
             required_permission=ProjectPermission.VIEWER
         ) == True
         
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=other_user.id, 
             required_permission=ProjectPermission.EDITOR
         ) == True
         
-        assert project_crud.check_user_permission(
+        assert await project_crud.check_user_permission(
             db=db, project_id=test_project.id, user_id=other_user.id, 
             required_permission=ProjectPermission.ADMIN
         ) == False  # Editor cannot access admin functions
@@ -390,18 +517,20 @@ class TestProjectPermissions:
 class TestProjectExportService:
     """Test project export service."""
     
-    def test_export_project(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_export_project(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test exporting a project."""
-        export_data = project_export_service.export_project(db=db, project_id=test_project.id)
+        export_data = await project_export_service.export_project(db=db, project_id=test_project.id)
         
         assert export_data.project.id == test_project.id
         assert export_data.project.name == test_project.name
         assert len(export_data.versions) >= 1  # At least initial version
         assert len(export_data.activities) >= 1  # At least creation activity
     
-    def test_export_to_json(self, db: Session, test_user: User, test_project: Project):
+    @pytest.mark.asyncio
+    async def test_export_to_json(self, db: AsyncSession, test_user: User, test_project: Project):
         """Test exporting project to JSON."""
-        file_path = project_export_service.export_to_json(db=db, project_id=test_project.id)
+        file_path = await project_export_service.export_to_json(db=db, project_id=test_project.id)
         
         assert file_path is not None
         assert file_path.endswith('.json')
@@ -415,7 +544,8 @@ class TestProjectExportService:
         assert data['project']['id'] == str(test_project.id)
         assert data['project']['name'] == test_project.name
     
-    def test_import_project(self, db: Session, test_user: User):
+    @pytest.mark.asyncio
+    async def test_import_project(self, db: AsyncSession, test_user: User):
         """Test importing a project."""
         from app.schemas.project import ProjectImport
         
@@ -427,7 +557,7 @@ class TestProjectExportService:
             import_metadata={"source": "test"}
         )
         
-        imported_project = project_export_service.import_project(
+        imported_project = await project_export_service.import_project(
             db=db, project_import=import_data, owner_id=test_user.id
         )
         
@@ -440,7 +570,21 @@ class TestProjectExportService:
 
 # Fixtures
 @pytest.fixture
-def test_project(db: Session, test_user: User) -> Project:
+def query_counter(db: AsyncSession) -> list:
+    """Record every SQL statement executed on the session's engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest_asyncio.fixture
+async def test_project(db: AsyncSession, test_user: User) -> Project:
     """Create a test project."""
     project_data = ProjectCreate(
         name="Test Project",
@@ -450,4 +594,4 @@ def test_project(db: Session, test_user: User) -> Project:
         soil_type="Test soil",
         garden_size=10.0
     )
-    return project_crud.create_project(db=db, project_in=project_data, owner_id=test_user.id) 
\ No newline at end of file
+    return await project_crud.create_project(db=db, project_in=project_data, owner_id=test_user.id) 
\ No newline at end of file
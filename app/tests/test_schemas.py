@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from app.models import irrigation as irrigation_models
+from app.models import plant as plant_models
+from app.models import plant_catalog as plant_catalog_models
+from app.models import project as project_models
+from app.models import user as user_models
+from app.schemas import irrigation as irrigation_schemas
+from app.schemas import plant as plant_schemas
+from app.schemas import plant_catalog as plant_catalog_schemas
+from app.schemas import project as project_schemas
+from app.schemas import user as user_schemas
+
+
+# Every schema the endpoints build with from_orm_fast, with the model it reads
+ORM_RESPONSE_MODELS = [
+    (project_schemas.ProjectSummary, project_models.Project),
+    (project_schemas.Project, project_models.Project),
+    (project_schemas.ProjectDetail, project_models.Project),
+    (project_schemas.ProjectMember, project_models.ProjectMember),
+    (user_schemas.UserPublic, user_models.User),
+    (plant_schemas.Plant, plant_models.Plant),
+    (plant_catalog_schemas.PlantCatalog, plant_catalog_models.PlantCatalog),
+    (irrigation_schemas.IrrigationZone, irrigation_models.IrrigationZone),
+    (irrigation_schemas.IrrigationEquipment, irrigation_models.IrrigationEquipment),
+    (irrigation_schemas.IrrigationPipe, irrigation_models.IrrigationPipe),
+    (irrigation_schemas.IrrigationSchedule, irrigation_models.IrrigationSchedule),
+    (irrigation_schemas.WeatherData, irrigation_models.WeatherData),
+    (irrigation_schemas.IrrigationProject, irrigation_models.IrrigationProject),
+]
+
+
+@pytest.mark.parametrize(
+    "schema, model", ORM_RESPONSE_MODELS, ids=[schema.__name__ for schema, _ in ORM_RESPONSE_MODELS]
+)
+def test_orm_response_required_fields_exist_on_model(schema, model):
+    """
+    from_orm_fast raises AttributeError for a required field the ORM object
+    lacks, so each one must be a column, relationship, expression or property.
+    """
+    schema._prepare_orm_plan()
+    missing = [
+        name for name, field in schema.model_fields.items()
+        if field.is_required() and not hasattr(model, schema._orm_attrs[name])
+    ]
+    assert missing == []
+
+
+@pytest.mark.parametrize("plant_ids", [[1.5], [True, False], [2**31], [-2**31 - 1], [2**70], ["1"], [[1, 2]]])
+def test_plant_ids_reject_values_int32_cannot_hold(plant_ids):
+    """Fractional, boolean, out-of-range and non-numeric ids are validation errors, not truncated or a 500."""
+    with pytest.raises(ValidationError):
+        irrigation_schemas.WateringZone(zone_id=1, water_needs="low", plant_ids=plant_ids)
+
+
+def test_plant_ids_accept_int32_values():
+    zone = irrigation_schemas.WateringZone(zone_id=1, water_needs="low", plant_ids=[0, 2**31 - 1, 3.0])
+    assert zone.plant_ids.dtype == np.int32
+    assert zone.model_dump()["plant_ids"] == [0, 2**31 - 1, 3]
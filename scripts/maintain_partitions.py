@@ -0,0 +1,68 @@
+import argparse
+import asyncio
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import engine
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Month-partitioned tables (see migration time_partitioning_001)
+PARTITIONED_TABLES = ("weather_data", "project_activities")
+
+async def create_upcoming_partitions(conn: AsyncConnection, months_ahead: int) -> None:
+    """
+    Makes sure every partitioned table has a partition for the current month
+    and the next `months_ahead` months. Meant to run daily from cron.
+    """
+    for table in PARTITIONED_TABLES:
+        await conn.execute(
+            text("SELECT create_monthly_partitions(CAST(:parent AS regclass), CAST(now() AS date), :months_ahead)"),
+            {"parent": table, "months_ahead": months_ahead},
+        )
+        logger.info(f"Partitions of {table} ready {months_ahead} months ahead")
+
+async def drop_old_activity_partitions(conn: AsyncConnection, retention_months: int) -> None:
+    """
+    Drops project activity partitions whose whole month lies outside the
+    retention window. Dropping a partition is instant, unlike DELETE + VACUUM.
+    """
+    today = date.today()
+    cutoff_index = today.year * 12 + today.month - 1 - retention_months
+    cutoff = f"{cutoff_index // 12:04d}{cutoff_index % 12 + 1:02d}"
+    result = await conn.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'project_activities' AND child.relname ~ '_p[0-9]{6}$'"
+    ))
+    for (partition,) in result.all():
+        if partition[-6:] < cutoff:
+            await conn.execute(text(f'DROP TABLE "{partition}"'))
+            logger.info(f"Dropped partition {partition}")
+
+async def main(months_ahead: int, activity_retention_months: Optional[int]) -> None:
+    async with engine.begin() as conn:
+        await create_upcoming_partitions(conn, months_ahead)
+        if activity_retention_months is not None:
+            await drop_old_activity_partitions(conn, activity_retention_months)
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create upcoming monthly partitions and drop expired ones.")
+    parser.add_argument("--months-ahead", type=int, default=3)
+    parser.add_argument(
+        "--activity-retention-months",
+        type=int,
+        default=None,
+        help="Drop project activity partitions older than this many months (kept forever if omitted)",
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.months_ahead, args.activity_retention_months))
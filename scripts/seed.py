@@ -53,12 +53,9 @@ async def seed_data(db: AsyncSession) -> None:
     plant2_in = PlantCreate(name="Tomato", species="Solanum lycopersicum", garden_id=garden2.id)
     plant3_in = PlantCreate(name="Mint", species="Mentha spicata", garden_id=garden1.id)
 
-    await crud_plant.create(db, obj_in=plant1_in)
-    logger.info(f"Created plant: {plant1_in.name}")
-    await crud_plant.create(db, obj_in=plant2_in)
-    logger.info(f"Created plant: {plant2_in.name}")
-    await crud_plant.create(db, obj_in=plant3_in)
-    logger.info(f"Created plant: {plant3_in.name}")
+    plants = await crud_plant.create_multi(db, objs_in=[plant1_in, plant2_in, plant3_in])
+    for plant in plants:
+        logger.info(f"Created plant: {plant.name}")
 
     # Seed Plant Catalog
     logger.info("Creating plant catalog...")
@@ -76,14 +73,17 @@ async def seed_data(db: AsyncSession) -> None:
         { "id": 8, "name": "Zinnia", "variety": "California Giant", "plant_type": "Flower", "image": "https://i.ibb.co/yQdCg8N/zinnia.jpg", "description": "A vibrant, easy-to-grow flower that attracts pollinators.", "sun": "Full Sun", "water": "Moderate", "spacing": "10-12 inches", "planting_season": ["Spring", "Summer"], "harvest_season": [], "compatibility": ["All plants"], "tips": "Deadhead regularly to promote more blooms. Good air circulation helps prevent powdery mildew." }
     ]
 
-    for plant_data in plant_catalog_data:
-        plant = await crud_plant_catalog.get(db, id=plant_data["id"])
-        if not plant:
-            plant_in = PlantCatalogCreate(**plant_data)
-            await crud_plant_catalog.create(db, obj_in=plant_in)
-            logger.info(f"Created catalog plant: {plant_in.name}")
-        else:
-            logger.info(f"Catalog plant already exists: {plant.name}")
+    from sqlalchemy import select
+    from app.models.plant_catalog import PlantCatalog
+
+    existing_ids = set(await db.scalars(
+        select(PlantCatalog.id).where(PlantCatalog.id.in_([plant_data["id"] for plant_data in plant_catalog_data]))
+    ))
+    missing = [PlantCatalogCreate(**plant_data) for plant_data in plant_catalog_data if plant_data["id"] not in existing_ids]
+    for plant in await crud_plant_catalog.create_multi(db, objs_in=missing):
+        logger.info(f"Created catalog plant: {plant.name}")
+    if existing_ids:
+        logger.info(f"Catalog plants already present: {len(existing_ids)}")
 
 
     logger.info("Database seeding completed successfully.")
@@ -52,7 +52,7 @@ export type WebSocketEvent =
   | OptimizationProgress 
   | ConflictAlert 
   | IrrigationUpdate
-  | { type: 'connection_established' | 'subscription_confirmed' | 'unsubscription_confirmed' | 'pong' | 'error'; data?: any; timestamp?: string };
+  | { type: 'connection_established' | 'subscription_confirmed' | 'unsubscription_confirmed' | 'pong' | 'error'; data?: any; timestamp?: string; ts?: number };
 
 class WebSocketService {
   private socket: WebSocket | null = null;